@@ -2,155 +2,227 @@
 
 from __future__ import annotations
 
-from datetime import timezone
+from collections.abc import Generator
 
-from fastapi import APIRouter, Cookie, Depends, Response, status
+from fastapi import APIRouter, Cookie, Depends, Query, Response, status
 from sqlmodel import Session
 
-from app.api.problem_details import problem
-from app.core.config import get_settings
-from app.db.session import get_session
+from app.api.auth_common import (
+    LOGIN_USER_INACTIVE,
+    SESSION_COOKIE_NAME,
+    USER_ALREADY_EXISTS,
+    USER_NOT_FOUND,
+    clear_session_cookie,
+    decode_session_cursor,
+    get_last_login_buffer,
+    get_session_cache,
+    get_session_tokens,
+    missing_session_problem,
+    record_auth_outcome,
+    require_internal_caller,
+    session_batch_out,
+    session_page_out,
+    session_problem,
+    session_started,
+    user_etag,
+    user_summary,
+)
+from app.api.conditional import ConditionalGet, get_conditional_get
+from app.api.pagination import get_cursor_codec
+from app.api.responses import ModelResponse
+from app.core.metrics import AUTH_OUTCOMES
+from app.db.pagination import CursorCodec
+from app.db.replicas import choose_read_engine
+from app.db.session import get_engine, get_session
 from app.domains.auth import errors, service
+from app.domains.auth.cache import BaseSessionCache
+from app.domains.auth.last_login import LastLoginBuffer
 from app.domains.auth.repository import SqlAuthRepository
 from app.domains.auth.models import User
-from app.domains.auth.schemas import AuthEmailIn, UserSummary
+from app.domains.auth.service import AuthRepository
+from app.domains.auth.schemas import (
+    AuthEmailIn,
+    SessionBatchIn,
+    SessionBatchOut,
+    SessionPageOut,
+    UserSummary,
+)
+from app.domains.auth.tokens import SignedSessionTokens
 
 auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
-SESSION_COOKIE_NAME = "bc_session"
 
+def get_auth_repository(db: Session = Depends(get_session)) -> AuthRepository:
+    """Build the request's auth repository on the request's DB session."""
+    return SqlAuthRepository(db)
 
-def _set_session_cookie(response: Response, token: str) -> None:
-    settings = get_settings()
-    response.set_cookie(
-        key=SESSION_COOKIE_NAME,
-        value=token,
-        httponly=True,
-        samesite="lax",
-        secure=settings.environment == "prod",
-        max_age=service.SESSION_TTL_DAYS * 24 * 60 * 60,
-    )
 
-
-def _clear_session_cookie(response: Response) -> None:
-    response.delete_cookie(key=SESSION_COOKIE_NAME)
+def get_read_auth_repository(
+    db: Session = Depends(get_session),
+) -> Generator[AuthRepository, None, None]:
+    """Auth repository whose user-row fetches and listings go to a healthy replica, if any."""
+    engine = choose_read_engine()
+    if engine is None:
+        yield SqlAuthRepository(db)
+        return
+    with Session(engine) as read_db:
+        yield SqlAuthRepository(db, read_session=read_db)
+
+
+def get_current_user(
+    repo: AuthRepository = Depends(get_auth_repository),
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+    token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+) -> User:
+    """Resolve the session cookie to its user, or raise the matching 401/403 problem."""
+    return _resolve_user("authenticate", repo, cache, tokens, token)
 
 
-def _user_summary(user: User) -> UserSummary:
-    return UserSummary(
-        id=user.id,
-        email=user.email,
-        created_at=user.created_at.astimezone(timezone.utc),
-        last_login_at=user.last_login_at.astimezone(timezone.utc)
-        if user.last_login_at
-        else None,
-        is_active=user.is_active,
-    )
+def get_current_user_detached(
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+    token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+) -> User:
+    """``get_current_user`` in a DB session of its own, closed before the route runs.
+
+    For long-running routes such as streamed uploads, which would otherwise
+    keep the request's session open until they finish.
+    """
+    with Session(get_engine()) as db:
+        return _resolve_user("authenticate", SqlAuthRepository(db), cache, tokens, token)
+
+
+def _resolve_user(
+    operation: str,
+    repo: AuthRepository,
+    cache: BaseSessionCache | None,
+    tokens: SignedSessionTokens | None,
+    token: str | None,
+) -> User:
+    if not token:
+        AUTH_OUTCOMES.inc(operation, "missing_session")
+        raise missing_session_problem()
+    try:
+        with record_auth_outcome(operation):
+            return service.get_user_for_session(repo, token, cache, tokens)
+    except errors.AuthError as exc:
+        raise session_problem(exc) from exc
 
 
 @auth_router.post("/register", status_code=status.HTTP_201_CREATED, response_model=UserSummary)
-def register(payload: AuthEmailIn, response: Response, db: Session = Depends(get_session)) -> UserSummary:
+def register(
+    payload: AuthEmailIn,
+    db: Session = Depends(get_session),
+    repo: AuthRepository = Depends(get_auth_repository),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+) -> ModelResponse:
     try:
-        repo = SqlAuthRepository(db)
-        user, _session, token = service.register_user(repo, payload.email)
+        with record_auth_outcome("register"):
+            user, _session, token = service.register_user(repo, payload.email, tokens)
         db.commit()
     except errors.UserAlreadyExists as exc:
-        raise problem(
-            status_code=status.HTTP_409_CONFLICT,
-            title="User already exists",
-            detail="A user with this email already exists.",
-            type_="https://budget-compass/errors/user-already-exists",
-        ) from exc
+        raise USER_ALREADY_EXISTS.exception() from exc
 
-    _set_session_cookie(response, token)
-    return _user_summary(user)
+    return session_started(user, token, status.HTTP_201_CREATED)
 
 
 @auth_router.post("/login", response_model=UserSummary)
-def login(payload: AuthEmailIn, response: Response, db: Session = Depends(get_session)) -> UserSummary:
+def login(
+    payload: AuthEmailIn,
+    db: Session = Depends(get_session),
+    repo: AuthRepository = Depends(get_auth_repository),
+    last_login_buffer: LastLoginBuffer | None = Depends(get_last_login_buffer),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+) -> ModelResponse:
     try:
-        repo = SqlAuthRepository(db)
-        user, _session, token = service.login_user(repo, payload.email)
+        with record_auth_outcome("login"):
+            user, _session, token = service.login_user(
+                repo, payload.email, last_login_buffer, tokens
+            )
         db.commit()
     except errors.UserNotFound as exc:
-        raise problem(
-            status_code=status.HTTP_404_NOT_FOUND,
-            title="User not found",
-            detail="No user with this email was found.",
-            type_="https://budget-compass/errors/user-not-found",
-        ) from exc
+        raise USER_NOT_FOUND.exception() from exc
     except errors.UserInactive as exc:
-        raise problem(
-            status_code=status.HTTP_403_FORBIDDEN,
-            title="User inactive",
-            detail="This user is inactive.",
-            type_="https://budget-compass/errors/user-inactive",
-        ) from exc
+        raise LOGIN_USER_INACTIVE.exception() from exc
 
-    _set_session_cookie(response, token)
-    return _user_summary(user)
+    return session_started(user, token)
 
 
 @auth_router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
 def logout(
     response: Response,
     db: Session = Depends(get_session),
+    repo: AuthRepository = Depends(get_auth_repository),
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
     token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
 ) -> None:
     if token:
         try:
-            repo = SqlAuthRepository(db)
-            service.logout_session(repo, token)
+            with record_auth_outcome("logout"):
+                service.logout_session(repo, token, cache, tokens)
             db.commit()
         except errors.AuthError:
             pass
 
-    _clear_session_cookie(response)
+    clear_session_cookie(response)
 
 
 @auth_router.get("/me", response_model=UserSummary)
 def me(
-    db: Session = Depends(get_session),
+    repo: AuthRepository = Depends(get_read_auth_repository),
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+    conditional: ConditionalGet = Depends(get_conditional_get),
     token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
-) -> UserSummary:
-    if not token:
-        raise problem(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            title="Not authenticated",
-            detail="Missing session.",
-            type_="https://budget-compass/errors/not-authenticated",
-        )
+) -> Response:
+    """The caller; ``If-None-Match`` with the last ETag gets a 304 while it is unchanged."""
+    user = _resolve_user("me", repo, cache, tokens, token)
+    return conditional.respond(user_etag(user), lambda: user_summary(user))
+
+
+@auth_router.get("/sessions", response_model=SessionPageOut)
+def list_sessions(
+    limit: int = Query(default=20, ge=1, le=service.SESSION_PAGE_MAX),
+    cursor: str | None = None,
+    user: User = Depends(get_current_user),
+    repo: AuthRepository = Depends(get_read_auth_repository),
+    codec: CursorCodec = Depends(get_cursor_codec),
+    token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+) -> ModelResponse:
+    """List the caller's sessions, newest first; pass ``next_cursor`` back for more."""
+    page = service.list_sessions(repo, user.id, limit, decode_session_cursor(codec, cursor))
+    return ModelResponse(session_page_out(page, token, codec))
 
-    try:
-        repo = SqlAuthRepository(db)
-        user = service.get_user_for_session(repo, token)
-    except errors.SessionNotFound as exc:
-        raise problem(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            title="Invalid session",
-            detail="Session is not valid.",
-            type_="https://budget-compass/errors/invalid-session",
-        ) from exc
-    except errors.SessionExpired as exc:
-        raise problem(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            title="Session expired",
-            detail="Session has expired.",
-            type_="https://budget-compass/errors/session-expired",
-        ) from exc
-    except errors.SessionRevoked as exc:
-        raise problem(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            title="Session revoked",
-            detail="Session has been revoked.",
-            type_="https://budget-compass/errors/session-revoked",
-        ) from exc
-    except errors.UserInactive as exc:
-        raise problem(
-            status_code=status.HTTP_403_FORBIDDEN,
-            title="User inactive",
-            detail="User is inactive.",
-            type_="https://budget-compass/errors/user-inactive",
-        ) from exc
-
-    return _user_summary(user)
+
+@auth_router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+def logout_all(
+    response: Response,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_session),
+    repo: AuthRepository = Depends(get_auth_repository),
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+) -> None:
+    """Revoke every session of the caller, the current one included."""
+    with record_auth_outcome("logout_all"):
+        service.revoke_all_sessions(repo, user.id, cache, tokens)
+    db.commit()
+    clear_session_cookie(response)
+
+
+@auth_router.post(
+    "/sessions/validate",
+    response_model=SessionBatchOut,
+    dependencies=[Depends(require_internal_caller)],
+)
+def validate_sessions(
+    payload: SessionBatchIn,
+    repo: AuthRepository = Depends(get_read_auth_repository),
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+) -> ModelResponse:
+    """Validate a batch of ``bc_session`` tokens for internal gateways."""
+    checks = service.validate_session_tokens(repo, payload.tokens, cache, tokens)
+    return ModelResponse(session_batch_out(checks))
@@ -0,0 +1,198 @@
+"""Async auth API routes, used when ``Settings.db_async`` is enabled."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Cookie, Depends, Query, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.auth_common import (
+    LOGIN_USER_INACTIVE,
+    SESSION_COOKIE_NAME,
+    USER_ALREADY_EXISTS,
+    USER_NOT_FOUND,
+    clear_session_cookie,
+    decode_session_cursor,
+    get_last_login_buffer,
+    get_session_cache,
+    get_session_tokens,
+    missing_session_problem,
+    record_auth_outcome,
+    require_internal_caller,
+    session_batch_out,
+    session_page_out,
+    session_problem,
+    session_started,
+    user_etag,
+    user_summary,
+)
+from app.api.conditional import ConditionalGet, get_conditional_get
+from app.api.pagination import get_cursor_codec
+from app.api.responses import ModelResponse
+from app.core.metrics import AUTH_OUTCOMES
+from app.db.async_session import get_async_session
+from app.db.pagination import CursorCodec
+from app.domains.auth import async_service, errors
+from app.domains.auth.async_repository import AsyncSqlAuthRepository
+from app.domains.auth.cache import BaseSessionCache
+from app.domains.auth.last_login import LastLoginBuffer
+from app.domains.auth.models import User
+from app.domains.auth.schemas import (
+    AuthEmailIn,
+    SessionBatchIn,
+    SessionBatchOut,
+    SessionPageOut,
+    UserSummary,
+)
+from app.domains.auth.service import SESSION_PAGE_MAX
+from app.domains.auth.tokens import SignedSessionTokens
+
+async_auth_router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@async_auth_router.post("/register", status_code=status.HTTP_201_CREATED, response_model=UserSummary)
+async def register(
+    payload: AuthEmailIn,
+    db: AsyncSession = Depends(get_async_session),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+) -> ModelResponse:
+    try:
+        repo = AsyncSqlAuthRepository(db)
+        with record_auth_outcome("register"):
+            user, _session, token = await async_service.register_user(repo, payload.email, tokens)
+        await db.commit()
+    except errors.UserAlreadyExists as exc:
+        raise USER_ALREADY_EXISTS.exception() from exc
+
+    return session_started(user, token, status.HTTP_201_CREATED)
+
+
+@async_auth_router.post("/login", response_model=UserSummary)
+async def login(
+    payload: AuthEmailIn,
+    db: AsyncSession = Depends(get_async_session),
+    last_login_buffer: LastLoginBuffer | None = Depends(get_last_login_buffer),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+) -> ModelResponse:
+    try:
+        repo = AsyncSqlAuthRepository(db)
+        with record_auth_outcome("login"):
+            user, _session, token = await async_service.login_user(
+                repo, payload.email, last_login_buffer, tokens
+            )
+        await db.commit()
+    except errors.UserNotFound as exc:
+        raise USER_NOT_FOUND.exception() from exc
+    except errors.UserInactive as exc:
+        raise LOGIN_USER_INACTIVE.exception() from exc
+
+    return session_started(user, token)
+
+
+@async_auth_router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    response: Response,
+    db: AsyncSession = Depends(get_async_session),
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+    token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+) -> None:
+    if token:
+        try:
+            repo = AsyncSqlAuthRepository(db)
+            with record_auth_outcome("logout"):
+                await async_service.logout_session(repo, token, cache, tokens)
+            await db.commit()
+        except errors.AuthError:
+            pass
+
+    clear_session_cookie(response)
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_session),
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+    token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+) -> User:
+    """Resolve the session cookie to its user, or raise the matching 401/403 problem."""
+    return await _resolve_user("authenticate", db, cache, tokens, token)
+
+
+@async_auth_router.get("/me", response_model=UserSummary)
+async def me(
+    db: AsyncSession = Depends(get_async_session),
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+    conditional: ConditionalGet = Depends(get_conditional_get),
+    token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+) -> Response:
+    user = await _resolve_user("me", db, cache, tokens, token)
+    return conditional.respond(user_etag(user), lambda: user_summary(user))
+
+
+@async_auth_router.get("/sessions", response_model=SessionPageOut)
+async def list_sessions(
+    limit: int = Query(default=20, ge=1, le=SESSION_PAGE_MAX),
+    cursor: str | None = None,
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_session),
+    codec: CursorCodec = Depends(get_cursor_codec),
+    token: str | None = Cookie(default=None, alias=SESSION_COOKIE_NAME),
+) -> ModelResponse:
+    """List the caller's sessions, newest first; pass ``next_cursor`` back for more."""
+    repo = AsyncSqlAuthRepository(db)
+    page = await async_service.list_sessions(
+        repo, user.id, limit, decode_session_cursor(codec, cursor)
+    )
+    return ModelResponse(session_page_out(page, token, codec))
+
+
+@async_auth_router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    response: Response,
+    user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_session),
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+) -> None:
+    """Revoke every session of the caller, the current one included."""
+    repo = AsyncSqlAuthRepository(db)
+    with record_auth_outcome("logout_all"):
+        await async_service.revoke_all_sessions(repo, user.id, cache, tokens)
+    await db.commit()
+    clear_session_cookie(response)
+
+
+@async_auth_router.post(
+    "/sessions/validate",
+    response_model=SessionBatchOut,
+    dependencies=[Depends(require_internal_caller)],
+)
+async def validate_sessions(
+    payload: SessionBatchIn,
+    db: AsyncSession = Depends(get_async_session),
+    cache: BaseSessionCache | None = Depends(get_session_cache),
+    tokens: SignedSessionTokens | None = Depends(get_session_tokens),
+) -> ModelResponse:
+    """Validate a batch of ``bc_session`` tokens for internal gateways."""
+    repo = AsyncSqlAuthRepository(db)
+    checks = await async_service.validate_session_tokens(repo, payload.tokens, cache, tokens)
+    return ModelResponse(session_batch_out(checks))
+
+
+async def _resolve_user(
+    operation: str,
+    db: AsyncSession,
+    cache: BaseSessionCache | None,
+    tokens: SignedSessionTokens | None,
+    token: str | None,
+) -> User:
+    if not token:
+        AUTH_OUTCOMES.inc(operation, "missing_session")
+        raise missing_session_problem()
+    try:
+        repo = AsyncSqlAuthRepository(db)
+        with record_auth_outcome(operation):
+            return await async_service.get_user_for_session(repo, token, cache, tokens)
+    except errors.AuthError as exc:
+        raise session_problem(exc) from exc
@@ -0,0 +1,255 @@
+"""Pieces the sync and async auth routers share.
+
+Problem details, the cookie, request-state dependencies and the response
+builders live here so that both routers answer identically; only the
+database access and session resolution differ between them.
+"""
+
+from __future__ import annotations
+
+import hmac
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timezone
+from typing import cast
+
+from fastapi import Header, Request, Response, status
+
+from app.api.conditional import version_etag
+from app.api.pagination import decode_cursor
+from app.api.problem_details import ProblemDetails, ProblemDetailsException
+from app.api.responses import ModelResponse
+from app.core.config import get_settings
+from app.core.metrics import AUTH_OUTCOMES
+from app.db.pagination import CursorCodec
+from app.domains.auth import errors, service
+from app.domains.auth.cache import BaseSessionCache
+from app.domains.auth.last_login import LastLoginBuffer
+from app.domains.auth.models import Session as SessionModel
+from app.domains.auth.models import User
+from app.domains.auth.schemas import (
+    SessionBatchOut,
+    SessionCheckOut,
+    SessionCheckStatus,
+    SessionOut,
+    SessionPageOut,
+    UserSummary,
+)
+from app.domains.auth.service import SessionCursor, SessionPage, TokenCheck
+from app.domains.auth.tokens import SignedSessionTokens
+
+SESSION_COOKIE_NAME = "bc_session"
+SESSION_CURSOR_SCOPE = "sessions"
+INTERNAL_TOKEN_HEADER = "X-Internal-Token"
+
+NOT_AUTHENTICATED = ProblemDetails(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    title="Not authenticated",
+    detail="Missing session.",
+    type_="https://budget-compass/errors/not-authenticated",
+)
+INVALID_SESSION = ProblemDetails(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    title="Invalid session",
+    detail="Session is not valid.",
+    type_="https://budget-compass/errors/invalid-session",
+)
+SESSION_PROBLEMS: dict[type[errors.AuthError], ProblemDetails] = {
+    errors.SessionExpired: ProblemDetails(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        title="Session expired",
+        detail="Session has expired.",
+        type_="https://budget-compass/errors/session-expired",
+    ),
+    errors.SessionRevoked: ProblemDetails(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        title="Session revoked",
+        detail="Session has been revoked.",
+        type_="https://budget-compass/errors/session-revoked",
+    ),
+    errors.UserInactive: ProblemDetails(
+        status_code=status.HTTP_403_FORBIDDEN,
+        title="User inactive",
+        detail="User is inactive.",
+        type_="https://budget-compass/errors/user-inactive",
+    ),
+}
+USER_ALREADY_EXISTS = ProblemDetails(
+    status_code=status.HTTP_409_CONFLICT,
+    title="User already exists",
+    detail="A user with this email already exists.",
+    type_="https://budget-compass/errors/user-already-exists",
+)
+USER_NOT_FOUND = ProblemDetails(
+    status_code=status.HTTP_404_NOT_FOUND,
+    title="User not found",
+    detail="No user with this email was found.",
+    type_="https://budget-compass/errors/user-not-found",
+)
+LOGIN_USER_INACTIVE = ProblemDetails(
+    status_code=status.HTTP_403_FORBIDDEN,
+    title="User inactive",
+    detail="This user is inactive.",
+    type_="https://budget-compass/errors/user-inactive",
+)
+INTERNAL_DISABLED = ProblemDetails(
+    status_code=status.HTTP_404_NOT_FOUND,
+    title="Not found",
+    detail="Internal endpoints are disabled.",
+    type_="https://budget-compass/errors/not-found",
+)
+INTERNAL_FORBIDDEN = ProblemDetails(
+    status_code=status.HTTP_403_FORBIDDEN,
+    title="Forbidden",
+    detail="A valid internal token is required.",
+    type_="https://budget-compass/errors/forbidden",
+)
+
+_CHECK_STATUS: dict[type[errors.AuthError], SessionCheckStatus] = {
+    errors.SessionNotFound: "not_found",
+    errors.SessionExpired: "expired",
+    errors.SessionRevoked: "revoked",
+    errors.UserInactive: "inactive",
+}
+
+
+def get_session_cache(request: Request) -> BaseSessionCache | None:
+    """Return the process-wide session cache, if enabled."""
+    return getattr(request.app.state, "session_cache", None)
+
+
+def get_last_login_buffer(request: Request) -> LastLoginBuffer | None:
+    """Return the write-behind buffer for ``last_login_at``, if enabled."""
+    return getattr(request.app.state, "last_login_buffer", None)
+
+
+def get_session_tokens(request: Request) -> SignedSessionTokens | None:
+    """Return the signed-token issuer when ``session_token_mode`` is ``signed``."""
+    return getattr(request.app.state, "session_tokens", None)
+
+
+def require_internal_caller(
+    request: Request,
+    internal_token: str | None = Header(default=None, alias=INTERNAL_TOKEN_HEADER),
+) -> None:
+    """Admit only callers sending ``internal_api_token``; 404 while it is unset."""
+    expected: str | None = getattr(request.app.state, "internal_api_token", None)
+    if expected is None:
+        raise INTERNAL_DISABLED.exception()
+    if internal_token is None or not hmac.compare_digest(
+        internal_token.encode("utf-8"), expected.encode("utf-8")
+    ):
+        raise INTERNAL_FORBIDDEN.exception()
+
+
+@contextmanager
+def record_auth_outcome(operation: str) -> Iterator[None]:
+    """Count the operation as ``ok`` or under the name of the auth error raised."""
+    try:
+        yield
+    except errors.AuthError as exc:
+        AUTH_OUTCOMES.inc(operation, type(exc).__name__)
+        raise
+    AUTH_OUTCOMES.inc(operation, "ok")
+
+
+def set_session_cookie(response: Response, token: str) -> None:
+    """Set the session cookie, ``Secure`` in production."""
+    settings = get_settings()
+    response.set_cookie(
+        key=SESSION_COOKIE_NAME,
+        value=token,
+        httponly=True,
+        samesite="lax",
+        secure=settings.environment == "prod",
+        max_age=service.SESSION_TTL_DAYS * 24 * 60 * 60,
+    )
+
+
+def clear_session_cookie(response: Response) -> None:
+    """Expire the session cookie."""
+    response.delete_cookie(key=SESSION_COOKIE_NAME)
+
+
+def session_started(
+    user: User, token: str, status_code: int = status.HTTP_200_OK
+) -> ModelResponse:
+    """User summary response that also sets the new session's cookie."""
+    response = ModelResponse(user_summary(user), status_code=status_code)
+    set_session_cookie(response, token)
+    return response
+
+
+def missing_session_problem() -> ProblemDetailsException:
+    """Problem response for a request without a session cookie."""
+    return NOT_AUTHENTICATED.exception()
+
+
+def session_problem(exc: errors.AuthError) -> ProblemDetailsException:
+    """Problem response for an error raised while resolving a session."""
+    return SESSION_PROBLEMS.get(type(exc), INVALID_SESSION).exception()
+
+
+def session_page_out(
+    page: SessionPage, token: str | None, codec: CursorCodec
+) -> SessionPageOut:
+    """A page of sessions, marking the one ``token`` belongs to as current."""
+    current_hash = service.hash_token(token) if token else None
+    return SessionPageOut(
+        sessions=[_session_out(session_model, current_hash) for session_model in page.sessions],
+        next_cursor=codec.encode(SESSION_CURSOR_SCOPE, page.next_after)
+        if page.next_after
+        else None,
+    )
+
+
+def _session_out(session_model: SessionModel, current_hash: bytes | None) -> SessionOut:
+    assert session_model.id is not None
+    return SessionOut(
+        id=session_model.id,
+        created_at=service._as_utc(session_model.created_at),
+        expires_at=service._as_utc(session_model.expires_at),
+        revoked_at=service._as_utc(session_model.revoked_at) if session_model.revoked_at else None,
+        current=session_model.token_hash == current_hash,
+    )
+
+
+def decode_session_cursor(codec: CursorCodec, cursor: str | None) -> SessionCursor | None:
+    """The session-list key a ``next_cursor`` stands for, or None without one."""
+    return cast("SessionCursor | None", decode_cursor(codec, SESSION_CURSOR_SCOPE, cursor))
+
+
+def session_batch_out(checks: list[TokenCheck]) -> SessionBatchOut:
+    """Batch validation response; errors without a status of their own read ``not_found``."""
+    results = []
+    for check in checks:
+        if check.user is not None:
+            AUTH_OUTCOMES.inc("validate_batch", "ok")
+            results.append(SessionCheckOut(status="valid", user=user_summary(check.user)))
+        else:
+            assert check.error is not None
+            AUTH_OUTCOMES.inc("validate_batch", type(check.error).__name__)
+            results.append(SessionCheckOut(status=_CHECK_STATUS.get(type(check.error), "not_found")))
+    return SessionBatchOut(results=results)
+
+
+def user_etag(user: User) -> str:
+    """ETag of the user summary, for conditional GETs of ``/auth/me``."""
+    # last_login_at is the field that moves; the rest change on rare admin edits.
+    return version_etag(
+        "user", user.id, user.email, user.created_at, user.last_login_at, user.is_active
+    )
+
+
+def user_summary(user: User) -> UserSummary:
+    """The user as returned by the auth routes."""
+    # Built from our own row, so skip validation (email parsing is the costly part).
+    return UserSummary.model_construct(
+        id=user.id,
+        email=user.email,
+        created_at=user.created_at.astimezone(timezone.utc),
+        last_login_at=user.last_login_at.astimezone(timezone.utc)
+        if user.last_login_at
+        else None,
+        is_active=user.is_active,
+    )
@@ -0,0 +1,65 @@
+"""Conditional GETs for read routes: version ETags, ``If-None-Match`` and ``Cache-Control``.
+
+A route derives the ETag from the version of what it returns (a row's
+``updated_at`` and counters, the user's ``last_login_at``) before it builds
+the body. When the client's ``If-None-Match`` already holds that ETag the
+answer is a bodiless 304, so the response model is never built or
+serialized. Bodies are per user: responses are ``private`` and vary on the
+session cookie.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import Header, Request, status
+from starlette.responses import Response
+
+from app.api.responses import ModelResponse
+
+NO_CACHE = "private, no-cache"
+
+
+def cache_control(max_age_seconds: int) -> str:
+    """``no-cache`` revalidates every time (a 304 when unchanged); ``max-age`` skips the request."""
+    return f"private, max-age={max_age_seconds}" if max_age_seconds else NO_CACHE
+
+
+def version_etag(kind: str, *versions: object) -> str:
+    """A strong ETag over ``kind`` and the values the body is a function of."""
+    raw = "|".join([kind, *(str(version) for version in versions)]).encode("utf-8")
+    return f'"{hashlib.blake2b(raw, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """``If-None-Match`` semantics: ``*`` or any listed tag, compared weakly."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class ConditionalGet:
+    """Answers one request either with 304 or with the body ``build`` returns."""
+
+    def __init__(self, if_none_match: str | None, cache_control: str) -> None:
+        self.if_none_match = if_none_match
+        self.cache_control = cache_control
+
+    def respond(self, etag: str, build: Callable[[], Any]) -> Response:
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Cookie"}
+        if etag_matches(self.if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return ModelResponse(build(), headers=headers)
+
+
+def get_conditional_get(
+    request: Request, if_none_match: str | None = Header(default=None)
+) -> ConditionalGet:
+    """Conditional-response helper for the request, with the app's ``Cache-Control``."""
+    return ConditionalGet(
+        if_none_match, getattr(request.app.state, "read_cache_control", NO_CACHE)
+    )
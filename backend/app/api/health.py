@@ -1,8 +1,12 @@
 """Health endpoint."""
 
-from fastapi import APIRouter, Depends
+from dataclasses import asdict
+
+from fastapi import APIRouter, Depends, Request
 
 from app.core.config import Settings, get_settings
+from app.db.pool import collect_pool_stats
+from app.db.replicas import get_replica_set
 
 health_router = APIRouter()
 
@@ -15,3 +19,24 @@ def health(settings: Settings = Depends(get_settings)) -> dict[str, str]:
         "version": settings.version,
     }
 
+
+@health_router.get("/health/db-pool")
+def db_pool() -> dict[str, dict[str, int | float]]:
+    return {
+        name: {**asdict(stats), "wait_seconds_avg": stats.wait_seconds_avg}
+        for name, stats in collect_pool_stats().items()
+    }
+
+
+@health_router.get("/health/db-replicas")
+def db_replicas() -> dict[str, bool]:
+    replica_set = get_replica_set()
+    if replica_set is None:
+        return {}
+    return {replica.name: replica.healthy for replica in replica_set.replicas}
+
+
+@health_router.get("/health/session-cache")
+def session_cache(request: Request) -> dict[str, int]:
+    cache = getattr(request.app.state, "session_cache", None)
+    return asdict(cache.stats()) if cache is not None else {}
@@ -0,0 +1,436 @@
+"""Ledger API routes: accounts with balances, their append-only entries,
+categories, and monthly reports."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from datetime import date, datetime
+from typing import cast
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlmodel import Session
+
+from app.api.auth import get_current_user, get_current_user_detached
+from app.api.conditional import ConditionalGet, get_conditional_get, version_etag
+from app.api.pagination import decode_cursor, get_cursor_codec
+from app.api.problem_details import ProblemDetails, problem
+from app.api.responses import ModelResponse
+from app.db.pagination import CursorCodec
+from app.db.session import get_engine, get_session
+from app.domains.auth.models import User
+from app.domains.ledger import errors, importing, reports, service
+from app.domains.ledger.models import Account, Category, LedgerEntry
+from app.domains.ledger.repository import SqlLedgerRepository
+from app.domains.ledger.schemas import (
+    AccountIn,
+    AccountOut,
+    CategoryIn,
+    CategoryMonthOut,
+    CategoryOut,
+    EntryIn,
+    EntryOut,
+    EntryPageOut,
+    ImportErrorOut,
+    ImportOut,
+    MonthReportOut,
+    ReportOut,
+)
+from app.domains.ledger.service import EntryCursor, EntryPage, LedgerRepository
+
+ledger_router = APIRouter(prefix="/ledger", tags=["ledger"])
+
+ACCOUNT_NOT_FOUND = ProblemDetails(
+    status_code=status.HTTP_404_NOT_FOUND,
+    title="Account not found",
+    detail="No account with this id was found.",
+    type_="https://budget-compass/errors/account-not-found",
+)
+ENTRY_NOT_FOUND = ProblemDetails(
+    status_code=status.HTTP_404_NOT_FOUND,
+    title="Entry not found",
+    detail="No ledger entry with this id was found.",
+    type_="https://budget-compass/errors/entry-not-found",
+)
+ENTRY_ALREADY_REVERSED = ProblemDetails(
+    status_code=status.HTTP_409_CONFLICT,
+    title="Entry already reversed",
+    detail="This entry was already reversed or is itself a reversal.",
+    type_="https://budget-compass/errors/entry-already-reversed",
+)
+CATEGORY_NOT_FOUND = ProblemDetails(
+    status_code=status.HTTP_404_NOT_FOUND,
+    title="Category not found",
+    detail="No category with this id was found.",
+    type_="https://budget-compass/errors/category-not-found",
+)
+
+_LEDGER_PROBLEMS: dict[type[errors.LedgerError], ProblemDetails] = {
+    errors.AccountNotFound: ACCOUNT_NOT_FOUND,
+    errors.EntryNotFound: ENTRY_NOT_FOUND,
+    errors.EntryAlreadyReversed: ENTRY_ALREADY_REVERSED,
+    errors.CategoryNotFound: CATEGORY_NOT_FOUND,
+}
+# Errors whose detail is the exception's message: (title, type).
+_UNPROCESSABLE: dict[type[errors.LedgerError], tuple[str, str]] = {
+    errors.InvalidImportFile: (
+        "Invalid import file",
+        "https://budget-compass/errors/invalid-import-file",
+    ),
+    errors.InvalidReportRange: (
+        "Invalid report range",
+        "https://budget-compass/errors/invalid-report-range",
+    ),
+}
+
+_MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def get_ledger_repository(db: Session = Depends(get_session)) -> LedgerRepository:
+    """Build the request's ledger repository on the request's DB session."""
+    return SqlLedgerRepository(db)
+
+
+def get_import_batch_size(request: Request) -> int:
+    return getattr(request.app.state, "ledger_import_batch_size", importing.IMPORT_BATCH_SIZE)
+
+
+def _ledger_problem(exc: errors.LedgerError) -> HTTPException:
+    if type(exc) in _UNPROCESSABLE:
+        title, type_ = _UNPROCESSABLE[type(exc)]
+        return problem(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            title=title,
+            detail=str(exc),
+            type_=type_,
+        )
+    return _LEDGER_PROBLEMS[type(exc)].exception()
+
+
+def _body_chunks(request: Request, loop: asyncio.AbstractEventLoop) -> Iterator[bytes]:
+    """The request body, read chunk by chunk from a worker thread as it is consumed."""
+    stream = request.stream().__aiter__()
+
+    async def receive() -> bytes | None:
+        try:
+            return await stream.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    while (chunk := asyncio.run_coroutine_threadsafe(receive(), loop).result()) is not None:
+        if chunk:
+            yield chunk
+
+
+def _account_out(account: Account) -> AccountOut:
+    assert account.id is not None
+    return AccountOut(
+        id=account.id,
+        name=account.name,
+        account_type=account.account_type,  # type: ignore[arg-type]
+        balance=service.from_minor(account.balance_minor),
+        entry_count=account.entry_count,
+        created_at=service._as_utc(account.created_at),
+        updated_at=service._as_utc(account.updated_at),
+    )
+
+
+def _account_version(account: Account) -> tuple[int | None, int, datetime]:
+    # Every posting bumps entry_count and updated_at in the same UPDATE.
+    return account.id, account.entry_count, account.updated_at
+
+
+def _category_out(category: Category) -> CategoryOut:
+    assert category.id is not None
+    return CategoryOut(
+        id=category.id,
+        name=category.name,
+        category_type=category.category_type,  # type: ignore[arg-type]
+        monthly_budget=service.from_minor(category.monthly_budget_minor),
+        created_at=service._as_utc(category.created_at),
+    )
+
+
+def _report_out(report: reports.Report) -> ReportOut:
+    return ReportOut(
+        start=report.start.strftime("%Y-%m"),
+        end=report.end.strftime("%Y-%m"),
+        opening_net=service.from_minor(report.opening_net_minor),
+        months=[
+            MonthReportOut(
+                month=month.month.strftime("%Y-%m"),
+                inflow=service.from_minor(month.inflow_minor),
+                outflow=service.from_minor(month.outflow_minor),
+                net=service.from_minor(month.net_minor),
+                running_net=service.from_minor(month.running_net_minor),
+                categories=[
+                    CategoryMonthOut(
+                        category_id=line.category_id,
+                        name=line.name,
+                        inflow=service.from_minor(line.inflow_minor),
+                        outflow=service.from_minor(line.outflow_minor),
+                        net=service.from_minor(line.net_minor),
+                        budget=service.from_minor(line.budget_minor),
+                        remaining=service.from_minor(line.remaining_minor),
+                    )
+                    for line in month.categories
+                ],
+            )
+            for month in report.months
+        ],
+    )
+
+
+def _parse_month(value: str) -> date:
+    year, month = value.split("-")
+    return date(int(year), int(month), 1)
+
+
+def _entry_out(entry: LedgerEntry) -> EntryOut:
+    assert entry.id is not None
+    return EntryOut(
+        id=entry.id,
+        account_id=entry.account_id,
+        amount=service.from_minor(entry.amount_minor),
+        description=entry.description,
+        occurred_on=entry.occurred_on,
+        created_at=service._as_utc(entry.created_at),
+        reverses_id=entry.reverses_id,
+        category_id=entry.category_id,
+    )
+
+
+def _import_out(result: importing.ImportResult) -> ImportOut:
+    return ImportOut(
+        rows=result.rows,
+        inserted=result.inserted,
+        duplicates=result.duplicates,
+        invalid=result.invalid,
+        batches=result.batches,
+        errors=[ImportErrorOut(row=error.row, message=error.message) for error in result.errors],
+        duration_seconds=round(result.duration_seconds, 3),
+        rows_per_second=round(result.rows_per_second, 1),
+    )
+
+
+def _entry_cursor_scope(account_id: int) -> str:
+    return f"ledger-entries:{account_id}"
+
+
+def _entry_page_out(page: EntryPage, account_id: int, codec: CursorCodec) -> EntryPageOut:
+    return EntryPageOut(
+        entries=[_entry_out(entry) for entry in page.entries],
+        next_cursor=codec.encode(_entry_cursor_scope(account_id), page.next_after)
+        if page.next_after
+        else None,
+    )
+
+
+@ledger_router.get("/accounts", response_model=list[AccountOut])
+def list_accounts(
+    user: User = Depends(get_current_user),
+    repo: LedgerRepository = Depends(get_ledger_repository),
+    conditional: ConditionalGet = Depends(get_conditional_get),
+) -> Response:
+    """The caller's accounts with their current balances."""
+    accounts = service.list_accounts(repo, user.id)
+    return conditional.respond(
+        version_etag("accounts", *(_account_version(account) for account in accounts)),
+        lambda: [_account_out(account) for account in accounts],
+    )
+
+
+@ledger_router.post("/accounts", status_code=status.HTTP_201_CREATED, response_model=AccountOut)
+def create_account(
+    payload: AccountIn,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_session),
+    repo: LedgerRepository = Depends(get_ledger_repository),
+) -> ModelResponse:
+    account = service.create_account(
+        repo,
+        user.id,
+        payload.name,
+        payload.account_type,
+        service.to_minor(payload.opening_balance),
+    )
+    out = _account_out(account)
+    db.commit()
+    return ModelResponse(out, status_code=status.HTTP_201_CREATED)
+
+
+@ledger_router.get("/accounts/{account_id}", response_model=AccountOut)
+def get_account(
+    account_id: int,
+    user: User = Depends(get_current_user),
+    repo: LedgerRepository = Depends(get_ledger_repository),
+    conditional: ConditionalGet = Depends(get_conditional_get),
+) -> Response:
+    try:
+        account = service.get_account(repo, user.id, account_id)
+    except errors.LedgerError as exc:
+        raise _ledger_problem(exc) from exc
+    return conditional.respond(
+        version_etag("account", _account_version(account)), lambda: _account_out(account)
+    )
+
+
+@ledger_router.get("/categories", response_model=list[CategoryOut])
+def list_categories(
+    user: User = Depends(get_current_user),
+    repo: LedgerRepository = Depends(get_ledger_repository),
+    conditional: ConditionalGet = Depends(get_conditional_get),
+) -> Response:
+    categories = service.list_categories(repo, user.id)
+    # Categories are never edited; the id and budget identify each version.
+    return conditional.respond(
+        version_etag(
+            "categories",
+            *((category.id, category.monthly_budget_minor) for category in categories),
+        ),
+        lambda: [_category_out(category) for category in categories],
+    )
+
+
+@ledger_router.post(
+    "/categories", status_code=status.HTTP_201_CREATED, response_model=CategoryOut
+)
+def create_category(
+    payload: CategoryIn,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_session),
+    repo: LedgerRepository = Depends(get_ledger_repository),
+) -> ModelResponse:
+    category = service.create_category(
+        repo,
+        user.id,
+        payload.name,
+        payload.category_type,
+        service.to_minor(payload.monthly_budget),
+    )
+    out = _category_out(category)
+    db.commit()
+    return ModelResponse(out, status_code=status.HTTP_201_CREATED)
+
+
+@ledger_router.get("/reports/monthly", response_model=ReportOut)
+def monthly_report(
+    start: str | None = Query(default=None, pattern=_MONTH_PATTERN, description="YYYY-MM"),
+    end: str | None = Query(default=None, pattern=_MONTH_PATTERN, description="YYYY-MM"),
+    user: User = Depends(get_current_user),
+    repo: LedgerRepository = Depends(get_ledger_repository),
+) -> ModelResponse:
+    """Per-category actuals against budget and the running net, month by month.
+
+    Defaults to the twelve months ending with the current one.
+    """
+    end_month = _parse_month(end) if end else service.month_of(service._utcnow().date())
+    start_month = (
+        _parse_month(start)
+        if start
+        else reports.add_months(end_month, 1 - reports.REPORT_MONTHS_DEFAULT)
+    )
+    try:
+        report = reports.monthly_report(repo, user.id, start_month, end_month)
+    except errors.LedgerError as exc:
+        raise _ledger_problem(exc) from exc
+    return ModelResponse(_report_out(report))
+
+
+@ledger_router.get("/accounts/{account_id}/entries", response_model=EntryPageOut)
+def list_entries(
+    account_id: int,
+    limit: int = Query(default=50, ge=1, le=service.ENTRY_PAGE_MAX),
+    cursor: str | None = None,
+    user: User = Depends(get_current_user),
+    repo: LedgerRepository = Depends(get_ledger_repository),
+    codec: CursorCodec = Depends(get_cursor_codec),
+) -> ModelResponse:
+    """The account's entries, latest first; pass ``next_cursor`` back for more."""
+    after = cast(
+        "EntryCursor | None", decode_cursor(codec, _entry_cursor_scope(account_id), cursor)
+    )
+    try:
+        page = service.list_entries(repo, user.id, account_id, limit, after)
+    except errors.LedgerError as exc:
+        raise _ledger_problem(exc) from exc
+    return ModelResponse(_entry_page_out(page, account_id, codec))
+
+
+@ledger_router.post(
+    "/accounts/{account_id}/entries",
+    status_code=status.HTTP_201_CREATED,
+    response_model=EntryOut,
+)
+def post_entry(
+    account_id: int,
+    payload: EntryIn,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_session),
+    repo: LedgerRepository = Depends(get_ledger_repository),
+) -> ModelResponse:
+    """Append an entry; the account's balance moves in the same transaction."""
+    try:
+        entry = service.post_entry(
+            repo,
+            user.id,
+            account_id,
+            service.to_minor(payload.amount),
+            payload.occurred_on,
+            payload.description,
+            category_id=payload.category_id,
+        )
+    except errors.LedgerError as exc:
+        raise _ledger_problem(exc) from exc
+    out = _entry_out(entry)
+    db.commit()
+    return ModelResponse(out, status_code=status.HTTP_201_CREATED)
+
+
+@ledger_router.post(
+    "/entries/{entry_id}/reverse",
+    status_code=status.HTTP_201_CREATED,
+    response_model=EntryOut,
+)
+def reverse_entry(
+    entry_id: int,
+    user: User = Depends(get_current_user),
+    db: Session = Depends(get_session),
+    repo: LedgerRepository = Depends(get_ledger_repository),
+) -> ModelResponse:
+    """Undo an entry by posting its opposite; the original stays in the log."""
+    try:
+        entry = service.reverse_entry(repo, user.id, entry_id)
+    except errors.LedgerError as exc:
+        raise _ledger_problem(exc) from exc
+    out = _entry_out(entry)
+    db.commit()
+    return ModelResponse(out, status_code=status.HTTP_201_CREATED)
+
+
+@ledger_router.post("/accounts/{account_id}/import", response_model=ImportOut)
+async def import_entries(
+    account_id: int,
+    request: Request,
+    file_format: importing.ImportFormat = Query(default="csv", alias="format"),
+    batch_size: int = Depends(get_import_batch_size),
+    user: User = Depends(get_current_user_detached),
+) -> ModelResponse:
+    """Import a CSV or OFX statement sent as the raw request body.
+
+    The body is parsed while it streams in and written in batches, each
+    committed on its own; rows the account already has are skipped, so a
+    failed import can simply be sent again. The caller is resolved in a
+    session closed before the upload starts, so no connection is held
+    while it streams.
+    """
+    rows = importing.PARSERS[file_format](
+        importing.iter_text(_body_chunks(request, asyncio.get_running_loop()))
+    )
+    try:
+        result = await asyncio.to_thread(
+            importing.import_entries, get_engine(), user.id, account_id, rows, batch_size
+        )
+    except errors.LedgerError as exc:
+        raise _ledger_problem(exc) from exc
+    return ModelResponse(_import_out(result))
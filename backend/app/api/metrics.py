@@ -0,0 +1,70 @@
+"""Prometheus metrics endpoint."""
+
+from collections.abc import Iterable
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import REGISTRY, Family
+from app.db.pool import collect_pool_stats
+
+metrics_router = APIRouter()
+
+_POOL_GAUGES = (
+    ("bc_db_pool_size", "gauge", "Configured persistent connections.", "size"),
+    ("bc_db_pool_checked_out", "gauge", "Connections currently in use.", "checked_out"),
+    ("bc_db_pool_idle", "gauge", "Idle connections in the pool.", "idle"),
+    ("bc_db_pool_overflow", "gauge", "Connections open beyond the pool size.", "overflow"),
+    ("bc_db_pool_checkouts_total", "counter", "Connection checkouts.", "checkouts"),
+    ("bc_db_pool_timeouts_total", "counter", "Checkouts that timed out.", "timeouts"),
+    (
+        "bc_db_pool_checkout_wait_seconds_total",
+        "counter",
+        "Time spent waiting for connections.",
+        "wait_seconds_total",
+    ),
+)
+
+
+def _pool_families() -> Iterable[Family]:
+    stats = collect_pool_stats()
+    for name, kind, help_text, attribute in _POOL_GAUGES:
+        samples = [
+            (name, {"pool": pool}, getattr(pool_stats, attribute))
+            for pool, pool_stats in stats.items()
+        ]
+        yield (name, kind, help_text, samples)
+
+
+def _session_cache_families(request: Request) -> Iterable[Family]:
+    cache = getattr(request.app.state, "session_cache", None)
+    if cache is None:
+        return
+    stats = cache.stats()
+    name = "bc_session_cache_entries"
+    yield (name, "gauge", "Cached sessions.", [(name, {}, stats.size)])
+    for event in ("hits", "misses", "evictions", "expirations"):
+        name = f"bc_session_cache_{event}_total"
+        yield (name, "counter", f"Session cache {event}.", [(name, {}, getattr(stats, event))])
+
+
+def _admission_families(request: Request) -> Iterable[Family]:
+    gates = getattr(request.app.state, "admission_gates", None)
+    if not gates:
+        return
+    for name, help_text, attribute in (
+        ("bc_admission_active", "Requests holding an admission slot.", "active"),
+        ("bc_admission_queued", "Requests waiting for an admission slot.", "queued"),
+    ):
+        samples = [
+            (name, {"group": group}, getattr(gate, attribute)) for group, gate in gates.items()
+        ]
+        yield (name, "gauge", help_text, samples)
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics(request: Request) -> PlainTextResponse:
+    body = REGISTRY.render(
+        [*_pool_families(), *_session_cache_families(request), *_admission_families(request)]
+    )
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
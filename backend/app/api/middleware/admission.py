@@ -0,0 +1,143 @@
+"""Admission control: bounded concurrency and queueing per route group.
+
+Sync handlers run on a fixed thread pool, so without a limit an overload
+or a slow database turns into an unbounded queue in front of it. Each
+route group admits up to ``max_concurrency`` requests and parks up to
+``max_queue`` more; anything beyond that, or anything still parked after
+the queue timeout, is shed at once with a 503 and ``Retry-After``.
+
+Gates are only touched from the event loop, so they need no locks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Mapping
+
+from fastapi import status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.api.problem_details import problem, problem_response
+from app.core.config import AdmissionGroup
+from app.core.metrics import ADMISSION_QUEUE_WAIT, ADMISSION_SHED
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; ``reason`` is ``queue_full`` or ``timeout``."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionGate:
+    """Concurrency limit with a bounded FIFO queue for one route group."""
+
+    def __init__(self, name: str, prefix: str, max_concurrency: int, max_queue: int) -> None:
+        self.name = name
+        self.prefix = prefix
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, timeout: float) -> None:
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+            return
+        if self.queued >= self.max_queue:
+            raise AdmissionRejected("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return  # The slot arrived just as the timeout fired.
+            raise AdmissionRejected("timeout") from None
+        except BaseException:
+            # Cancelled after ``release`` handed us the slot: pass it on.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Hand the slot to the oldest live waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionControlMiddleware:
+    """Admit requests through the gate whose path prefix matches, longest first.
+
+    Paths outside every group (health checks, metrics) pass straight through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        gates: Mapping[str, AdmissionGate],
+        queue_timeout_seconds: float = 2.0,
+        retry_after_seconds: int = 1,
+    ) -> None:
+        self.app = app
+        self.gates = sorted(gates.values(), key=lambda gate: len(gate.prefix), reverse=True)
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.retry_after_seconds = retry_after_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        gate = self._gate_for(scope) if scope["type"] == "http" else None
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await gate.acquire(self.queue_timeout_seconds)
+        except AdmissionRejected as exc:
+            ADMISSION_SHED.inc(gate.name, exc.reason)
+            await self._reject(scope, receive, send)
+            return
+        ADMISSION_QUEUE_WAIT.observe(time.perf_counter() - start, gate.name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+    def _gate_for(self, scope: Scope) -> AdmissionGate | None:
+        path = scope["path"]
+        for gate in self.gates:
+            if path == gate.prefix or path.startswith(gate.prefix.rstrip("/") + "/"):
+                return gate
+        return None
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send) -> None:
+        exc = problem(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            title="Service overloaded",
+            detail="Too many requests are in progress; retry shortly.",
+            type_="https://budget-compass/errors/overloaded",
+            headers={"Retry-After": str(self.retry_after_seconds)},
+        )
+        await problem_response(exc)(scope, receive, send)
+
+
+def build_gates(groups: Mapping[str, AdmissionGroup]) -> dict[str, AdmissionGate]:
+    return {
+        name: AdmissionGate(name, group.prefix, group.max_concurrency, group.max_queue)
+        for name, group in groups.items()
+    }
@@ -0,0 +1,94 @@
+"""Opt-in per-request profiling middleware."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.profiling import RequestProfile, StackSampler, verify_profile_token, write_profile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+
+
+class ProfilingMiddleware:
+    """Profile a request when it carries a valid signed ``X-Profile`` header or
+    wins the ``sample_rate`` draw, and dump the result into ``directory``.
+
+    At most one request is profiled at a time; others run unprofiled.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        directory: str,
+        sample_rate: float = 0.0,
+        secret: bytes | None = None,
+        interval_seconds: float = 0.002,
+        max_files: int = 200,
+    ) -> None:
+        self.app = app
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.secret = secret
+        self.interval_seconds = interval_seconds
+        self.max_files = max_files
+        self._in_flight = 0
+        self._profiling = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self._in_flight += 1
+        try:
+            if self._profiling or not self._selected(scope):
+                await self.app(scope, receive, send)
+                return
+            self._profiling = True
+            try:
+                await self._profile(scope, receive, send)
+            finally:
+                self._profiling = False
+        finally:
+            self._in_flight -= 1
+
+    def _selected(self, scope: Scope) -> bool:
+        token = Headers(scope=scope).get(PROFILE_HEADER)
+        if token is not None and self.secret is not None:
+            return verify_profile_token(self.secret, token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        sampler = StackSampler(self.interval_seconds, lambda: self._in_flight)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            sampler.stop()
+            route = getattr(scope.get("route"), "path", "unmatched")
+            profile = RequestProfile(
+                method=scope["method"],
+                route=route,
+                started_at=started_at,
+                duration_seconds=time.perf_counter() - start,
+                interval_seconds=self.interval_seconds,
+                samples=sampler.samples,
+                max_concurrency=sampler.max_concurrency,
+                stacks=dict(sampler.stacks),
+            )
+            try:
+                await asyncio.to_thread(write_profile, self.directory, profile, self.max_files)
+            except OSError:
+                logger.exception("Could not write request profile to %s", self.directory)
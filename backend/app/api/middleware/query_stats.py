@@ -0,0 +1,58 @@
+"""Per-request SQL accounting middleware."""
+
+from __future__ import annotations
+
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_stats import count_queries
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+
+class QueryStatsMiddleware:
+    """Report each request's statement count and DB time.
+
+    With ``headers`` enabled the response carries ``X-DB-Query-Count`` and a
+    ``Server-Timing: db`` entry. Requests issuing more than ``warn_threshold``
+    statements are logged at WARNING, which is where N+1 loops show up.
+    """
+
+    def __init__(self, app: ASGIApp, headers: bool = False, warn_threshold: int = 10) -> None:
+        self.app = app
+        self.headers = headers
+        self.warn_threshold = warn_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                if self.headers and message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append(QUERY_COUNT_HEADER, str(stats.count))
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={1000 * stats.seconds:.2f};desc="{stats.count} queries"',
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+        route = getattr(scope.get("route"), "path", "unmatched")
+        level = logging.WARNING if stats.count > self.warn_threshold else logging.DEBUG
+        logger.log(
+            level,
+            "%s %s ran %d queries in %.2fms",
+            scope["method"],
+            route,
+            stats.count,
+            1000 * stats.seconds,
+        )
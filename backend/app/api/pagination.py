@@ -0,0 +1,30 @@
+"""Signed keyset cursors for list routes (see ``app.db.pagination``)."""
+
+from fastapi import Request, status
+
+from app.api.problem_details import ProblemDetails
+from app.db.pagination import CursorCodec, InvalidCursor, KeyValue
+
+INVALID_CURSOR = ProblemDetails(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    title="Invalid cursor",
+    detail="The pagination cursor is not valid.",
+    type_="https://budget-compass/errors/invalid-cursor",
+)
+
+
+def get_cursor_codec(request: Request) -> CursorCodec:
+    """Return the process-wide cursor codec, keyed with ``cursor_secret``."""
+    return request.app.state.cursor_codec
+
+
+def decode_cursor(
+    codec: CursorCodec, scope: str, cursor: str | None
+) -> tuple[KeyValue, ...] | None:
+    """The key a cursor continues after; a cursor this service did not issue is a 400."""
+    if cursor is None:
+        return None
+    try:
+        return codec.decode(scope, cursor)
+    except InvalidCursor as exc:
+        raise INVALID_CURSOR.exception() from exc
@@ -1,9 +1,22 @@
 """Problem details helpers (RFC 7807 style)."""
 
-from fastapi import HTTPException
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
 
+import pydantic_core
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from starlette.responses import Response
 
-def problem(status_code: int, title: str, detail: str, type_: str) -> HTTPException:
+
+def problem(
+    status_code: int,
+    title: str,
+    detail: str,
+    type_: str,
+    headers: Mapping[str, str] | None = None,
+) -> HTTPException:
     """Create a problem-details HTTP exception."""
     return HTTPException(
         status_code=status_code,
@@ -13,4 +26,48 @@ def problem(status_code: int, title: str, detail: str, type_: str) -> HTTPExcept
             "status": status_code,
             "detail": detail,
         },
+        headers=dict(headers) if headers else None,
     )
+
+
+def problem_response(exc: HTTPException) -> JSONResponse:
+    """Render ``exc`` the way FastAPI's handler would, for code outside the router."""
+    return JSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+
+
+@dataclass(frozen=True)
+class ProblemDetails:
+    """A fixed problem whose response body is rendered once, when it is defined."""
+
+    status_code: int
+    title: str
+    detail: str
+    type_: str
+    payload: dict[str, Any] = field(init=False, repr=False, compare=False)
+    body: bytes = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        payload = {
+            "type": self.type_,
+            "title": self.title,
+            "status": self.status_code,
+            "detail": self.detail,
+        }
+        object.__setattr__(self, "payload", payload)
+        object.__setattr__(self, "body", pydantic_core.to_json({"detail": payload}))
+
+    def exception(self) -> "ProblemDetailsException":
+        return ProblemDetailsException(self)
+
+
+class ProblemDetailsException(HTTPException):
+    """``HTTPException`` for a ``ProblemDetails``; its handler sends the cached body."""
+
+    def __init__(self, problem_details: ProblemDetails) -> None:
+        super().__init__(status_code=problem_details.status_code, detail=problem_details.payload)
+        self.body = problem_details.body
+
+
+async def problem_details_handler(_request: Request, exc: Exception) -> Response:
+    assert isinstance(exc, ProblemDetailsException)
+    return Response(exc.body, status_code=exc.status_code, media_type="application/json")
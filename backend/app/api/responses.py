@@ -0,0 +1,21 @@
+"""Response classes for the API's hot paths."""
+
+from typing import Any
+
+import pydantic_core
+from starlette.responses import Response
+
+
+class ModelResponse(Response):
+    """JSON response rendered straight from Pydantic models by pydantic-core.
+
+    Routes return this instead of the model so FastAPI skips re-validating
+    the model against ``response_model`` and the ``jsonable_encoder`` pass;
+    ``response_model`` stays on the route for the OpenAPI schema. Build the
+    model with ``model_construct`` when its values are already trusted.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
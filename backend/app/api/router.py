@@ -4,7 +4,22 @@ from fastapi import APIRouter
 
 from app.api.auth import auth_router
 from app.api.health import health_router
+from app.api.ledger import ledger_router
+from app.api.metrics import metrics_router
+from app.core.config import Settings
 
-api_router = APIRouter()
-api_router.include_router(health_router)
-api_router.include_router(auth_router)
+
+def build_api_router(settings: Settings) -> APIRouter:
+    """Assemble the API routers, picking the sync or async auth stack."""
+    api_router = APIRouter()
+    api_router.include_router(health_router)
+    api_router.include_router(metrics_router)
+    api_router.include_router(ledger_router)
+    if settings.db_async:
+        # Imported only here so the sync stack never loads the asyncio drivers.
+        from app.api.auth_async import async_auth_router
+
+        api_router.include_router(async_auth_router)
+    else:
+        api_router.include_router(auth_router)
+    return api_router
@@ -0,0 +1 @@
+"""Operational command-line entry points (``python -m app.cli``)."""
@@ -0,0 +1,264 @@
+"""Command-line entry point: ``python -m app.cli <command>``."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from datetime import timedelta
+from pathlib import Path
+
+from app.core.config import Settings, get_settings
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def _reap_sessions(args: argparse.Namespace, settings: Settings) -> int:
+    from app.db.session import init_engine
+    from app.domains.auth.reaper import reap_ended_sessions
+
+    result = reap_ended_sessions(
+        init_engine(settings),
+        batch_size=args.batch_size
+        if args.batch_size is not None
+        else settings.session_reaper_batch_size,
+        retention=timedelta(
+            hours=args.retention_hours
+            if args.retention_hours is not None
+            else settings.session_reaper_retention_hours
+        ),
+        batch_sleep_seconds=args.batch_sleep
+        if args.batch_sleep is not None
+        else settings.session_reaper_batch_sleep_seconds,
+    )
+    print(f"reaped {result.deleted} sessions in {result.batches} batches")
+    return 0
+
+
+def _migrate(args: argparse.Namespace, settings: Settings) -> int:
+    from app.db.migrations import create_database, migrate
+    from app.db.session import init_engine
+
+    engine = init_engine(settings)
+    if args.create_database:
+        create_database(engine)
+    result = migrate(engine)
+    if result.applied:
+        print(f"migrated schema from version {result.from_version} to {result.to_version}")
+    else:
+        print(f"schema is current at version {result.to_version}")
+    return 0
+
+
+def _ledger_check(args: argparse.Namespace, settings: Settings) -> int:
+    from app.db.session import init_engine
+    from app.domains.ledger.consistency import check_ledger
+
+    result = check_ledger(init_engine(settings), batch_size=args.batch_size, repair=args.repair)
+    for mismatch in result.mismatches:
+        print(
+            f"account {mismatch.account_id}: stored balance {mismatch.stored.balance_minor}"
+            f" over {mismatch.stored.entry_count} entries, entries sum to"
+            f" {mismatch.rebuilt.balance_minor} over {mismatch.rebuilt.entry_count}"
+        )
+    verdict = "repaired" if args.repair else "found"
+    print(f"checked {result.accounts} accounts, {verdict} {len(result.mismatches)} mismatches")
+    return 1 if result.mismatches and not args.repair else 0
+
+
+def _ledger_rollups(args: argparse.Namespace, settings: Settings) -> int:
+    from app.db.session import init_engine
+
+    try:
+        from app.domains.ledger.analytics import check_rollups
+    except ModuleNotFoundError as exc:
+        if exc.name != "numpy":
+            raise
+        print("ledger-rollups needs NumPy; install it with `uv sync --extra reports`")
+        return 1
+    result = check_rollups(init_engine(settings), repair=args.repair)
+    for mismatch in result.mismatches:
+        stored, rebuilt = (
+            f"in {totals.inflow_minor} out {totals.outflow_minor} over {totals.entry_count}"
+            if totals
+            else "nothing"
+            for totals in (mismatch.stored, mismatch.rebuilt)
+        )
+        print(
+            f"user {mismatch.user_id} {mismatch.month:%Y-%m} category {mismatch.category_id}:"
+            f" stored {stored}, entries give {rebuilt}"
+        )
+    verdict = "repaired" if args.repair else "found"
+    print(
+        f"checked {result.entries} entries of {result.users} users,"
+        f" {verdict} {len(result.mismatches)} mismatched rollups"
+    )
+    return 1 if result.mismatches and not args.repair else 0
+
+
+def _ledger_import(args: argparse.Namespace, settings: Settings) -> int:
+    from sqlmodel import Session
+
+    from app.db.session import init_engine
+    from app.domains.ledger import errors, importing
+    from app.domains.ledger.models import Account
+
+    engine = init_engine(settings)
+    with Session(engine) as db:
+        account = db.get(Account, args.account_id)
+    if account is None:
+        print(f"account {args.account_id} does not exist")
+        return 1
+    file_format: importing.ImportFormat = args.format or ("ofx" if args.path.suffix.lower() in {".ofx", ".qfx"} else "csv")
+
+    def report(result: importing.ImportResult) -> None:
+        print(
+            f"batch {result.batches}: {result.rows} rows read, {result.inserted} new,"
+            f" {result.duplicates} duplicates, {result.invalid} invalid,"
+            f" {result.rows_per_second:.0f} rows/s"
+        )
+
+    with args.path.open("rb") as upload:
+        chunks = iter(lambda: upload.read(64 * 1024), b"")
+        try:
+            result = importing.import_entries(
+                engine,
+                account.user_id,
+                args.account_id,
+                importing.PARSERS[file_format](importing.iter_text(chunks)),
+                batch_size=args.batch_size
+                if args.batch_size is not None
+                else settings.ledger_import_batch_size,
+                on_progress=report,
+            )
+        except errors.InvalidImportFile as exc:
+            print(f"cannot import {args.path}: {exc}")
+            return 1
+    for error in result.errors:
+        print(f"row {error.row}: {error.message}")
+    print(
+        f"imported {result.inserted} of {result.rows} rows in {result.duration_seconds:.1f}s"
+        f" ({result.duplicates} duplicates, {result.invalid} invalid)"
+    )
+    return 0
+
+
+def _profile_report(args: argparse.Namespace, settings: Settings) -> int:
+    from app.core.profiling import aggregate_profiles, load_profiles
+
+    directory = Path(args.dir or settings.profiling_dir)
+    reports = aggregate_profiles(load_profiles(directory), exclusive=args.exclusive)
+    if args.route:
+        reports = {key: report for key, report in reports.items() if args.route in key}
+    if not reports:
+        print(f"no profiles in {directory}")
+        return 0
+    for key, report in sorted(reports.items(), key=lambda item: -item[1].samples):
+        print(f"{key}  ({report.profiles} profiles, {report.samples} samples)")
+        for hot in report.top(args.top):
+            self_pct = 100 * hot.self_samples / report.samples
+            total_pct = 100 * hot.total_samples / report.samples
+            print(f"  {self_pct:5.1f}% self  {total_pct:5.1f}% total  {hot.function}")
+    return 0
+
+
+def _profile_token(args: argparse.Namespace, settings: Settings) -> int:
+    from app.core.profiling import profile_token
+
+    if settings.profiling_secret is None:
+        print("BC_PROFILING_SECRET is not set")
+        return 1
+    print(profile_token(settings.profiling_secret.get_secret_value().encode("utf-8")))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reap = commands.add_parser("reap-sessions", help="Delete expired and revoked sessions.")
+    reap.add_argument("--batch-size", type=_positive_int, default=None)
+    reap.add_argument("--retention-hours", type=float, default=None)
+    reap.add_argument("--batch-sleep", type=float, default=None, help="Seconds between batches.")
+    reap.set_defaults(handler=_reap_sessions)
+
+    migrate = commands.add_parser("migrate", help="Apply pending schema migrations.")
+    migrate.add_argument(
+        "--create-database",
+        action="store_true",
+        help="Create the MySQL database first if it does not exist.",
+    )
+    migrate.set_defaults(handler=_migrate)
+
+    ledger = commands.add_parser(
+        "ledger-check", help="Rebuild account balances from ledger entries and compare."
+    )
+    ledger.add_argument(
+        "--batch-size", type=_positive_int, default=500, help="Accounts per transaction."
+    )
+    ledger.add_argument(
+        "--repair",
+        action="store_true",
+        help="Overwrite mismatched balances with the rebuilt totals.",
+    )
+    ledger.set_defaults(handler=_ledger_check)
+
+    rollups = commands.add_parser(
+        "ledger-rollups", help="Rebuild monthly rollups from ledger entries and compare."
+    )
+    rollups.add_argument(
+        "--repair",
+        action="store_true",
+        help="Rewrite mismatched users' rollups from their entries.",
+    )
+    rollups.set_defaults(handler=_ledger_rollups)
+
+    ledger_import = commands.add_parser(
+        "ledger-import", help="Import a CSV or OFX statement into a ledger account."
+    )
+    ledger_import.add_argument("account_id", type=int)
+    ledger_import.add_argument("path", type=Path)
+    ledger_import.add_argument(
+        "--format", choices=("csv", "ofx"), default=None, help="Defaults to the file extension."
+    )
+    ledger_import.add_argument(
+        "--batch-size",
+        type=_positive_int,
+        default=None,
+        help="Defaults to BC_LEDGER_IMPORT_BATCH_SIZE.",
+    )
+    ledger_import.set_defaults(handler=_ledger_import)
+
+    report = commands.add_parser(
+        "profile-report", help="Summarise request profiles into hot functions per route."
+    )
+    report.add_argument("--dir", default=None, help="Defaults to BC_PROFILING_DIR.")
+    report.add_argument("--top", type=int, default=10)
+    report.add_argument("--route", default=None, help="Only routes containing this text.")
+    report.add_argument(
+        "--exclusive",
+        action="store_true",
+        help="Skip profiles that overlapped other requests.",
+    )
+    report.set_defaults(handler=_profile_report)
+
+    token = commands.add_parser(
+        "profile-token", help="Print an X-Profile header value valid for five minutes."
+    )
+    token.set_defaults(handler=_profile_token)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    args = build_parser().parse_args(argv)
+    return args.handler(args, get_settings())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
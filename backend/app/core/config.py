@@ -4,14 +4,24 @@ from functools import lru_cache
 import logging
 import os
 from pathlib import Path
+from typing import Literal
 
 from urllib.parse import quote_plus
 
+from pydantic import BaseModel, Field, SecretStr, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 logger = logging.getLogger(__name__)
 
 
+class AdmissionGroup(BaseModel):
+    """Admission limits for the routes under ``prefix``."""
+
+    prefix: str
+    max_concurrency: int = Field(gt=0)
+    max_queue: int = Field(ge=0)
+
+
 class Settings(BaseSettings):
     service_name: str = "budget-compass"
     version: str = "v0"
@@ -21,17 +31,103 @@ class Settings(BaseSettings):
     db_name: str = "budget_compass"
     db_user: str = "root"
     db_password: str = ""
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_recycle_seconds: int = 1800
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_pre_ping: bool = True
+    db_url: str | None = None
+    db_async: bool = False
+    db_replica_urls: list[str] = []
+    db_replica_balance: Literal["round_robin", "least_busy"] = "round_robin"
+    db_replica_health_interval_seconds: float = 10.0
+    db_schema_on_startup: Literal["migrate", "check", "skip"] = "migrate"
+    session_cache_enabled: bool = False
+    session_cache_max_entries: int = 10_000
+    session_cache_ttl_seconds: float = 30.0
+    session_cache_shared: bool = False
+    session_cache_shared_path: str = "/dev/shm/budget-compass-sessions"
+    session_reaper_enabled: bool = False
+    session_reaper_interval_seconds: float = 3600.0
+    session_reaper_batch_size: int = Field(default=1000, gt=0)
+    session_reaper_batch_sleep_seconds: float = 0.1
+    session_reaper_retention_hours: float = 24.0
+    last_login_write_behind: bool = False
+    last_login_flush_interval_seconds: float = 5.0
+    last_login_flush_threshold: int = 500
+    last_login_max_pending: int = 10_000
+    query_stats_headers: bool = False
+    query_stats_warn_threshold: int = 10
+    session_token_mode: Literal["opaque", "signed"] = "opaque"
+    session_token_secret: SecretStr | None = None
+    session_denylist_refresh_seconds: float = 5.0
+    internal_api_token: SecretStr | None = None
+    admission_control_enabled: bool = False
+    admission_groups: dict[str, AdmissionGroup] = {
+        "auth": AdmissionGroup(prefix="/auth", max_concurrency=32, max_queue=64),
+    }
+    admission_queue_timeout_seconds: float = 2.0
+    admission_retry_after_seconds: int = 1
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    profiling_secret: SecretStr | None = None
+    profiling_dir: str = "/tmp/budget-compass-profiles"
+    profiling_max_files: int = Field(default=200, gt=0)
+    profiling_interval_seconds: float = Field(default=0.002, gt=0.0)
+    ledger_import_batch_size: int = Field(default=1000, gt=0)
+    cursor_secret: SecretStr | None = None
+    read_cache_max_age_seconds: int = Field(default=0, ge=0)
 
     model_config = SettingsConfigDict(env_prefix="BC_", env_file=".env")
 
+    @model_validator(mode="after")
+    def _require_token_secret(self) -> "Settings":
+        if self.session_token_mode == "signed":
+            secret = self.session_token_secret
+            if secret is None or len(secret.get_secret_value()) < 32:
+                raise ValueError(
+                    "session_token_secret of at least 32 characters is required"
+                    " when session_token_mode is 'signed'"
+                )
+        return self
+
+    @model_validator(mode="after")
+    def _require_cursor_secret(self) -> "Settings":
+        # A per-process random key would reject cursors issued by other workers.
+        if self.environment != "local":
+            secret = self.cursor_secret
+            if secret is None or len(secret.get_secret_value()) < 32:
+                raise ValueError(
+                    "cursor_secret of at least 32 characters is required"
+                    " outside the local environment"
+                )
+        return self
+
     @property
     def database_url(self) -> str:
+        if self.db_url:
+            return self.db_url
         password = quote_plus(self.db_password)
         return (
             "mysql+pymysql://"
             f"{self.db_user}:{password}@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    @property
+    def async_database_url(self) -> str:
+        """Database URL using the asyncio driver for the configured dialect."""
+        url = self.database_url
+        for sync_prefix, async_prefix in _ASYNC_DRIVERS.items():
+            if url.startswith(sync_prefix):
+                return async_prefix + url[len(sync_prefix) :]
+        return url
+
+
+_ASYNC_DRIVERS = {
+    "mysql+pymysql://": "mysql+aiomysql://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
 
 @lru_cache
 def get_settings() -> Settings:
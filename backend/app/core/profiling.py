@@ -0,0 +1,191 @@
+"""Sampling profiler for individual requests, and the reports built from its dumps.
+
+Sync handlers run on worker threads, so a per-thread deterministic profiler
+would miss most of a request. ``StackSampler`` instead snapshots every
+thread's stack at a fixed interval and keeps the stacks that are inside
+application code (``app/``); idle pool threads and an idle event loop are
+skipped. Other requests running at the same time can appear in a profile,
+so each dump records the peak number of concurrent requests and reports
+can be limited to profiles that ran alone.
+
+Dumps are JSON files named ``<UTC timestamp>-<METHOD>-<route>.json`` holding
+collapsed stacks (``outer;...;inner`` mapped to a sample count), the same
+shape flame graph tools read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+APP_ROOT = str(Path(__file__).resolve().parent.parent)
+MAX_STACK_DEPTH = 128
+TOKEN_MAX_AGE_SECONDS = 300
+
+_SLUG = re.compile(r"[^A-Za-z0-9]+")
+
+
+class StackSampler:
+    """Collects collapsed stacks from every thread until ``stop`` is called."""
+
+    def __init__(self, interval_seconds: float, concurrency: Callable[[], int]) -> None:
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.max_concurrency = 0
+        self._concurrency = concurrency
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            self.samples += 1
+            self.max_concurrency = max(self.max_concurrency, self._concurrency())
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = _collapse(frame)
+                if stack is not None:
+                    self.stacks[stack] += 1
+
+
+def _collapse(frame: FrameType | None) -> str | None:
+    names: list[str] = []
+    in_app = False
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        in_app = in_app or code.co_filename.startswith(APP_ROOT)
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}")
+        frame = frame.f_back
+    if not in_app:
+        return None
+    return ";".join(reversed(names))
+
+
+@dataclass(frozen=True)
+class RequestProfile:
+    method: str
+    route: str
+    started_at: datetime
+    duration_seconds: float
+    interval_seconds: float
+    samples: int
+    max_concurrency: int
+    stacks: dict[str, int]
+
+    def filename(self) -> str:
+        stamp = self.started_at.strftime("%Y%m%dT%H%M%S%fZ")
+        route = _SLUG.sub("_", self.route).strip("_") or "root"
+        return f"{stamp}-{self.method}-{route}.json"
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "method": self.method,
+            "route": self.route,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": self.duration_seconds,
+            "interval_seconds": self.interval_seconds,
+            "samples": self.samples,
+            "max_concurrency": self.max_concurrency,
+            "stacks": self.stacks,
+        }
+
+
+def write_profile(directory: Path, profile: RequestProfile, max_files: int) -> Path:
+    """Write ``profile`` and delete the oldest dumps beyond ``max_files``."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / profile.filename()
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(profile.to_json()))
+    os.replace(tmp, path)
+    dumps = sorted(directory.glob("*.json"))
+    for old in dumps[: max(0, len(dumps) - max_files)]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+def profile_token(secret: bytes, now: float | None = None) -> str:
+    """Value for the ``X-Profile`` header: ``<unix seconds>.<hex HMAC-SHA256>``."""
+    issued = str(int(time.time() if now is None else now))
+    return f"{issued}.{hmac.new(secret, issued.encode(), hashlib.sha256).hexdigest()}"
+
+
+def verify_profile_token(secret: bytes, token: str, now: float | None = None) -> bool:
+    issued, _, signature = token.partition(".")
+    if not issued.isdigit():
+        return False
+    expected = hmac.new(secret, issued.encode(), hashlib.sha256).hexdigest()
+    age = (time.time() if now is None else now) - int(issued)
+    return hmac.compare_digest(signature, expected) and 0 <= age <= TOKEN_MAX_AGE_SECONDS
+
+
+@dataclass(frozen=True)
+class HotFunction:
+    function: str
+    self_samples: int
+    total_samples: int
+
+
+@dataclass
+class RouteReport:
+    route: str
+    profiles: int = 0
+    samples: int = 0
+    self_counts: Counter[str] = field(default_factory=Counter)
+    total_counts: Counter[str] = field(default_factory=Counter)
+
+    def top(self, limit: int) -> list[HotFunction]:
+        """Functions with the most samples at the top of the stack."""
+        return [
+            HotFunction(function, self_samples, self.total_counts[function])
+            for function, self_samples in self.self_counts.most_common(limit)
+        ]
+
+
+def load_profiles(directory: Path) -> Iterable[dict[str, Any]]:
+    for path in sorted(directory.glob("*.json")):
+        try:
+            yield json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+
+
+def aggregate_profiles(
+    profiles: Iterable[dict[str, Any]], exclusive: bool = False
+) -> dict[str, RouteReport]:
+    """Merge dumps per ``METHOD route``; ``exclusive`` keeps only solo requests."""
+    reports: dict[str, RouteReport] = {}
+    for profile in profiles:
+        if exclusive and profile["max_concurrency"] > 1:
+            continue
+        key = f"{profile['method']} {profile['route']}"
+        report = reports.setdefault(key, RouteReport(key))
+        report.profiles += 1
+        for stack, count in profile["stacks"].items():
+            frames = stack.split(";")
+            report.samples += count
+            report.self_counts[frames[-1]] += count
+            for function in set(frames):
+                report.total_counts[function] += count
+    return reports
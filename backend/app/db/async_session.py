@@ -0,0 +1,69 @@
+"""Async database engine and session management."""
+
+import logging
+from collections.abc import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import Settings, get_settings
+from app.db.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    register_pool,
+    unregister_pool,
+)
+from app.db.query_stats import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+_async_engine: AsyncEngine | None = None
+
+
+def build_async_engine(settings: Settings) -> AsyncEngine:
+    """Build the asyncio SQLAlchemy engine from settings."""
+    logger.info("Async DB driver: %s", settings.async_database_url.split("://", 1)[0])
+    engine = create_async_engine(
+        settings.async_database_url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+def init_async_engine(settings: Settings | None = None) -> AsyncEngine:
+    """Build the process-wide async engine once and return it."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = build_async_engine(settings or get_settings())
+        register_pool("primary_async", _async_engine.pool)
+    return _async_engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the process-wide async engine, building it on first use."""
+    return _async_engine or init_async_engine()
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections and forget the engine."""
+    global _async_engine
+    engine, _async_engine = _async_engine, None
+    if engine is not None:
+        unregister_pool("primary_async")
+        await engine.dispose()
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an async database session for request scope.
+
+    Objects stay loaded after commit: lazy refreshes are not possible
+    outside the session's greenlet context.
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
@@ -1,23 +1,28 @@
 """Database initialization helpers."""
 
-from sqlalchemy import text
-from sqlalchemy.engine import make_url
-from sqlmodel import SQLModel, create_engine
+import logging
 
+from app.db.migrations import check_schema, migrate
 from app.db.session import get_engine
 
+logger = logging.getLogger(__name__)
 
-def init_db() -> None:
-    """Ensure database exists and create all tables."""
-    engine = get_engine()
-    with engine.connect() as connection:
-            connection.execute(
-                text(
-                    "CREATE DATABASE IF NOT EXISTS"
-                    f" `{engine.url.database}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"
-                )
-            )
-            connection.commit()
-        
 
-    SQLModel.metadata.create_all(engine)
+def init_db(mode: str = "migrate") -> None:
+    """Bring the schema up to date at startup according to ``mode``.
+
+    ``migrate`` applies pending migrations, ``check`` refuses to start on an
+    out-of-date schema, and ``skip`` does nothing (migrations run separately
+    through ``python -m app.cli migrate``).
+    """
+    if mode == "skip":
+        return
+    engine = get_engine()
+    if mode == "check":
+        check_schema(engine)
+        return
+    result = migrate(engine)
+    if result.applied:
+        logger.info(
+            "Migrated schema from version %d to %d", result.from_version, result.to_version
+        )
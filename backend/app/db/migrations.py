@@ -0,0 +1,455 @@
+"""Versioned schema migrations.
+
+``schema_version`` holds one row per applied step. Startup reads the highest
+version with a single query and returns when it matches ``LATEST_VERSION``;
+only an out-of-date database takes the migration lock and runs steps. On
+MySQL the lock is ``GET_LOCK`` so concurrent workers migrate once; SQLite
+deployments are single-host and skip it.
+
+Each step spells out the tables it creates as they were when the step was
+written, never the live models, so editing a model cannot change what an
+earlier step builds; the change needs a step of its own.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from uuid import UUID
+
+from sqlalchemy import (
+    BINARY,
+    BigInteger,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Uuid,
+    and_,
+    case,
+    create_engine,
+    func,
+    inspect,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "budget_compass_migrate"
+LOCK_TIMEOUT_SECONDS = 60
+COPY_BATCH_SIZE = 1000
+
+_BIGINT = BigInteger().with_variant(Integer, "sqlite")
+
+_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class SchemaOutOfDate(RuntimeError):
+    """Raised when the database is behind the code and migrations are disabled."""
+
+
+class MigrationLockTimeout(RuntimeError):
+    """Raised when another process holds the migration lock for too long."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+
+
+@dataclass(frozen=True)
+class MigrationResult:
+    from_version: int
+    to_version: int
+    applied: tuple[int, ...]
+
+
+def _initial_schema(conn: Connection) -> None:
+    # Tables that predate versioning already exist on older deployments;
+    # create_all skips them.
+    _metadata.create_all(conn)
+    metadata = MetaData()
+    Table(
+        "user",
+        metadata,
+        Column("id", Uuid, primary_key=True),
+        Column("email", String(255), nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("last_login_at", DateTime),
+        Column("is_active", Boolean, nullable=False),
+        Index("ix_user_email", "email", unique=True),
+    )
+    Table(
+        "session",
+        metadata,
+        Column("id", Uuid, primary_key=True),
+        Column("user_id", Uuid, ForeignKey("user.id"), nullable=False, index=True),
+        Column("token_hash", String(255), nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("expires_at", DateTime, nullable=False, index=True),
+        Column("revoked_at", DateTime, index=True),
+        Index("ix_session_token_hash", "token_hash", unique=True),
+    )
+    metadata.create_all(conn)
+
+
+def _session_lookup_indexes(conn: Connection) -> None:
+    indexes = {index["name"]: index for index in inspect(conn).get_indexes("session")}
+    token_index = indexes.get("ix_session_token_hash")
+    if token_index is not None and not token_index["unique"]:
+        _drop_index(conn, "session", "ix_session_token_hash")
+        token_index = None
+    if token_index is None:
+        conn.execute(text("CREATE UNIQUE INDEX ix_session_token_hash ON session (token_hash)"))
+    if "ix_session_revoked_at" not in indexes:
+        conn.execute(text("CREATE INDEX ix_session_revoked_at ON session (revoked_at)"))
+
+
+def _compact_session_rows(conn: Connection) -> None:
+    # Step 1 once built the live model, so some databases start out with this layout.
+    columns = {column["name"]: column for column in inspect(conn).get_columns("session")}
+    if isinstance(columns["id"]["type"], Integer):
+        return
+    conn.execute(text("ALTER TABLE session RENAME TO session_legacy"))
+    if not _is_mysql(conn):
+        # SQLite index names are global, so the new table cannot reuse them yet.
+        for index in inspect(conn).get_indexes("session_legacy"):
+            if index["name"] is not None:
+                _drop_index(conn, "session_legacy", index["name"])
+    metadata = _reflect(conn, "user")
+    sessions = Table(
+        "session",
+        metadata,
+        Column("id", _BIGINT, primary_key=True, autoincrement=True),
+        Column("user_id", Uuid, ForeignKey("user.id"), nullable=False, index=True),
+        Column("token_hash", BINARY(32), nullable=False, unique=True, index=True),
+        Column("created_at", DateTime, nullable=False),
+        Column("expires_at", DateTime, nullable=False, index=True),
+        Column("revoked_at", DateTime, index=True),
+    )
+    sessions.create(conn)
+
+    legacy = Table("session_legacy", MetaData(), autoload_with=conn)
+    query = select(legacy).order_by(legacy.c.created_at, legacy.c.id).limit(COPY_BATCH_SIZE)
+    batch = conn.execute(query).all()
+    while batch:
+        conn.execute(
+            sessions.insert(),
+            [
+                {
+                    "user_id": UUID(str(row.user_id)),
+                    "token_hash": bytes.fromhex(row.token_hash),
+                    "created_at": row.created_at,
+                    "expires_at": row.expires_at,
+                    "revoked_at": row.revoked_at,
+                }
+                for row in batch
+            ],
+        )
+        last = batch[-1]
+        batch = conn.execute(
+            query.where(
+                or_(
+                    legacy.c.created_at > last.created_at,
+                    and_(legacy.c.created_at == last.created_at, legacy.c.id > last.id),
+                )
+            )
+        ).all()
+    conn.execute(text("DROP TABLE session_legacy"))
+
+
+def _session_history_index(conn: Connection) -> None:
+    indexes = {index["name"] for index in inspect(conn).get_indexes("session")}
+    if "ix_session_user_id_created_at" not in indexes:
+        conn.execute(
+            text("CREATE INDEX ix_session_user_id_created_at ON session (user_id, created_at)")
+        )
+
+
+def _ledger_tables(conn: Connection) -> None:
+    # The tables as this step introduced them; later columns and indexes
+    # arrive in their own steps.
+    metadata = _reflect(conn, "user")
+    Table(
+        "ledger_account",
+        metadata,
+        Column("id", _BIGINT, primary_key=True, autoincrement=True),
+        Column("user_id", Uuid, ForeignKey("user.id"), nullable=False, index=True),
+        Column("name", String(100), nullable=False),
+        Column("account_type", String(20), nullable=False),
+        Column("balance_minor", BigInteger, nullable=False),
+        Column("entry_count", BigInteger, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+    )
+    Table(
+        "ledger_entry",
+        metadata,
+        Column("id", _BIGINT, primary_key=True, autoincrement=True),
+        Column("account_id", _BIGINT, ForeignKey("ledger_account.id"), nullable=False),
+        Column("user_id", Uuid, ForeignKey("user.id"), nullable=False, index=True),
+        Column("amount_minor", BigInteger, nullable=False),
+        Column("description", String(255), nullable=False),
+        Column("occurred_on", Date, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+        Column("reverses_id", _BIGINT, ForeignKey("ledger_entry.id"), unique=True),
+        Index("ix_ledger_entry_account_id_id", "account_id", "id"),
+    )
+    metadata.create_all(conn)
+
+
+def _ledger_import_hash(conn: Connection) -> None:
+    columns = {column["name"] for column in inspect(conn).get_columns("ledger_entry")}
+    if "import_hash" not in columns:
+        conn.execute(text("ALTER TABLE ledger_entry ADD COLUMN import_hash BINARY(32) NULL"))
+    indexes = {index["name"] for index in inspect(conn).get_indexes("ledger_entry")}
+    if "ix_ledger_entry_account_id_import_hash" not in indexes:
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX ix_ledger_entry_account_id_import_hash"
+                " ON ledger_entry (account_id, import_hash)"
+            )
+        )
+
+
+def _ledger_categories_and_rollups(conn: Connection) -> None:
+    # Older versions of step 5 created ledger_category and this column too.
+    metadata = _reflect(conn, "user", "ledger_entry")
+    Table(
+        "ledger_category",
+        metadata,
+        Column("id", _BIGINT, primary_key=True, autoincrement=True),
+        Column("user_id", Uuid, ForeignKey("user.id"), nullable=False, index=True),
+        Column("name", String(100), nullable=False),
+        Column("category_type", String(20), nullable=False),
+        Column("monthly_budget_minor", BigInteger, nullable=False),
+        Column("created_at", DateTime, nullable=False),
+    )
+    rollups = Table(
+        "ledger_monthly_rollup",
+        metadata,
+        Column("user_id", Uuid, ForeignKey("user.id"), primary_key=True),
+        Column("month", Date, primary_key=True),
+        Column("category_id", _BIGINT, primary_key=True, autoincrement=False),
+        Column("inflow_minor", BigInteger, nullable=False),
+        Column("outflow_minor", BigInteger, nullable=False),
+        Column("entry_count", BigInteger, nullable=False),
+    )
+    metadata.create_all(conn)
+    columns = {column["name"] for column in inspect(conn).get_columns("ledger_entry")}
+    if "category_id" not in columns:
+        if _is_mysql(conn):
+            conn.execute(
+                text(
+                    "ALTER TABLE ledger_entry ADD COLUMN category_id BIGINT NULL,"
+                    " ADD CONSTRAINT fk_ledger_entry_category_id"
+                    " FOREIGN KEY (category_id) REFERENCES ledger_category (id)"
+                )
+            )
+        else:
+            conn.execute(
+                text(
+                    "ALTER TABLE ledger_entry"
+                    " ADD COLUMN category_id BIGINT REFERENCES ledger_category (id)"
+                )
+            )
+
+    # Entries that predate categories are all uncategorized. Summing per day
+    # keeps the SQL portable; days fold into months here.
+    entries = metadata.tables["ledger_entry"]
+    amount = entries.c.amount_minor
+    daily = conn.execute(
+        select(
+            entries.c.user_id,
+            entries.c.occurred_on,
+            func.sum(case((amount > 0, amount), else_=0)),
+            func.sum(case((amount < 0, amount), else_=0)),
+            func.count(),
+        ).group_by(entries.c.user_id, entries.c.occurred_on)
+    )
+    totals: dict[tuple[UUID, date], list[int]] = {}
+    for user_id, occurred_on, inflow, outflow, count in daily:
+        key = (UUID(str(user_id)), occurred_on.replace(day=1))
+        month = totals.setdefault(key, [0, 0, 0])
+        month[0] += int(inflow)
+        month[1] += int(outflow)
+        month[2] += count
+    rows = [
+        {
+            "user_id": user_id,
+            "month": month,
+            "category_id": 0,
+            "inflow_minor": inflow,
+            "outflow_minor": outflow,
+            "entry_count": count,
+        }
+        for (user_id, month), (inflow, outflow, count) in totals.items()
+    ]
+    for start in range(0, len(rows), COPY_BATCH_SIZE):
+        conn.execute(rollups.insert(), rows[start : start + COPY_BATCH_SIZE])
+
+
+def _ledger_entry_date_index(conn: Connection) -> None:
+    indexes = {index["name"] for index in inspect(conn).get_indexes("ledger_entry")}
+    if "ix_ledger_entry_account_id_occurred_on" not in indexes:
+        conn.execute(
+            text(
+                "CREATE INDEX ix_ledger_entry_account_id_occurred_on"
+                " ON ledger_entry (account_id, occurred_on, id)"
+            )
+        )
+    # Created after its replacement: on MySQL it may be the index backing
+    # the account_id foreign key.
+    if "ix_ledger_entry_account_id_id" in indexes:
+        _drop_index(conn, "ledger_entry", "ix_ledger_entry_account_id_id")
+
+
+def _drop_session_user_index(conn: Connection) -> None:
+    # ix_session_user_id_created_at leads with user_id, so it serves the
+    # same lookups (and, on MySQL, the user_id foreign key).
+    indexes = {index["name"] for index in inspect(conn).get_indexes("session")}
+    if "ix_session_user_id" in indexes:
+        _drop_index(conn, "session", "ix_session_user_id")
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "user and session tables", _initial_schema),
+    Migration(2, "unique token_hash index, revoked_at index", _session_lookup_indexes),
+    Migration(3, "binary token_hash, BIGINT session id", _compact_session_rows),
+    Migration(4, "session (user_id, created_at) index", _session_history_index),
+    Migration(5, "ledger account and entry tables", _ledger_tables),
+    Migration(6, "ledger entry import_hash and unique index", _ledger_import_hash),
+    Migration(7, "ledger categories and monthly rollups", _ledger_categories_and_rollups),
+    Migration(8, "ledger entry (account_id, occurred_on, id) index", _ledger_entry_date_index),
+    Migration(9, "drop session user_id index", _drop_session_user_index),
+)
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(conn: Connection) -> int:
+    """Highest applied version, or 0 when ``schema_version`` does not exist yet."""
+    try:
+        version = conn.execute(select(func.max(schema_version.c.version))).scalar()
+    except DBAPIError:
+        conn.rollback()
+        return 0
+    return version or 0
+
+
+def check_schema(engine: Engine) -> int:
+    """Raise ``SchemaOutOfDate`` unless every known migration is applied."""
+    with engine.connect() as conn:
+        version = current_version(conn)
+    if version < LATEST_VERSION:
+        raise SchemaOutOfDate(
+            f"database schema is at version {version}, code expects {LATEST_VERSION};"
+            " run `python -m app.cli migrate`"
+        )
+    return version
+
+
+def migrate(engine: Engine) -> MigrationResult:
+    """Apply pending migrations; a no-op costing one query when current."""
+    with engine.connect() as conn:
+        version = current_version(conn)
+        if version >= LATEST_VERSION:
+            return MigrationResult(version, version, ())
+
+        with _migration_lock(conn):
+            # Another process may have migrated while we waited for the lock.
+            start = version = current_version(conn)
+            applied: list[int] = []
+            for migration in MIGRATIONS:
+                if migration.version <= version:
+                    continue
+                logger.info(
+                    "Applying migration %d: %s", migration.version, migration.description
+                )
+                migration.apply(conn)
+                conn.execute(
+                    schema_version.insert().values(
+                        version=migration.version,
+                        description=migration.description,
+                        applied_at=datetime.now(timezone.utc),
+                    )
+                )
+                conn.commit()
+                version = migration.version
+                applied.append(version)
+    return MigrationResult(start, version, tuple(applied))
+
+
+def create_database(engine: Engine) -> None:
+    """Create the MySQL database named in the engine URL if it is missing."""
+    if engine.dialect.name != "mysql":
+        return
+    server = create_engine(engine.url.set(database=None))
+    try:
+        with server.connect() as conn:
+            conn.execute(
+                text(
+                    "CREATE DATABASE IF NOT EXISTS"
+                    f" `{engine.url.database}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"
+                )
+            )
+    finally:
+        server.dispose()
+
+
+def _reflect(conn: Connection, *tables: str) -> MetaData:
+    """A fresh ``MetaData`` holding ``tables`` as they exist, for foreign keys to resolve."""
+    metadata = MetaData()
+    for name in tables:
+        Table(name, metadata, autoload_with=conn, resolve_fks=False)
+    return metadata
+
+
+def _is_mysql(conn: Connection) -> bool:
+    return conn.dialect.name == "mysql"
+
+
+def _drop_index(conn: Connection, table: str, name: str) -> None:
+    if _is_mysql(conn):
+        conn.execute(text(f"DROP INDEX {name} ON {table}"))
+    else:
+        conn.execute(text(f"DROP INDEX {name}"))
+
+
+@contextmanager
+def _migration_lock(conn: Connection) -> Iterator[None]:
+    if not _is_mysql(conn):
+        yield
+        return
+    acquired = conn.execute(
+        text("SELECT GET_LOCK(:name, :timeout)"),
+        {"name": LOCK_NAME, "timeout": LOCK_TIMEOUT_SECONDS},
+    ).scalar()
+    if acquired != 1:
+        raise MigrationLockTimeout(f"could not acquire {LOCK_NAME} within {LOCK_TIMEOUT_SECONDS}s")
+    try:
+        yield
+    finally:
+        conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
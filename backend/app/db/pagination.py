@@ -0,0 +1,141 @@
+"""Keyset pagination: seek predicates for repositories, signed cursors for clients.
+
+A page is the next ``limit`` rows in a fixed order of sort columns ending
+with the primary key, strictly after the last row of the previous page.
+With an index on ``(filter columns..., sort columns...)`` the database
+seeks straight to that row, so page 10,000 costs what page 1 does; OFFSET
+would read and discard every row before it.
+
+Clients get the last row's key as an opaque cursor:
+``<payload>.<signature>`` in unpadded base64url, where the payload holds a
+scope naming the list and the typed key values, and the signature is a
+truncated HMAC-SHA256 over it. A cursor is only ever decoded from what
+this service issued for the same list, so repositories can trust its shape.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import operator
+from collections.abc import Callable, Sequence
+from datetime import date, datetime
+from typing import Any, TypeVar
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Mapped
+from sqlalchemy.sql.elements import ColumnElement
+
+T = TypeVar("T")
+K = TypeVar("K")
+
+KeyValue = int | date | datetime
+SortColumn = ColumnElement[Any] | Mapped[Any]
+
+_SIGNATURE_BYTES = 16
+_SEPARATOR = "|"
+
+
+class InvalidCursor(ValueError):
+    """The cursor is malformed, was signed with another key, or belongs to another list."""
+
+
+class CursorCodec:
+    """Encodes sort keys as signed cursors and verifies them on the way back."""
+
+    def __init__(self, secret: bytes) -> None:
+        self._secret = secret
+
+    def encode(self, scope: str, key: Sequence[KeyValue]) -> str:
+        payload = _SEPARATOR.join([scope, *(_encode_value(value) for value in key)])
+        raw = payload.encode("utf-8")
+        return f"{_b64encode(raw)}.{_b64encode(self._sign(raw))}"
+
+    def decode(self, scope: str, cursor: str) -> tuple[KeyValue, ...]:
+        encoded_payload, dot, encoded_signature = cursor.partition(".")
+        if not dot:
+            raise InvalidCursor("The cursor has no signature.")
+        try:
+            raw = _b64decode(encoded_payload)
+            signature = _b64decode(encoded_signature)
+        except (binascii.Error, ValueError) as exc:
+            raise InvalidCursor("The cursor is not base64url.") from exc
+        if not hmac.compare_digest(signature, self._sign(raw)):
+            raise InvalidCursor("The cursor signature does not match.")
+        cursor_scope, *values = raw.decode("utf-8").split(_SEPARATOR)
+        if cursor_scope != scope:
+            raise InvalidCursor(f"The cursor belongs to {cursor_scope!r}, not {scope!r}.")
+        return tuple(_decode_value(value) for value in values)
+
+    def _sign(self, raw: bytes) -> bytes:
+        return hmac.new(self._secret, raw, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+
+def keyset_before(columns: Sequence[SortColumn], key: Sequence[KeyValue]) -> ColumnElement[bool]:
+    """Rows that sort after ``key`` when ordering by ``columns`` descending.
+
+    Expanded to ``a <= x AND (a < x OR (a = x AND b < y) ...)`` rather than
+    a row-value comparison, which MySQL does not turn into an index range.
+    The redundant ``a <= x`` is the range both MySQL and SQLite seek on.
+    """
+    return _seek(columns, key, operator.lt, operator.le)
+
+
+def keyset_after(columns: Sequence[SortColumn], key: Sequence[KeyValue]) -> ColumnElement[bool]:
+    """Rows that sort after ``key`` when ordering by ``columns`` ascending."""
+    return _seek(columns, key, operator.gt, operator.ge)
+
+
+def split_page(rows: Sequence[T], limit: int, key: Callable[[T], K]) -> tuple[list[T], K | None]:
+    """Split ``limit + 1`` fetched rows into the page and the key to continue after.
+
+    The extra row only tells whether another page exists; the key is None
+    on the last page.
+    """
+    page = list(rows[:limit])
+    return page, key(page[-1]) if len(rows) > limit else None
+
+
+def _seek(
+    columns: Sequence[SortColumn],
+    key: Sequence[KeyValue],
+    beyond: Callable[[SortColumn, KeyValue], ColumnElement[bool]],
+    bound: Callable[[SortColumn, KeyValue], ColumnElement[bool]],
+) -> ColumnElement[bool]:
+    if len(columns) != len(key):
+        raise ValueError(f"{len(columns)} sort columns but a key of {len(key)} values")
+    clauses = []
+    for index, (column, value) in enumerate(zip(columns, key)):
+        ties = [tied == tied_value for tied, tied_value in zip(columns[:index], key[:index])]
+        clauses.append(and_(*ties, beyond(column, value)))
+    return and_(bound(columns[0], key[0]), or_(*clauses))
+
+
+def _encode_value(value: KeyValue) -> str:
+    # datetime before date: it is a subclass.
+    if isinstance(value, datetime):
+        return f"t{value.isoformat()}"
+    if isinstance(value, date):
+        return f"d{value.isoformat()}"
+    if isinstance(value, int):
+        return f"i{value}"
+    raise TypeError(f"cannot put a {type(value).__name__} in a cursor")
+
+
+def _decode_value(value: str) -> KeyValue:
+    tag, text = value[:1], value[1:]
+    if tag == "t":
+        return datetime.fromisoformat(text)
+    if tag == "d":
+        return date.fromisoformat(text)
+    return int(text)
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4), altchars=b"-_", validate=True)
@@ -0,0 +1,107 @@
+"""Connection pool instrumentation."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+
+_pools: dict[str, InstrumentedQueuePool] = {}
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Point-in-time view of a connection pool."""
+
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+    @property
+    def wait_seconds_avg(self) -> float:
+        return self.wait_seconds_total / self.checkouts if self.checkouts else 0.0
+
+
+class CheckoutTimer:
+    """Accumulates connection checkout latency for a pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection.
+
+    The measured time covers waiting for a free slot and, when the pool has
+    to grow, establishing the new DBAPI connection.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_timer = CheckoutTimer()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.checkout_timer.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.checkout_timer.record(time.perf_counter() - start)
+        return connection
+
+    def stats(self) -> PoolStats:
+        timer = self.checkout_timer
+        return PoolStats(
+            size=self.size(),
+            checked_out=self.checkedout(),
+            idle=self.checkedin(),
+            overflow=max(self.overflow(), 0),
+            checkouts=timer.checkouts,
+            timeouts=timer.timeouts,
+            wait_seconds_total=timer.wait_seconds_total,
+            wait_seconds_max=timer.wait_seconds_max,
+        )
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Checkout-timing pool for asyncio engines."""
+
+
+def register_pool(name: str, pool: object) -> None:
+    """Expose an engine pool through ``collect_pool_stats`` under ``name``."""
+    if isinstance(pool, InstrumentedQueuePool):
+        _pools[name] = pool
+
+
+def unregister_pool(name: str) -> None:
+    _pools.pop(name, None)
+
+
+def collect_pool_stats() -> dict[str, PoolStats]:
+    """Return live statistics for every registered pool."""
+    return {name: pool.stats() for name, pool in list(_pools.items())}
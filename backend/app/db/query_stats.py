@@ -0,0 +1,88 @@
+"""Per-request SQL statement accounting.
+
+Engine event hooks add every cursor execution to the ``QueryStats`` bound to
+the current context. The context variable is copied into FastAPI's thread
+pool and into async sessions' greenlets, so counts follow the request
+wherever its queries run.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised by ``query_budget`` when a block issues too many statements."""
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("bc_query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Count the statements executed inside the block."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """Fail with ``QueryBudgetExceeded`` if the block runs more than ``max_queries``."""
+    with count_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"expected at most {max_queries} queries, {stats.count} were executed"
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the counting hooks to ``engine`` (use ``AsyncEngine.sync_engine``)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn: Connection, *_args: Any) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("bc_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Connection, *_args: Any) -> None:
+    _finish(conn)
+
+
+def _handle_error(context: Any) -> None:
+    if context.connection is not None:
+        _finish(context.connection)
+
+
+def _finish(conn: Connection) -> None:
+    stats = _current.get()
+    started = conn.info.get("bc_query_started")
+    if stats is None or not started:
+        return
+    stats.count += 1
+    stats.seconds += time.perf_counter() - started.pop()
@@ -0,0 +1,127 @@
+"""Read-replica engines and routing.
+
+Each replica gets its own engine and pool. ``choose_read_engine`` picks a
+healthy replica for read-only work, either round-robin or the replica with
+the fewest checked-out connections, and returns None when no replica is
+configured or healthy, in which case callers read from the primary.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Literal, cast
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from app.core.config import Settings
+from app.db.pool import register_pool, unregister_pool
+from app.db.session import build_engine
+
+logger = logging.getLogger(__name__)
+
+Balance = Literal["round_robin", "least_busy"]
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: Engine
+    healthy: bool = True
+
+
+class ReplicaSet:
+    """Replicas plus the balancing policy used to pick one."""
+
+    def __init__(self, replicas: list[Replica], balance: Balance = "round_robin") -> None:
+        self.replicas = replicas
+        self.balance = balance
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def choose(self) -> Engine | None:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.balance == "least_busy":
+            return min(healthy, key=lambda replica: cast(QueuePool, replica.engine.pool).checkedout()).engine
+        with self._lock:
+            index = next(self._counter)
+        return healthy[index % len(healthy)].engine
+
+    def check_health(self) -> dict[str, bool]:
+        """Probe every replica with ``SELECT 1`` and update its rotation status."""
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                healthy = True
+            except Exception:
+                healthy = False
+            if healthy != replica.healthy:
+                log = logger.info if healthy else logger.warning
+                log(
+                    "Replica %s %s rotation",
+                    replica.name,
+                    "back in" if healthy else "taken out of",
+                )
+            replica.healthy = healthy
+        return {replica.name: replica.healthy for replica in self.replicas}
+
+    def dispose(self) -> None:
+        for replica in self.replicas:
+            unregister_pool(replica.name)
+            replica.engine.dispose()
+
+
+_replica_set: ReplicaSet | None = None
+_replica_lock = threading.Lock()
+
+
+def init_replicas(settings: Settings) -> ReplicaSet | None:
+    """Build one engine per ``settings.db_replica_urls`` entry, once per process."""
+    global _replica_set
+    with _replica_lock:
+        if _replica_set is None and settings.db_replica_urls:
+            replicas = []
+            for index, url in enumerate(settings.db_replica_urls):
+                replica = Replica(name=f"replica{index}", engine=build_engine(settings, url))
+                register_pool(replica.name, replica.engine.pool)
+                replicas.append(replica)
+            _replica_set = ReplicaSet(replicas, settings.db_replica_balance)
+        return _replica_set
+
+
+def get_replica_set() -> ReplicaSet | None:
+    return _replica_set
+
+
+def choose_read_engine() -> Engine | None:
+    """A healthy replica engine, or None to read from the primary."""
+    replica_set = _replica_set
+    return replica_set.choose() if replica_set is not None else None
+
+
+def dispose_replicas() -> None:
+    global _replica_set
+    with _replica_lock:
+        if _replica_set is not None:
+            _replica_set.dispose()
+            _replica_set = None
+
+
+async def run_replica_health_checks(
+    replica_set: ReplicaSet, interval_seconds: float, stop: asyncio.Event
+) -> None:
+    """Re-check replica health every ``interval_seconds`` until ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), interval_seconds)
+        except TimeoutError:
+            pass
+        await asyncio.to_thread(replica_set.check_health)
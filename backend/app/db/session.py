@@ -1,33 +1,74 @@
 """Database engine and session management."""
 
 import logging
+import threading
 from collections.abc import Generator
 
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
 from sqlmodel import Session, create_engine
 from urllib.parse import quote_plus
 
 from app.core.config import Settings, get_settings
+from app.db.pool import InstrumentedQueuePool, register_pool, unregister_pool
+from app.db.query_stats import instrument_engine
 
 logger = logging.getLogger(__name__)
 
+_engine: Engine | None = None
+_engine_lock = threading.Lock()
 
-def build_engine(settings: Settings) -> Engine:
-    """Build the SQLModel engine from settings."""
-    logger.info(
-        "DB connection details: user=%s url=%s",
-        settings.db_user,
-        settings.database_url.replace(quote_plus(settings.db_password), "***")
-        if settings.db_password
-        else settings.database_url,
+
+def build_engine(settings: Settings, url: str | None = None) -> Engine:
+    """Build the SQLModel engine from settings; ``url`` replaces the primary's (replicas)."""
+    if url is None:
+        url = settings.database_url
+        logger.info(
+            "DB connection details: user=%s url=%s",
+            settings.db_user,
+            url.replace(quote_plus(settings.db_password), "***")
+            if settings.db_password
+            else url,
+        )
+    else:
+        logger.info("DB connection details: url=%s", make_url(url).render_as_string())
+    engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
     )
-    return create_engine(settings.database_url, pool_pre_ping=True)
+    instrument_engine(engine)
+    return engine
+
+
+def init_engine(settings: Settings | None = None) -> Engine:
+    """Build the process-wide engine once and return it."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = build_engine(settings or get_settings())
+            register_pool("primary", _engine.pool)
+        return _engine
 
 
 def get_engine() -> Engine:
-    """Return a configured SQLModel engine."""
-    settings = get_settings()
-    return build_engine(settings)
+    """Return the process-wide SQLModel engine, building it on first use."""
+    if _engine is not None:
+        return _engine
+    return init_engine()
+
+
+def dispose_engine() -> None:
+    """Close pooled connections and forget the process-wide engine."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            unregister_pool("primary")
+            _engine.dispose()
+            _engine = None
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -0,0 +1,36 @@
+"""Insert-or-increment ("upsert") statements for counter tables."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.engine import Connection
+
+
+def insert_or_add(
+    conn: Connection, table: Table, keys: Sequence[str], rows: list[dict[str, Any]]
+) -> None:
+    """Insert ``rows``; where a row's key already exists, add its other columns to it.
+
+    One executemany of ``INSERT ... ON DUPLICATE KEY UPDATE`` on MySQL and
+    ``INSERT ... ON CONFLICT DO UPDATE`` elsewhere, so concurrent writers
+    to the same key never lose an increment.
+    """
+    if not rows:
+        return
+    counters = [name for name in rows[0] if name not in keys]
+    if conn.dialect.name == "mysql":
+        mysql_insert = mysql.insert(table)
+        statement: Any = mysql_insert.on_duplicate_key_update(
+            {name: table.c[name] + mysql_insert.inserted[name] for name in counters}
+        )
+    else:
+        sqlite_insert = sqlite.insert(table)
+        statement = sqlite_insert.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: table.c[name] + sqlite_insert.excluded[name] for name in counters},
+        )
+    conn.execute(statement, rows)
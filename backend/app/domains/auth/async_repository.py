@@ -0,0 +1,132 @@
+"""Async auth repository implementation."""
+
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlmodel import col, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.domains.auth.async_service import AsyncAuthRepository
+from app.domains.auth.models import Session as SessionModel
+from app.domains.auth.models import User
+from app.domains.auth.repository import before_session_cursor
+from app.domains.auth.service import RevokedSession, SessionCursor, SessionLookup
+
+
+class AsyncSqlAuthRepository(AsyncAuthRepository):
+    """SQLModel-backed async auth repository."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def find_user_by_email(self, email: str) -> User | None:
+        result = await self._session.exec(select(User).where(User.email == email))
+        return result.first()
+
+    def add_user(self, user: User) -> None:
+        self._session.add(user)
+
+    async def flush(self) -> None:
+        await self._session.flush()
+
+    def add_session(self, session_model: SessionModel) -> None:
+        self._session.add(session_model)
+
+    async def find_session_by_token_hash(self, token_hash: bytes) -> SessionModel | None:
+        result = await self._session.exec(
+            select(SessionModel).where(SessionModel.token_hash == token_hash)
+        )
+        return result.first()
+
+    async def find_user_by_id(self, user_id: UUID) -> User | None:
+        result = await self._session.exec(select(User).where(User.id == user_id))
+        return result.first()
+
+    async def find_session_with_user(self, token_hash: bytes) -> SessionLookup | None:
+        result = await self._session.exec(
+            select(User, SessionModel.expires_at, SessionModel.revoked_at)
+            .join(SessionModel, col(SessionModel.user_id) == User.id)
+            .where(SessionModel.token_hash == token_hash)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        user, expires_at, revoked_at = row
+        return SessionLookup(user=user, expires_at=expires_at, revoked_at=revoked_at)
+
+    async def find_sessions_with_users(
+        self, token_hashes: Sequence[bytes]
+    ) -> dict[bytes, SessionLookup]:
+        result = await self._session.exec(
+            select(User, SessionModel.token_hash, SessionModel.expires_at, SessionModel.revoked_at)
+            .join(SessionModel, col(SessionModel.user_id) == User.id)
+            .where(col(SessionModel.token_hash).in_(token_hashes))
+        )
+        return {
+            token_hash: SessionLookup(user=user, expires_at=expires_at, revoked_at=revoked_at)
+            for user, token_hash, expires_at, revoked_at in result.all()
+        }
+
+    async def list_sessions_for_user(
+        self, user_id: UUID, limit: int, after: SessionCursor | None = None
+    ) -> list[SessionModel]:
+        statement = select(SessionModel).where(SessionModel.user_id == user_id)
+        if after is not None:
+            statement = statement.where(before_session_cursor(after))
+        result = await self._session.exec(
+            statement.order_by(
+                col(SessionModel.created_at).desc(), col(SessionModel.id).desc()
+            ).limit(limit)
+        )
+        return list(result.all())
+
+    async def revoke_sessions_for_user(self, user_id: UUID, revoked_at: datetime) -> int:
+        result = await self._session.exec(
+            update(SessionModel)
+            .where(
+                col(SessionModel.user_id) == user_id,
+                col(SessionModel.revoked_at).is_(None),
+                col(SessionModel.expires_at) > revoked_at,
+            )
+            .values(revoked_at=revoked_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def find_revoked_sessions_for_user(
+        self, user_id: UUID, now: datetime
+    ) -> list[RevokedSession]:
+        result = await self._session.exec(
+            select(SessionModel.token_hash, SessionModel.revoked_at, SessionModel.expires_at).where(
+                col(SessionModel.user_id) == user_id,
+                col(SessionModel.revoked_at).is_not(None),
+                col(SessionModel.expires_at) > now,
+            )
+        )
+        return [
+            RevokedSession(token_hash=token_hash, revoked_at=revoked_at, expires_at=expires_at)
+            for token_hash, revoked_at, expires_at in result.all()
+            if revoked_at is not None
+        ]
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        event.listen(
+            self._session.sync_session, "after_commit", lambda _session: callback(), once=True
+        )
+
+    async def find_sessions_revoked_since(
+        self, since: datetime, now: datetime
+    ) -> list[RevokedSession]:
+        result = await self._session.exec(
+            select(SessionModel.token_hash, SessionModel.revoked_at, SessionModel.expires_at).where(
+                col(SessionModel.revoked_at) >= since,
+                col(SessionModel.expires_at) > now,
+            )
+        )
+        return [
+            RevokedSession(token_hash=token_hash, revoked_at=revoked_at, expires_at=expires_at)
+            for token_hash, revoked_at, expires_at in result.all()
+            if revoked_at is not None
+        ]
@@ -0,0 +1,225 @@
+"""Async auth domain service layer.
+
+Mirrors ``service`` for repositories that perform I/O asynchronously. Rules
+and validation are shared with the sync service so both paths stay identical.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from app.db.pagination import split_page
+from app.domains.auth import errors, service
+from app.domains.auth.cache import BaseSessionCache, CachedSession
+from app.domains.auth.models import Session as SessionModel
+from app.domains.auth.models import User
+from app.domains.auth.service import (
+    RevokedSession,
+    SessionCursor,
+    SessionLookup,
+    SessionPage,
+    TokenCheck,
+)
+from app.domains.auth.tokens import SignedSessionTokens
+
+if TYPE_CHECKING:
+    from app.domains.auth.last_login import LastLoginBuffer
+
+
+class AsyncAuthRepository:
+    """Async persistence boundary for auth operations."""
+
+    async def find_user_by_email(self, email: str) -> User | None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def add_user(self, user: User) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    async def flush(self) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def add_session(self, session_model: SessionModel) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    async def find_session_by_token_hash(self, token_hash: bytes) -> SessionModel | None:  # pragma: no cover
+        raise NotImplementedError
+
+    async def find_user_by_id(self, user_id: UUID) -> User | None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    async def find_session_with_user(self, token_hash: bytes) -> SessionLookup | None:  # pragma: no cover
+        raise NotImplementedError
+
+    async def find_sessions_with_users(
+        self, token_hashes: Sequence[bytes]
+    ) -> dict[bytes, SessionLookup]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    async def list_sessions_for_user(
+        self, user_id: UUID, limit: int, after: SessionCursor | None = None
+    ) -> list[SessionModel]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    async def revoke_sessions_for_user(
+        self, user_id: UUID, revoked_at: datetime
+    ) -> int:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    async def find_sessions_revoked_since(
+        self, since: datetime, now: datetime
+    ) -> list[RevokedSession]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    async def find_revoked_sessions_for_user(
+        self, user_id: UUID, now: datetime
+    ) -> list[RevokedSession]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def after_commit(self, callback: Callable[[], None]) -> None:  # pragma: no cover - interface
+        """Run ``callback`` once the current transaction commits; see ``AuthRepository``."""
+        raise NotImplementedError
+
+
+async def register_user(
+    repo: AsyncAuthRepository, email: str, tokens: SignedSessionTokens | None = None
+) -> tuple[User, SessionModel, str]:
+    """Register a new user and create a session."""
+    normalized_email = service.normalize_email(email)
+    existing = await repo.find_user_by_email(normalized_email)
+    if existing:
+        raise errors.UserAlreadyExists
+
+    user = User(email=normalized_email, last_login_at=service._utcnow())
+    repo.add_user(user)
+    await repo.flush()
+
+    session_model, token = _create_session(repo, user, tokens)
+    return user, session_model, token
+
+
+async def login_user(
+    repo: AsyncAuthRepository,
+    email: str,
+    last_login_buffer: LastLoginBuffer | None = None,
+    tokens: SignedSessionTokens | None = None,
+) -> tuple[User, SessionModel, str]:
+    """Login an existing user and create a session."""
+    normalized_email = service.normalize_email(email)
+    user = service._require_active_user(await repo.find_user_by_email(normalized_email))
+
+    logged_in_at = service._utcnow()
+    if last_login_buffer is not None and last_login_buffer.record(user.id, logged_in_at):
+        user = service._detached_user(user, last_login_at=logged_in_at)
+    else:
+        user.last_login_at = logged_in_at
+        repo.add_user(user)
+    session_model, token = _create_session(repo, user, tokens)
+    return user, session_model, token
+
+
+async def logout_session(
+    repo: AsyncAuthRepository,
+    token: str,
+    cache: BaseSessionCache | None = None,
+    tokens: SignedSessionTokens | None = None,
+) -> None:
+    """Revoke an existing session by token."""
+    token_hash = service.hash_token(token)
+    session_model = service._require_usable_session(
+        await repo.find_session_by_token_hash(token_hash)
+    )
+
+    session_model.revoked_at = service._utcnow()
+    repo.add_session(session_model)
+    if cache is not None:
+        repo.after_commit(lambda: cache.invalidate(token_hash))
+    if tokens is not None:
+        tokens.denylist.add(token_hash, service._as_utc(session_model.expires_at))
+
+
+async def get_user_for_session(
+    repo: AsyncAuthRepository,
+    token: str,
+    cache: BaseSessionCache | None = None,
+    tokens: SignedSessionTokens | None = None,
+) -> User:
+    """Fetch the user for a valid session token."""
+    token_hash = service.hash_token(token)
+    claims = None
+    if tokens is not None and tokens.is_signed(token):
+        claims = tokens.verify(token, service._utcnow())
+        if token_hash in tokens.denylist:
+            raise errors.SessionRevoked
+
+    generation = None
+    if cache is not None:
+        cached = cache.get(token_hash, service._utcnow())
+        if cached is not None:
+            return cached.to_user()
+        generation = cache.generation
+
+    if claims is not None:
+        user = service._require_active_user(await repo.find_user_by_id(claims.user_id))
+        expires_at = claims.expires_at
+    else:
+        lookup = service._require_usable_session(await repo.find_session_with_user(token_hash))
+        user = service._require_active_user(lookup.user)
+        expires_at = service._as_utc(lookup.expires_at)
+
+    if cache is not None:
+        cache.put(token_hash, CachedSession.from_user(user, expires_at), generation)
+    return user
+
+
+async def validate_session_tokens(
+    repo: AsyncAuthRepository,
+    token_list: Sequence[str],
+    cache: BaseSessionCache | None = None,
+    tokens: SignedSessionTokens | None = None,
+) -> list[TokenCheck]:
+    """Validate many session tokens with at most one query; results follow input order."""
+    results, pending, generation = service._check_tokens_in_memory(token_list, cache, tokens)
+    if pending:
+        lookups = await repo.find_sessions_with_users(list(pending))
+        service._resolve_pending_tokens(results, pending, lookups, cache, generation)
+    return results
+
+
+async def list_sessions(
+    repo: AsyncAuthRepository,
+    user_id: UUID,
+    limit: int = 20,
+    after: SessionCursor | None = None,
+) -> SessionPage:
+    """Return one page of the user's sessions, newest first."""
+    limit = max(1, min(limit, service.SESSION_PAGE_MAX))
+    rows = await repo.list_sessions_for_user(user_id, limit + 1, after)
+    sessions, next_after = split_page(rows, limit, service.session_cursor)
+    return SessionPage(sessions=sessions, next_after=next_after)
+
+
+async def revoke_all_sessions(
+    repo: AsyncAuthRepository,
+    user_id: UUID,
+    cache: BaseSessionCache | None = None,
+    tokens: SignedSessionTokens | None = None,
+) -> int:
+    """Log the user out everywhere with one UPDATE; returns how many sessions were revoked."""
+    revoked_at = service._utcnow()
+    revoked = await repo.revoke_sessions_for_user(user_id, revoked_at)
+    if cache is not None:
+        repo.after_commit(lambda: cache.invalidate_user(user_id))
+    if tokens is not None and revoked:
+        service._denylist(tokens, await repo.find_revoked_sessions_for_user(user_id, revoked_at))
+    return revoked
+
+
+def _create_session(
+    repo: AsyncAuthRepository, user: User, tokens: SignedSessionTokens | None = None
+) -> tuple[SessionModel, str]:
+    session_model, token = service._new_session(user, tokens)
+    repo.add_session(session_model)
+    return session_model, token
@@ -0,0 +1,193 @@
+"""Caches for session token resolution."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from app.domains.auth.models import User
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    """User summary resolved for a session, plus the session's UTC expiry."""
+
+    user_id: UUID
+    email: str
+    created_at: datetime
+    last_login_at: datetime | None
+    is_active: bool
+    expires_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User, expires_at: datetime) -> CachedSession:
+        return cls(
+            user_id=user.id,
+            email=user.email,
+            created_at=user.created_at,
+            last_login_at=user.last_login_at,
+            is_active=user.is_active,
+            expires_at=expires_at,
+        )
+
+    def to_user(self) -> User:
+        """Build a detached user; it is never attached to a DB session."""
+        return User(
+            id=self.user_id,
+            email=self.email,
+            created_at=self.created_at,
+            last_login_at=self.last_login_at,
+            is_active=self.is_active,
+        )
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+
+class BaseSessionCache:
+    """Interface shared by the in-process and shared-memory session caches."""
+
+    @property
+    def generation(self) -> int:  # pragma: no cover - interface
+        """Counter bumped by every invalidation; see ``put``."""
+        raise NotImplementedError
+
+    def get(self, token_hash: bytes, now: datetime) -> CachedSession | None:  # pragma: no cover
+        raise NotImplementedError
+
+    def put(
+        self, token_hash: bytes, entry: CachedSession, generation: int | None = None
+    ) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def invalidate(self, token_hash: bytes) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def invalidate_user(self, user_id: UUID) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def clear(self) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def stats(self) -> CacheStats:  # pragma: no cover - interface
+        raise NotImplementedError
+
+
+class SessionCache(BaseSessionCache):
+    """Bounded LRU + TTL cache keyed by session token hash.
+
+    Entries live for at most ``ttl_seconds`` and are never served once the
+    session's own ``expires_at`` has passed. Invalidation only reaches the
+    current process, so with several workers a revoked session may still be
+    served elsewhere for up to ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, tuple[float, CachedSession]] = OrderedDict()
+        self._hashes_by_user: dict[UUID, set[bytes]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation; see ``put``."""
+        return self._generation
+
+    def get(self, token_hash: bytes, now: datetime) -> CachedSession | None:
+        """Return the cached entry if it is still fresh and unexpired."""
+        with self._lock:
+            item = self._entries.get(token_hash)
+            if item is None:
+                self._misses += 1
+                return None
+            deadline, entry = item
+            if deadline <= self._clock() or entry.expires_at <= now:
+                self._remove(token_hash)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token_hash)
+            self._hits += 1
+            return entry
+
+    def put(self, token_hash: bytes, entry: CachedSession, generation: int | None = None) -> None:
+        """Store ``entry``.
+
+        Pass the ``generation`` read before loading the entry from the DB: the
+        write is skipped when an invalidation ran in between, so a concurrent
+        logout cannot be overwritten by a stale read.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if token_hash in self._entries:
+                self._remove(token_hash)
+            self._entries[token_hash] = (self._clock() + self._ttl_seconds, entry)
+            self._hashes_by_user.setdefault(entry.user_id, set()).add(token_hash)
+            while len(self._entries) > self._max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def invalidate(self, token_hash: bytes) -> None:
+        with self._lock:
+            self._generation += 1
+            self._remove(token_hash)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Drop every cached session belonging to ``user_id``."""
+        with self._lock:
+            self._generation += 1
+            for token_hash in list(self._hashes_by_user.get(user_id, ())):
+                self._remove(token_hash)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._hashes_by_user.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                size=len(self._entries),
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def _remove(self, token_hash: bytes) -> None:
+        item = self._entries.pop(token_hash, None)
+        if item is None:
+            return
+        user_id = item[1].user_id
+        hashes = self._hashes_by_user.get(user_id)
+        if hashes is not None:
+            hashes.discard(token_hash)
+            if not hashes:
+                del self._hashes_by_user[user_id]
+
@@ -0,0 +1,120 @@
+"""Write-behind buffering of ``user.last_login_at`` updates.
+
+Logins record their timestamp here instead of updating the ``user`` row in
+the login transaction. A background flusher writes the latest timestamp per
+user in one batched UPDATE, which removes row-lock contention on users who
+log in repeatedly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.domains.auth.repository import SqlAuthRepository
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginBuffer:
+    """Bounded map of user id to the most recent pending login time."""
+
+    def __init__(self, max_pending: int, flush_threshold: int) -> None:
+        self._max_pending = max_pending
+        self._flush_threshold = flush_threshold
+        self._lock = threading.Lock()
+        self._pending: dict[UUID, datetime] = {}
+        self._flush_requested = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, user_id: UUID, logged_in_at: datetime) -> bool:
+        """Buffer a login time.
+
+        Returns False when the buffer is full and the user has no pending
+        entry; the caller must then write the timestamp itself.
+        """
+        with self._lock:
+            current = self._pending.get(user_id)
+            if current is None and len(self._pending) >= self._max_pending:
+                self._flush_requested.set()
+                return False
+            if current is None or logged_in_at > current:
+                self._pending[user_id] = logged_in_at
+            if len(self._pending) >= self._flush_threshold:
+                self._flush_requested.set()
+            return True
+
+    def drain(self) -> dict[UUID, datetime]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            return pending
+
+    def restore(self, pending: dict[UUID, datetime]) -> None:
+        """Put back entries from a failed flush without overwriting newer ones."""
+        with self._lock:
+            for user_id, logged_in_at in pending.items():
+                current = self._pending.get(user_id)
+                if current is None or logged_in_at > current:
+                    self._pending[user_id] = logged_in_at
+
+    def request_flush(self) -> None:
+        self._flush_requested.set()
+
+    def wait_for_flush(self, timeout: float) -> None:
+        """Block until the threshold is hit, a flush is requested, or ``timeout``."""
+        self._flush_requested.wait(timeout)
+        self._flush_requested.clear()
+
+
+def flush_last_logins(engine: Engine, buffer: LastLoginBuffer, batch_size: int) -> int:
+    """Write buffered login times, ``batch_size`` users per UPDATE statement."""
+    pending = buffer.drain()
+    if not pending:
+        return 0
+
+    items = list(pending.items())
+    written = 0
+    try:
+        for start in range(0, len(items), batch_size):
+            batch = dict(items[start : start + batch_size])
+            with Session(engine) as db:
+                SqlAuthRepository(db).update_last_login_times(batch)
+                db.commit()
+            written += len(batch)
+    except Exception:
+        buffer.restore(dict(items[written:]))
+        raise
+    logger.debug("Flushed last_login_at for %d users", written)
+    return written
+
+
+async def run_last_login_flusher(
+    engine: Engine,
+    buffer: LastLoginBuffer,
+    interval_seconds: float,
+    batch_size: int,
+    stop: asyncio.Event,
+) -> None:
+    """Flush on every interval or threshold until ``stop``, then flush once more.
+
+    Call ``buffer.request_flush()`` after setting ``stop`` to wake the loop.
+    A failed final flush is logged, not raised, so shutdown carries on.
+    """
+    while not stop.is_set():
+        await asyncio.to_thread(buffer.wait_for_flush, interval_seconds)
+        try:
+            await asyncio.to_thread(flush_last_logins, engine, buffer, batch_size)
+        except Exception:
+            logger.exception("last_login_at flush failed; entries kept for retry")
+    try:
+        await asyncio.to_thread(flush_last_logins, engine, buffer, batch_size)
+    except Exception:
+        logger.exception("Final last_login_at flush failed; %d login times not written", len(buffer))
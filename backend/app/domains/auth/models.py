@@ -3,6 +3,7 @@
 from datetime import datetime, timezone
 from uuid import UUID, uuid4
 
+from sqlalchemy import BINARY, BigInteger, Column, Index, Integer
 from sqlmodel import Field, SQLModel
 
 
@@ -17,11 +18,25 @@ class User(SQLModel, table=True):
 
 
 class Session(SQLModel, table=True):
-    """Session persistence model."""
-
-    id: UUID = Field(default_factory=uuid4, primary_key=True)
-    user_id: UUID = Field(foreign_key="user.id", index=True)
-    token_hash: str = Field(index=True)
+    """Session persistence model.
+
+    Rows are keyed by a BIGINT and looked up by the raw 32-byte SHA-256 of
+    the token, so both indexes stay small and compare bytes, not collated text.
+    ``(user_id, created_at)`` backs keyset pagination of a user's sessions.
+    """
+
+    __table_args__ = (Index("ix_session_user_id_created_at", "user_id", "created_at"),)
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True
+        ),
+    )
+    user_id: UUID = Field(foreign_key="user.id")
+    token_hash: bytes = Field(
+        sa_column=Column(BINARY(32), nullable=False, unique=True, index=True)
+    )
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     expires_at: datetime = Field(index=True)
-    revoked_at: datetime | None = Field(default=None)
+    revoked_at: datetime | None = Field(default=None, index=True)
@@ -0,0 +1,85 @@
+"""Background removal of ended sessions.
+
+Each batch runs in its own short transaction so the reaper never holds
+locks on the ``session`` table for long.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.core.config import Settings
+from app.domains.auth import service
+from app.domains.auth.repository import SqlAuthRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReapResult:
+    deleted: int
+    batches: int
+    duration_seconds: float
+
+
+def reap_ended_sessions(
+    engine: Engine,
+    batch_size: int,
+    retention: timedelta,
+    batch_sleep_seconds: float = 0.0,
+) -> ReapResult:
+    """Delete ended sessions in batches until none are left."""
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    start = time.perf_counter()
+    deleted = 0
+    batches = 0
+    while True:
+        with Session(engine) as db:
+            removed = service.reap_sessions(SqlAuthRepository(db), retention, batch_size)
+            db.commit()
+        deleted += removed
+        batches += 1
+        if removed < batch_size:
+            break
+        time.sleep(batch_sleep_seconds)
+
+    result = ReapResult(
+        deleted=deleted, batches=batches, duration_seconds=time.perf_counter() - start
+    )
+    logger.info(
+        "Session reaper removed %d rows in %d batches (%.2fs)",
+        result.deleted,
+        result.batches,
+        result.duration_seconds,
+    )
+    return result
+
+
+def reap_with_settings(engine: Engine, settings: Settings) -> ReapResult:
+    return reap_ended_sessions(
+        engine,
+        batch_size=settings.session_reaper_batch_size,
+        retention=timedelta(hours=settings.session_reaper_retention_hours),
+        batch_sleep_seconds=settings.session_reaper_batch_sleep_seconds,
+    )
+
+
+async def run_session_reaper(engine: Engine, settings: Settings, stop: asyncio.Event) -> None:
+    """Reap sessions every ``session_reaper_interval_seconds`` until ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            await asyncio.to_thread(reap_with_settings, engine, settings)
+        except Exception:
+            logger.exception("Session reaper run failed")
+        try:
+            await asyncio.wait_for(stop.wait(), settings.session_reaper_interval_seconds)
+        except TimeoutError:
+            pass
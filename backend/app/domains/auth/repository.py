@@ -1,17 +1,42 @@
 """Auth repository implementation."""
 
-from sqlmodel import Session, select
+from collections.abc import Callable, Mapping, Sequence
+from datetime import datetime
+from typing import TypeVar
+from uuid import UUID
 
+from sqlalchemy import ColumnElement, case, event
+from sqlmodel import Session, col, delete, select, update
+
+from app.db.pagination import keyset_before
 from app.domains.auth.models import Session as SessionModel
 from app.domains.auth.models import User
-from app.domains.auth.service import AuthRepository
+from app.domains.auth.service import (
+    AuthRepository,
+    RevokedSession,
+    SessionCursor,
+    SessionLookup,
+)
+
+T = TypeVar("T")
 
 
 class SqlAuthRepository(AuthRepository):
-    """SQLModel-backed auth repository."""
+    """SQLModel-backed auth repository.
+
+    With a ``read_session`` (typically bound to a replica), user-row fetches
+    and session listing go there; a missed user lookup is retried on the
+    primary so a user created moments ago resolves before it has
+    replicated. Session state (expiry, revocation) is always read from the
+    primary: a lagging replica would still accept a session that was just
+    logged out.
+    Objects those lookups return belong to ``read_session``, so only pass
+    one for read-only request paths.
+    """
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, read_session: Session | None = None) -> None:
         self._session = session
+        self._read_session = read_session
 
     def find_user_by_email(self, email: str) -> User | None:
         return self._session.exec(select(User).where(User.email == email)).first()
@@ -25,10 +50,123 @@ class SqlAuthRepository(AuthRepository):
     def add_session(self, session_model: SessionModel) -> None:
         self._session.add(session_model)
 
-    def find_session_by_token_hash(self, token_hash: str) -> SessionModel | None:
+    def find_session_by_token_hash(self, token_hash: bytes) -> SessionModel | None:
         return self._session.exec(
             select(SessionModel).where(SessionModel.token_hash == token_hash)
         ).first()
 
-    def find_user_by_id(self, user_id) -> User | None:
-        return self._session.exec(select(User).where(User.id == user_id)).first()
+    def find_user_by_id(self, user_id: UUID) -> User | None:
+        statement = select(User).where(User.id == user_id)
+        return self._read_first(lambda db: db.exec(statement).first())
+
+    def find_session_with_user(self, token_hash: bytes) -> SessionLookup | None:
+        statement = (
+            select(User, SessionModel.expires_at, SessionModel.revoked_at)
+            .join(SessionModel, col(SessionModel.user_id) == User.id)
+            .where(SessionModel.token_hash == token_hash)
+        )
+        row = self._session.exec(statement).first()
+        if row is None:
+            return None
+        user, expires_at, revoked_at = row
+        return SessionLookup(user=user, expires_at=expires_at, revoked_at=revoked_at)
+
+    def find_sessions_with_users(self, token_hashes: Sequence[bytes]) -> dict[bytes, SessionLookup]:
+        return _sessions_with_users(self._session, token_hashes)
+
+    def list_sessions_for_user(
+        self, user_id: UUID, limit: int, after: SessionCursor | None = None
+    ) -> list[SessionModel]:
+        statement = select(SessionModel).where(SessionModel.user_id == user_id)
+        if after is not None:
+            statement = statement.where(before_session_cursor(after))
+        statement = statement.order_by(
+            col(SessionModel.created_at).desc(), col(SessionModel.id).desc()
+        ).limit(limit)
+        return list((self._read_session or self._session).exec(statement).all())
+
+    def revoke_sessions_for_user(self, user_id: UUID, revoked_at: datetime) -> int:
+        result = self._session.exec(
+            update(SessionModel)
+            .where(
+                col(SessionModel.user_id) == user_id,
+                col(SessionModel.revoked_at).is_(None),
+                col(SessionModel.expires_at) > revoked_at,
+            )
+            .values(revoked_at=revoked_at)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def delete_sessions_ended_before(self, cutoff: datetime, limit: int) -> int:
+        # Pick ids first: MySQL rejects LIMIT inside a DELETE ... IN subquery,
+        # and deleting by primary key keeps each batch's locks small.
+        ids = self._session.exec(
+            select(SessionModel.id).where(col(SessionModel.expires_at) < cutoff).limit(limit)
+        ).all()
+        if not ids:
+            return 0
+        self._session.exec(delete(SessionModel).where(col(SessionModel.id).in_(ids)))
+        return len(ids)
+
+    def update_last_login_times(self, last_logins: Mapping[UUID, datetime]) -> None:
+        if not last_logins:
+            return
+        self._session.exec(
+            update(User)
+            .where(col(User.id).in_(list(last_logins)))
+            .values(last_login_at=case(dict(last_logins), value=User.id))
+            .execution_options(synchronize_session=False)
+        )
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        event.listen(self._session, "after_commit", lambda _session: callback(), once=True)
+
+    def find_sessions_revoked_since(self, since: datetime, now: datetime) -> list[RevokedSession]:
+        rows = self._session.exec(
+            select(SessionModel.token_hash, SessionModel.revoked_at, SessionModel.expires_at).where(
+                col(SessionModel.revoked_at) >= since,
+                col(SessionModel.expires_at) > now,
+            )
+        ).all()
+        return [
+            RevokedSession(token_hash=token_hash, revoked_at=revoked_at, expires_at=expires_at)
+            for token_hash, revoked_at, expires_at in rows
+            if revoked_at is not None
+        ]
+
+    def find_revoked_sessions_for_user(self, user_id: UUID, now: datetime) -> list[RevokedSession]:
+        rows = self._session.exec(
+            select(SessionModel.token_hash, SessionModel.revoked_at, SessionModel.expires_at).where(
+                col(SessionModel.user_id) == user_id,
+                col(SessionModel.revoked_at).is_not(None),
+                col(SessionModel.expires_at) > now,
+            )
+        ).all()
+        return [
+            RevokedSession(token_hash=token_hash, revoked_at=revoked_at, expires_at=expires_at)
+            for token_hash, revoked_at, expires_at in rows
+            if revoked_at is not None
+        ]
+
+    def _read_first(self, query: Callable[[Session], T | None]) -> T | None:
+        if self._read_session is None:
+            return query(self._session)
+        return query(self._read_session) or query(self._session)
+
+
+def _sessions_with_users(db: Session, token_hashes: Sequence[bytes]) -> dict[bytes, SessionLookup]:
+    rows = db.exec(
+        select(User, SessionModel.token_hash, SessionModel.expires_at, SessionModel.revoked_at)
+        .join(SessionModel, col(SessionModel.user_id) == User.id)
+        .where(col(SessionModel.token_hash).in_(token_hashes))
+    ).all()
+    return {
+        token_hash: SessionLookup(user=user, expires_at=expires_at, revoked_at=revoked_at)
+        for user, token_hash, expires_at, revoked_at in rows
+    }
+
+
+def before_session_cursor(after: SessionCursor) -> ColumnElement[bool]:
+    # Served by the (user_id, created_at) index, whose entries end with the id.
+    return keyset_before((col(SessionModel.created_at), col(SessionModel.id)), after)
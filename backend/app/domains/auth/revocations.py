@@ -0,0 +1,35 @@
+"""Keeps the signed-token revocation denylist in step with the database."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.domains.auth import service
+from app.domains.auth.repository import SqlAuthRepository
+from app.domains.auth.tokens import RevocationDenylist
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_denylist_from_db(engine: Engine, denylist: RevocationDenylist) -> int:
+    with Session(engine) as db:
+        return service.refresh_denylist(SqlAuthRepository(db), denylist)
+
+
+async def run_denylist_refresher(
+    engine: Engine, denylist: RevocationDenylist, interval_seconds: float, stop: asyncio.Event
+) -> None:
+    """Refresh every ``interval_seconds`` until ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), interval_seconds)
+        except TimeoutError:
+            pass
+        try:
+            await asyncio.to_thread(refresh_denylist_from_db, engine, denylist)
+        except Exception:
+            logger.exception("Revocation denylist refresh failed")
@@ -1,9 +1,14 @@
 """Auth API schemas."""
 
 from datetime import datetime
+from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+
+SESSION_BATCH_MAX_TOKENS = 1000
+
+SessionCheckStatus = Literal["valid", "not_found", "expired", "revoked", "inactive"]
 
 
 class AuthEmailIn(BaseModel):
@@ -20,3 +25,39 @@ class UserSummary(BaseModel):
     created_at: datetime
     last_login_at: datetime | None
     is_active: bool
+
+
+class SessionOut(BaseModel):
+    """One of the caller's sessions; ``current`` marks the one making the request."""
+
+    id: int
+    created_at: datetime
+    expires_at: datetime
+    revoked_at: datetime | None
+    current: bool
+
+
+class SessionPageOut(BaseModel):
+    """A page of sessions, newest first; ``next_cursor`` is None on the last page."""
+
+    sessions: list[SessionOut]
+    next_cursor: str | None
+
+
+class SessionBatchIn(BaseModel):
+    """Session tokens to validate in one call."""
+
+    tokens: list[str] = Field(min_length=1, max_length=SESSION_BATCH_MAX_TOKENS)
+
+
+class SessionCheckOut(BaseModel):
+    """Validation result for one token; ``user`` is set only when ``valid``."""
+
+    status: SessionCheckStatus
+    user: UserSummary | None = None
+
+
+class SessionBatchOut(BaseModel):
+    """Per-token results, in the order the tokens were sent."""
+
+    results: list[SessionCheckOut]
@@ -2,13 +2,61 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 import hashlib
 import secrets
+from typing import TYPE_CHECKING, TypeVar
+from uuid import UUID
 
+from app.db.pagination import split_page
 from app.domains.auth import errors
+from app.domains.auth.cache import BaseSessionCache, CachedSession
 from app.domains.auth.models import Session as SessionModel
 from app.domains.auth.models import User
+from app.domains.auth.tokens import RevocationDenylist, SignedSessionTokens
+
+if TYPE_CHECKING:
+    from app.domains.auth.last_login import LastLoginBuffer
+
+
+@dataclass(frozen=True)
+class SessionLookup:
+    """A session's validity fields together with its owning user."""
+
+    user: User
+    expires_at: datetime
+    revoked_at: datetime | None
+
+
+@dataclass(frozen=True)
+class TokenCheck:
+    """Outcome for one token of a batch: the user, or the auth error that rejected it."""
+
+    user: User | None = None
+    error: errors.AuthError | None = None
+
+
+SessionCursor = tuple[datetime, int]
+"""``(created_at, id)`` of the last session on a page."""
+
+_Usable = TypeVar("_Usable", SessionModel, SessionLookup)
+
+
+@dataclass(frozen=True)
+class SessionPage:
+    """A page of a user's sessions, newest first."""
+
+    sessions: list[SessionModel]
+    next_after: SessionCursor | None
+
+
+@dataclass(frozen=True)
+class RevokedSession:
+    token_hash: bytes
+    revoked_at: datetime
+    expires_at: datetime
 
 
 class AuthRepository:
@@ -26,13 +74,61 @@ class AuthRepository:
     def add_session(self, session_model: SessionModel) -> None:  # pragma: no cover - interface
         raise NotImplementedError
 
-    def find_session_by_token_hash(self, token_hash: str) -> SessionModel | None:  # pragma: no cover
+    def find_session_by_token_hash(self, token_hash: bytes) -> SessionModel | None:  # pragma: no cover
+        raise NotImplementedError
+
+    def find_user_by_id(self, user_id: UUID) -> User | None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def find_session_with_user(self, token_hash: bytes) -> SessionLookup | None:  # pragma: no cover
+        raise NotImplementedError
+
+    def find_sessions_with_users(
+        self, token_hashes: Sequence[bytes]
+    ) -> dict[bytes, SessionLookup]:  # pragma: no cover - interface
+        """Look up many sessions with their users in one query, keyed by token hash."""
+        raise NotImplementedError
+
+    def list_sessions_for_user(
+        self, user_id: UUID, limit: int, after: SessionCursor | None = None
+    ) -> list[SessionModel]:  # pragma: no cover - interface
+        """Up to ``limit`` sessions ordered by ``(created_at, id)`` descending, after the cursor."""
+        raise NotImplementedError
+
+    def revoke_sessions_for_user(
+        self, user_id: UUID, revoked_at: datetime
+    ) -> int:  # pragma: no cover - interface
+        """Revoke every live session of the user in one statement; returns the row count."""
+        raise NotImplementedError
+
+    def delete_sessions_ended_before(self, cutoff: datetime, limit: int) -> int:  # pragma: no cover
+        raise NotImplementedError
+
+    def update_last_login_times(self, last_logins: Mapping[UUID, datetime]) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+    def find_sessions_revoked_since(
+        self, since: datetime, now: datetime
+    ) -> list[RevokedSession]:  # pragma: no cover - interface
         raise NotImplementedError
 
-    def find_user_by_id(self, user_id) -> User | None:  # pragma: no cover - interface
+    def find_revoked_sessions_for_user(
+        self, user_id: UUID, now: datetime
+    ) -> list[RevokedSession]:  # pragma: no cover - interface
+        """The user's revoked sessions that have not expired yet."""
+        raise NotImplementedError
+
+    def after_commit(self, callback: Callable[[], None]) -> None:  # pragma: no cover - interface
+        """Run ``callback`` once the current transaction commits.
+
+        Cache invalidations go here: dropped before the commit, an entry can
+        be re-read from the still-valid row and cached again.
+        """
         raise NotImplementedError
 
 SESSION_TTL_DAYS = 7
+SESSION_PAGE_MAX = 100
+DENYLIST_REFRESH_OVERLAP = timedelta(minutes=1)
 
 
 def normalize_email(email: str) -> str:
@@ -40,9 +136,9 @@ def normalize_email(email: str) -> str:
     return email.strip().lower()
 
 
-def hash_token(token: str) -> str:
-    """Hash session tokens for storage."""
-    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+def hash_token(token: str) -> bytes:
+    """Hash session tokens for storage as a raw 32-byte SHA-256 digest."""
+    return hashlib.sha256(token.encode("utf-8")).digest()
 
 
 def _utcnow() -> datetime:
@@ -59,8 +155,13 @@ def _as_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc)
 
 
-def register_user(repo: AuthRepository, email: str) -> tuple[User, SessionModel, str]:
-    """Register a new user and create a session."""
+def register_user(
+    repo: AuthRepository, email: str, tokens: SignedSessionTokens | None = None
+) -> tuple[User, SessionModel, str]:
+    """Register a new user and create a session.
+
+    With ``tokens`` the session is issued as a signed token.
+    """
     normalized_email = normalize_email(email)
     existing = repo.find_user_by_email(normalized_email)
     if existing:
@@ -70,64 +171,305 @@ def register_user(repo: AuthRepository, email: str) -> tuple[User, SessionModel,
     repo.add_user(user)
     repo.flush()
 
-    session_model, token = _create_session(repo, user)
+    session_model, token = _create_session(repo, user, tokens)
     return user, session_model, token
 
 
-def login_user(repo: AuthRepository, email: str) -> tuple[User, SessionModel, str]:
-    """Login an existing user and create a session."""
-    normalized_email = normalize_email(email)
-    user = repo.find_user_by_email(normalized_email)
-    if not user:
-        raise errors.UserNotFound
-    if not user.is_active:
-        raise errors.UserInactive
+def login_user(
+    repo: AuthRepository,
+    email: str,
+    last_login_buffer: LastLoginBuffer | None = None,
+    tokens: SignedSessionTokens | None = None,
+) -> tuple[User, SessionModel, str]:
+    """Login an existing user and create a session.
 
-    user.last_login_at = _utcnow()
-    repo.add_user(user)
-    session_model, token = _create_session(repo, user)
+    With a ``last_login_buffer`` the ``last_login_at`` write is deferred to the
+    buffer's flusher and the returned user is a detached copy carrying the
+    fresh timestamp.
+    """
+    normalized_email = normalize_email(email)
+    user = _require_active_user(repo.find_user_by_email(normalized_email))
+
+    logged_in_at = _utcnow()
+    if last_login_buffer is not None and last_login_buffer.record(user.id, logged_in_at):
+        user = _detached_user(user, last_login_at=logged_in_at)
+    else:
+        user.last_login_at = logged_in_at
+        repo.add_user(user)
+    session_model, token = _create_session(repo, user, tokens)
     return user, session_model, token
 
 
-def logout_session(repo: AuthRepository, token: str) -> None:
-    """Revoke an existing session by token."""
+def logout_session(
+    repo: AuthRepository,
+    token: str,
+    cache: BaseSessionCache | None = None,
+    tokens: SignedSessionTokens | None = None,
+) -> None:
+    """Revoke an existing session by token.
+
+    A cached entry is dropped when the revoke commits. With ``tokens`` the
+    session is also denylisted in this process at once; other processes
+    pick it up on their next denylist refresh.
+    """
     token_hash = hash_token(token)
-    session_model = repo.find_session_by_token_hash(token_hash)
-    if not session_model:
-        raise errors.SessionNotFound
-    if session_model.revoked_at is not None:
-        raise errors.SessionRevoked
-    if _as_utc(session_model.expires_at) <= _utcnow():
-        raise errors.SessionExpired
+    session_model = _require_usable_session(repo.find_session_by_token_hash(token_hash))
 
     session_model.revoked_at = _utcnow()
     repo.add_session(session_model)
+    if cache is not None:
+        repo.after_commit(lambda: cache.invalidate(token_hash))
+    if tokens is not None:
+        tokens.denylist.add(token_hash, _as_utc(session_model.expires_at))
+
+
+def get_user_for_session(
+    repo: AuthRepository,
+    token: str,
+    cache: BaseSessionCache | None = None,
+    tokens: SignedSessionTokens | None = None,
+) -> User:
+    """Fetch the user for a valid session token.
+
+    With a ``cache``, a fresh entry short-circuits the DB lookups and the
+    returned user is a detached copy. With ``tokens``, signed tokens are
+    validated without the ``session`` table and only the user is loaded.
+    """
+    token_hash = hash_token(token)
+    claims = None
+    if tokens is not None and tokens.is_signed(token):
+        claims = tokens.verify(token, _utcnow())
+        if token_hash in tokens.denylist:
+            raise errors.SessionRevoked
+
+    generation = None
+    if cache is not None:
+        cached = cache.get(token_hash, _utcnow())
+        if cached is not None:
+            return cached.to_user()
+        generation = cache.generation
+
+    if claims is not None:
+        user = _require_active_user(repo.find_user_by_id(claims.user_id))
+        expires_at = claims.expires_at
+    else:
+        lookup = _require_usable_session(repo.find_session_with_user(token_hash))
+        user = _require_active_user(lookup.user)
+        expires_at = _as_utc(lookup.expires_at)
+
+    if cache is not None:
+        cache.put(token_hash, CachedSession.from_user(user, expires_at), generation)
+    return user
 
 
-def get_user_for_session(repo: AuthRepository, token: str) -> User:
-    """Fetch the user for a valid session token."""
-    token_hash = hash_token(token)
-    session_model = repo.find_session_by_token_hash(token_hash)
+def validate_session_tokens(
+    repo: AuthRepository,
+    token_list: Sequence[str],
+    cache: BaseSessionCache | None = None,
+    tokens: SignedSessionTokens | None = None,
+) -> list[TokenCheck]:
+    """Validate many session tokens with at most one query; results follow input order.
+
+    Bad signatures, denylisted tokens and cache hits are settled in memory.
+    Everything else, signed tokens included, resolves through a single
+    ``IN`` lookup on ``token_hash`` joined to ``user``.
+    """
+    results, pending, generation = _check_tokens_in_memory(token_list, cache, tokens)
+    if pending:
+        lookups = repo.find_sessions_with_users(list(pending))
+        _resolve_pending_tokens(results, pending, lookups, cache, generation)
+    return results
+
+
+def list_sessions(
+    repo: AuthRepository, user_id: UUID, limit: int = 20, after: SessionCursor | None = None
+) -> SessionPage:
+    """Return one page of the user's sessions, newest first, revoked and expired included."""
+    limit = max(1, min(limit, SESSION_PAGE_MAX))
+    rows = repo.list_sessions_for_user(user_id, limit + 1, after)
+    sessions, next_after = split_page(rows, limit, session_cursor)
+    return SessionPage(sessions=sessions, next_after=next_after)
+
+
+def session_cursor(session_model: SessionModel) -> SessionCursor:
+    assert session_model.id is not None
+    return session_model.created_at, session_model.id
+
+
+def revoke_all_sessions(
+    repo: AuthRepository,
+    user_id: UUID,
+    cache: BaseSessionCache | None = None,
+    tokens: SignedSessionTokens | None = None,
+) -> int:
+    """Log the user out everywhere; returns how many sessions were revoked.
+
+    The revocation is a single UPDATE on ``session.user_id``. Cached entries
+    for the user are dropped when it commits and, with ``tokens``, the
+    revoked sessions are denylisted in this process at once.
+    """
+    revoked_at = _utcnow()
+    revoked = repo.revoke_sessions_for_user(user_id, revoked_at)
+    if cache is not None:
+        repo.after_commit(lambda: cache.invalidate_user(user_id))
+    if tokens is not None and revoked:
+        _denylist(tokens, repo.find_revoked_sessions_for_user(user_id, revoked_at))
+    return revoked
+
+
+def deactivate_user(
+    repo: AuthRepository, user_id: UUID, cache: BaseSessionCache | None = None
+) -> User:
+    """Mark a user inactive so their sessions stop resolving."""
+    user = repo.find_user_by_id(user_id)
+    if not user:
+        raise errors.UserNotFound
+    user.is_active = False
+    repo.add_user(user)
+    if cache is not None:
+        repo.after_commit(lambda: cache.invalidate_user(user_id))
+    return user
+
+
+def reap_sessions(repo: AuthRepository, retention: timedelta, batch_size: int) -> int:
+    """Delete one batch of sessions that expired before the retention window.
+
+    Revoked sessions stay until they expire too: workers rebuild their
+    signed-token denylist from these rows, so a revocation must outlive
+    the token it revokes. Returns the number of rows removed; fewer than
+    ``batch_size`` means nothing is left.
+    """
+    cutoff = _utcnow() - retention
+    return repo.delete_sessions_ended_before(cutoff, batch_size)
+
+
+def refresh_denylist(repo: AuthRepository, denylist: RevocationDenylist) -> int:
+    """Load sessions revoked since the denylist's watermark and prune expired ones.
+
+    The first refresh covers a full session lifetime. Later ones re-read a
+    short overlap so revocations committed slightly out of order are not
+    missed. Returns the number of rows read.
+    """
+    now = _utcnow()
+    if denylist.watermark is None:
+        since = now - timedelta(days=SESSION_TTL_DAYS)
+    else:
+        since = denylist.watermark - DENYLIST_REFRESH_OVERLAP
+    revoked = repo.find_sessions_revoked_since(since, now)
+    for row in revoked:
+        denylist.add(row.token_hash, _as_utc(row.expires_at))
+        denylist.advance(_as_utc(row.revoked_at))
+    denylist.prune(now)
+    return len(revoked)
+
+
+def _denylist(tokens: SignedSessionTokens, revoked: list[RevokedSession]) -> None:
+    for row in revoked:
+        tokens.denylist.add(row.token_hash, _as_utc(row.expires_at))
+
+
+def _check_tokens_in_memory(
+    token_list: Sequence[str],
+    cache: BaseSessionCache | None,
+    tokens: SignedSessionTokens | None,
+) -> tuple[list[TokenCheck], dict[bytes, list[int]], int | None]:
+    """Settle what needs no DB; returns the results, pending hashes by index, cache generation."""
+    now = _utcnow()
+    generation = cache.generation if cache is not None else None
+    results = [TokenCheck() for _ in token_list]
+    pending: dict[bytes, list[int]] = {}
+    for index, token in enumerate(token_list):
+        token_hash = hash_token(token)
+        if tokens is not None and tokens.is_signed(token):
+            try:
+                tokens.verify(token, now)
+            except errors.AuthError as exc:
+                results[index] = TokenCheck(error=exc)
+                continue
+            if token_hash in tokens.denylist:
+                results[index] = TokenCheck(error=errors.SessionRevoked())
+                continue
+        cached = cache.get(token_hash, now) if cache is not None else None
+        if cached is not None:
+            results[index] = TokenCheck(user=cached.to_user())
+            continue
+        pending.setdefault(token_hash, []).append(index)
+    return results, pending, generation
+
+
+def _resolve_pending_tokens(
+    results: list[TokenCheck],
+    pending: Mapping[bytes, list[int]],
+    lookups: Mapping[bytes, SessionLookup],
+    cache: BaseSessionCache | None,
+    generation: int | None,
+) -> None:
+    for token_hash, indexes in pending.items():
+        try:
+            lookup = _require_usable_session(lookups.get(token_hash))
+            user = _require_active_user(lookup.user)
+        except errors.AuthError as exc:
+            check = TokenCheck(error=exc)
+        else:
+            check = TokenCheck(user=user)
+            if cache is not None:
+                entry = CachedSession.from_user(user, _as_utc(lookup.expires_at))
+                cache.put(token_hash, entry, generation)
+        for index in indexes:
+            results[index] = check
+
+
+def _require_usable_session(session_model: _Usable | None) -> _Usable:
     if not session_model:
         raise errors.SessionNotFound
     if session_model.revoked_at is not None:
         raise errors.SessionRevoked
     if _as_utc(session_model.expires_at) <= _utcnow():
         raise errors.SessionExpired
+    return session_model
+
 
-    user = repo.find_user_by_id(session_model.user_id)
+def _require_active_user(user: User | None) -> User:
     if not user:
         raise errors.UserNotFound
     if not user.is_active:
         raise errors.UserInactive
-
     return user
 
 
-def _create_session(repo: AuthRepository, user: User) -> tuple[SessionModel, str]:
-    token = secrets.token_urlsafe(32)
-    token_hash = hash_token(token)
+def _detached_user(user: User, last_login_at: datetime | None) -> User:
+    return User(
+        id=user.id,
+        email=user.email,
+        created_at=user.created_at,
+        last_login_at=last_login_at,
+        is_active=user.is_active,
+    )
+
+
+def _new_session(
+    user: User, tokens: SignedSessionTokens | None = None
+) -> tuple[SessionModel, str]:
     expires_at = _utcnow() + timedelta(days=SESSION_TTL_DAYS)
-    session_model = SessionModel(user_id=user.id, token_hash=token_hash, expires_at=expires_at)
+    if tokens is None:
+        token = secrets.token_urlsafe(32)
+        session_model = SessionModel(
+            user_id=user.id, token_hash=hash_token(token), expires_at=expires_at
+        )
+        return session_model, token
+
+    # Signed tokens carry whole seconds; keep the row's expiry identical.
+    expires_at = expires_at.replace(microsecond=0)
+    token = tokens.issue(user.id, expires_at)
+    session_model = SessionModel(
+        user_id=user.id, token_hash=hash_token(token), expires_at=expires_at
+    )
+    return session_model, token
+
+
+def _create_session(
+    repo: AuthRepository, user: User, tokens: SignedSessionTokens | None = None
+) -> tuple[SessionModel, str]:
+    session_model, token = _new_session(user, tokens)
     repo.add_session(session_model)
     return session_model, token
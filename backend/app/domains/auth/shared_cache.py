@@ -0,0 +1,286 @@
+"""Session cache shared by every worker process on a host.
+
+The table lives in a memory-mapped file (``/dev/shm`` by default), so each
+uvicorn worker maps the same pages and a logout in one worker is seen by all
+of them. The table is 8-way set-associative: a token hash picks a bucket of
+``WAYS`` fixed-size slots, and when a bucket is full the slot closest to its
+deadline is evicted.
+
+Readers take no lock. Each slot starts with a sequence number that writers
+make odd while they rewrite the slot; a reader retries when the number was
+odd or changed during its copy (a seqlock). Writers serialize per lock
+stripe with a thread lock plus an ``fcntl`` byte-range lock, because POSIX
+record locks do not exclude threads of the same process.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from app.domains.auth.cache import BaseSessionCache, CachedSession, CacheStats
+
+WAYS = 8
+LOCK_STRIPES = 64
+EMAIL_BYTES = 254
+_LAYOUT_VERSION = 1
+_MAGIC = b"BCSC"
+_READ_ATTEMPTS = 4
+
+# magic, layout version, buckets, ways, slot size, then the shared generation at offset 24.
+_HEADER = struct.Struct("<4sIIII4xQ")
+_HEADER_SIZE = 64
+_GENERATION_OFFSET = 24
+_SEQ = struct.Struct("<Q")
+# token hash, user id, expires_at, created_at, last_login_at (µs; -1 for none),
+# deadline (wall clock), is_active, email length, email.
+_BODY = struct.Struct(f"<32s16sqqqd?B{EMAIL_BYTES}s")
+_SLOT_SIZE = _SEQ.size + _BODY.size
+_EMPTY_KEY = bytes(32)
+_EMPTY_BODY = bytes(_BODY.size)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class SharedSessionCache(BaseSessionCache):
+    """Fixed-size session cache in shared memory.
+
+    Capacity is ``max_entries`` rounded up to whole buckets. Hit, miss,
+    eviction and expiration counters are per process; ``size`` counts live
+    entries across all processes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._buckets = max(1, -(-max_entries // WAYS))
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        # Geometry is part of the name so processes with other settings never
+        # share (and resize) the same file.
+        self.path = f"{path}-{self._buckets * WAYS}-v{_LAYOUT_VERSION}"
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_locks = [threading.Lock() for _ in range(LOCK_STRIPES + 1)]
+        size = _HEADER_SIZE + self._buckets * WAYS * _SLOT_SIZE
+        with self._locked(LOCK_STRIPES):
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, size)
+                os.pwrite(
+                    self._fd,
+                    _HEADER.pack(_MAGIC, _LAYOUT_VERSION, self._buckets, WAYS, _SLOT_SIZE, 0),
+                    0,
+                )
+        self._map = mmap.mmap(self._fd, size)
+        magic, version, buckets, ways, slot_size, _ = _HEADER.unpack_from(self._map, 0)
+        if (magic, version, buckets, ways, slot_size) != (
+            _MAGIC,
+            _LAYOUT_VERSION,
+            self._buckets,
+            WAYS,
+            _SLOT_SIZE,
+        ):
+            self.close()
+            raise ValueError(f"{self.path} does not hold a compatible session cache")
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+        os.close(self._fd)
+
+    @property
+    def generation(self) -> int:
+        return _SEQ.unpack_from(self._map, _GENERATION_OFFSET)[0]
+
+    def get(self, token_hash: bytes, now: datetime) -> CachedSession | None:
+        for offset in self._slots(self._bucket(token_hash)):
+            if self._map[offset + _SEQ.size : offset + _SEQ.size + 32] != token_hash:
+                continue
+            body = self._read(offset)
+            if body is None or body[0] != token_hash:
+                continue
+            entry, deadline = _decode(body)
+            if deadline <= self._clock() or entry.expires_at <= now:
+                self._count(expirations=1, misses=1)
+                return None
+            self._count(hits=1)
+            return entry
+        self._count(misses=1)
+        return None
+
+    def put(self, token_hash: bytes, entry: CachedSession, generation: int | None = None) -> None:
+        email = entry.email.encode("utf-8")
+        if len(email) > EMAIL_BYTES:
+            return
+        bucket = self._bucket(token_hash)
+        with self._locked(bucket % LOCK_STRIPES):
+            if generation is not None and generation != self.generation:
+                return
+            now = self._clock()
+            target = None
+            victim: tuple[float, int] | None = None
+            for offset in self._slots(bucket):
+                slot_key, deadline = _key_and_deadline(self._map, offset)
+                if slot_key == token_hash or slot_key == _EMPTY_KEY:
+                    target = offset
+                    break
+                if deadline <= now:
+                    victim = (float("-inf"), offset)
+                elif victim is None or deadline < victim[0]:
+                    victim = (deadline, offset)
+            if target is None:
+                assert victim is not None
+                if victim[0] != float("-inf"):
+                    self._count(evictions=1)
+                target = victim[1]
+            self._write(target, _encode(token_hash, entry, email, now + self._ttl_seconds))
+
+    def invalidate(self, token_hash: bytes) -> None:
+        self._bump_generation()
+        bucket = self._bucket(token_hash)
+        with self._locked(bucket % LOCK_STRIPES):
+            for offset in self._slots(bucket):
+                if _key_and_deadline(self._map, offset)[0] == token_hash:
+                    self._write(offset, _EMPTY_BODY)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Drop every cached session of ``user_id``; scans the whole table."""
+        self._bump_generation()
+        user_bytes = user_id.bytes
+        for bucket in range(self._buckets):
+            with self._locked(bucket % LOCK_STRIPES):
+                for offset in self._slots(bucket):
+                    start = offset + _SEQ.size + 32
+                    if self._map[start : start + 16] == user_bytes:
+                        self._write(offset, _EMPTY_BODY)
+
+    def clear(self) -> None:
+        self._bump_generation()
+        for bucket in range(self._buckets):
+            with self._locked(bucket % LOCK_STRIPES):
+                for offset in self._slots(bucket):
+                    self._write(offset, _EMPTY_BODY)
+
+    def stats(self) -> CacheStats:
+        now = self._clock()
+        size = 0
+        for bucket in range(self._buckets):
+            for offset in self._slots(bucket):
+                key, deadline = _key_and_deadline(self._map, offset)
+                if key != _EMPTY_KEY and deadline > now:
+                    size += 1
+        with self._stats_lock:
+            return CacheStats(
+                size=size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def _bucket(self, key: bytes) -> int:
+        return int.from_bytes(key[:8], "little") % self._buckets
+
+    def _slots(self, bucket: int) -> range:
+        start = _HEADER_SIZE + bucket * WAYS * _SLOT_SIZE
+        return range(start, start + WAYS * _SLOT_SIZE, _SLOT_SIZE)
+
+    def _read(self, offset: int) -> tuple[Any, ...] | None:
+        for _ in range(_READ_ATTEMPTS):
+            before = _SEQ.unpack_from(self._map, offset)[0]
+            if before & 1:
+                continue
+            body = _BODY.unpack_from(self._map, offset + _SEQ.size)
+            if _SEQ.unpack_from(self._map, offset)[0] == before:
+                return body
+        return None
+
+    def _write(self, offset: int, body: bytes) -> None:
+        """Rewrite one slot; the caller holds the slot's stripe lock."""
+        seq = _SEQ.unpack_from(self._map, offset)[0]
+        _SEQ.pack_into(self._map, offset, seq + 1)
+        self._map[offset + _SEQ.size : offset + _SLOT_SIZE] = body
+        _SEQ.pack_into(self._map, offset, seq + 2)
+
+    def _bump_generation(self) -> None:
+        with self._locked(LOCK_STRIPES):
+            _SEQ.pack_into(self._map, _GENERATION_OFFSET, self.generation + 1)
+
+    @contextmanager
+    def _locked(self, stripe: int) -> Iterator[None]:
+        with self._thread_locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+
+    def _count(
+        self, hits: int = 0, misses: int = 0, evictions: int = 0, expirations: int = 0
+    ) -> None:
+        with self._stats_lock:
+            self._hits += hits
+            self._misses += misses
+            self._evictions += evictions
+            self._expirations += expirations
+
+
+def _key_and_deadline(buffer: mmap.mmap, offset: int) -> tuple[bytes, float]:
+    start = offset + _SEQ.size
+    key = buffer[start : start + 32]
+    (deadline,) = struct.unpack_from("<d", buffer, start + 72)
+    return key, deadline
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _encode(token_hash: bytes, entry: CachedSession, email: bytes, deadline: float) -> bytes:
+    return _BODY.pack(
+        token_hash,
+        entry.user_id.bytes,
+        _to_micros(entry.expires_at),
+        _to_micros(entry.created_at),
+        _to_micros(entry.last_login_at) if entry.last_login_at else -1,
+        deadline,
+        entry.is_active,
+        len(email),
+        email,
+    )
+
+
+def _decode(body: tuple[Any, ...]) -> tuple[CachedSession, float]:
+    _key, user_id, expires, created, last_login, deadline, is_active, email_len, email = body
+    entry = CachedSession(
+        user_id=UUID(bytes=user_id),
+        email=email[:email_len].decode("utf-8"),
+        created_at=_from_micros(created),
+        last_login_at=_from_micros(last_login) if last_login >= 0 else None,
+        is_active=is_active,
+        expires_at=_from_micros(expires),
+    )
+    return entry, deadline
@@ -0,0 +1,123 @@
+"""Signed, self-validating session tokens.
+
+A signed token is ``<payload>.<signature>`` in unpadded base64url. The
+payload packs a format version, a random nonce, the user id and the expiry
+as Unix seconds; the signature is HMAC-SHA256 over the payload. It carries
+no session id: the token is issued before its session row has one, and the
+row is found by the token's hash, which the nonce keeps unique. Validation
+needs no database access: revoked sessions are rejected through a
+``RevocationDenylist`` of token hashes, each kept only until its expiry.
+
+Opaque tokens (``secrets.token_urlsafe``) never contain ``.``, so both
+formats can be told apart during a switch between modes.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import secrets
+import struct
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from uuid import UUID
+
+from app.domains.auth import errors
+
+_FORMAT_VERSION = 1
+_PAYLOAD = struct.Struct(">B16s16sq")
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    user_id: UUID
+    expires_at: datetime
+
+
+class RevocationDenylist:
+    """Hashes of revoked tokens, each kept until the session would have expired."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._expiry: dict[bytes, datetime] = {}
+        self.watermark: datetime | None = None
+        """Latest ``revoked_at`` loaded from the database."""
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def __contains__(self, token_hash: bytes) -> bool:
+        return token_hash in self._expiry
+
+    def add(self, token_hash: bytes, expires_at: datetime) -> None:
+        with self._lock:
+            self._expiry[token_hash] = expires_at
+
+    def advance(self, revoked_at: datetime) -> None:
+        with self._lock:
+            if self.watermark is None or revoked_at > self.watermark:
+                self.watermark = revoked_at
+
+    def prune(self, now: datetime) -> int:
+        """Forget sessions that have expired anyway; returns how many were dropped."""
+        with self._lock:
+            expired = [key for key, expires_at in self._expiry.items() if expires_at <= now]
+            for token_hash in expired:
+                del self._expiry[token_hash]
+        return len(expired)
+
+
+class SignedSessionTokens:
+    """Issues and verifies signed tokens; revocations live in ``denylist``."""
+
+    def __init__(self, secret: bytes, denylist: RevocationDenylist | None = None) -> None:
+        self._secret = secret
+        self.denylist = denylist or RevocationDenylist()
+
+    @staticmethod
+    def is_signed(token: str) -> bool:
+        return "." in token
+
+    def issue(self, user_id: UUID, expires_at: datetime) -> str:
+        payload = _PAYLOAD.pack(
+            _FORMAT_VERSION, secrets.token_bytes(16), user_id.bytes, int(expires_at.timestamp())
+        )
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def verify(self, token: str, now: datetime) -> TokenClaims:
+        """Check signature and expiry; callers check the denylist by token hash."""
+        encoded_payload, _, encoded_signature = token.partition(".")
+        try:
+            payload = _b64decode(encoded_payload)
+            signature = _b64decode(encoded_signature)
+        except (binascii.Error, ValueError) as exc:
+            raise errors.SessionNotFound from exc
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise errors.SessionNotFound
+        if len(payload) != _PAYLOAD.size:
+            raise errors.SessionNotFound
+        version, _nonce, user_id, expires = _PAYLOAD.unpack(payload)
+        if version != _FORMAT_VERSION:
+            raise errors.SessionNotFound
+
+        claims = TokenClaims(
+            user_id=UUID(bytes=user_id),
+            expires_at=datetime.fromtimestamp(expires, timezone.utc),
+        )
+        if claims.expires_at <= now:
+            raise errors.SessionExpired
+        return claims
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(encoded: str) -> bytes:
+    return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
@@ -0,0 +1 @@
+"""Ledger domain package."""
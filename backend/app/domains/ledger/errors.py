@@ -0,0 +1,29 @@
+"""Ledger domain errors."""
+
+
+class LedgerError(Exception):
+    """Base class for ledger errors."""
+
+
+class AccountNotFound(LedgerError):
+    """Raised when an account does not exist or belongs to another user."""
+
+
+class EntryNotFound(LedgerError):
+    """Raised when an entry does not exist or belongs to another user."""
+
+
+class EntryAlreadyReversed(LedgerError):
+    """Raised when reversing an entry that was already reversed, or is a reversal."""
+
+
+class InvalidImportFile(LedgerError):
+    """Raised when an import file cannot be read as the declared format at all."""
+
+
+class CategoryNotFound(LedgerError):
+    """Raised when a category does not exist or belongs to another user."""
+
+
+class InvalidReportRange(LedgerError):
+    """Raised when a report's months are out of order or span too many months."""
@@ -0,0 +1,372 @@
+"""Streaming import of bank statements (CSV and OFX) into a ledger account.
+
+Every stage is a generator: body chunks become text, text becomes rows,
+and rows are validated one at a time against ``EntryIn``. ``import_entries``
+pulls at most ``batch_size`` rows before writing them, so memory is bounded
+by one batch whatever the size of the file.
+
+Each batch is its own transaction: one query for the batch's hashes that
+the account already has, one executemany insert of the rest, one
+relative update of the account's totals and one executemany upsert of
+the monthly rollups the rows fall in. An interrupted import keeps the
+batches it committed, and importing the file again skips them.
+
+A row's ``import_hash`` identifies the transaction, not the file: the OFX
+``FITID`` when the bank sends one, otherwise the date, amount, description
+and the row's position among identical rows of that day (counted within
+each run of rows sharing a date, as statements are date-ordered), so two
+identical purchases on one day stay two entries.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import hashlib
+import html
+import logging
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Literal
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.domains.ledger import errors, service
+from app.domains.ledger.repository import SqlLedgerRepository
+from app.domains.ledger.schemas import EntryIn
+from app.domains.ledger.service import LedgerRepository
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "ofx"]
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 20
+
+_DESCRIPTION_MAX = 255
+_CSV_MAX_LINE = 64 * 1024
+_OFX_MAX_ELEMENT = 64 * 1024
+_FIELD_NAMES = {"occurred_on": "date", "amount": "amount", "description": "description"}
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRow:
+    occurred_on: date
+    amount_minor: int
+    description: str
+    import_hash: bytes
+
+
+@dataclass(frozen=True, slots=True)
+class RowError:
+    """A rejected row; ``row`` is the CSV line or the OFX transaction's position."""
+
+    row: int
+    message: str
+
+
+@dataclass
+class ImportResult:
+    """Running totals of an import, passed to ``on_progress`` after each batch."""
+
+    rows: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    batches: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.duration_seconds if self.duration_seconds else 0.0
+
+
+def iter_text(chunks: Iterable[bytes], encoding: str = "utf-8-sig") -> Iterator[str]:
+    """Decode byte chunks as they arrive; a character split across chunks is kept whole."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_lines(texts: Iterable[str]) -> Iterator[str]:
+    """Re-split text chunks into lines, keeping line endings for ``csv``.
+
+    A line is buffered until its end arrives, so a file that never ends one
+    is rejected once the buffer passes ``_CSV_MAX_LINE`` characters.
+    """
+    pending = ""
+    for text in texts:
+        lines = (pending + text).splitlines(keepends=True)
+        # The last piece may be cut mid-line, or between "\r" and "\n".
+        pending = lines.pop() if lines and not lines[-1].endswith("\n") else ""
+        if len(pending) > _CSV_MAX_LINE:
+            raise errors.InvalidImportFile(f"A line is longer than {_CSV_MAX_LINE} characters.")
+        yield from lines
+    if pending:
+        yield pending
+
+
+def parse_csv(texts: Iterable[str]) -> Iterator[ImportRow | RowError]:
+    """Rows of a CSV with a header naming ``date``, ``amount`` and optionally ``description``."""
+    reader = csv.reader(iter_lines(texts))
+    try:
+        header = next(reader, None)
+        if header is None:
+            raise errors.InvalidImportFile("The file is empty.")
+        columns = {name.strip().lower(): index for index, name in enumerate(header)}
+        missing = [name for name in ("date", "amount") if name not in columns]
+        if missing:
+            raise errors.InvalidImportFile(f"The CSV header has no {' or '.join(missing)} column.")
+        occurrences = _Occurrences()
+        description_at = columns.get("description")
+        for record in reader:
+            if not any(value.strip() for value in record):
+                continue
+            try:
+                fields = {
+                    "occurred_on": record[columns["date"]].strip(),
+                    "amount": record[columns["amount"]].strip(),
+                    "description": record[description_at] if description_at is not None else "",
+                }
+            except IndexError:
+                yield RowError(reader.line_num, "The row has fewer fields than the header.")
+                continue
+            yield _import_row(reader.line_num, fields, occurrences)
+    except csv.Error as exc:
+        raise errors.InvalidImportFile(f"Line {reader.line_num}: {exc}.") from exc
+
+
+def parse_ofx(texts: Iterable[str]) -> Iterator[ImportRow | RowError]:
+    """Rows of an OFX statement, SGML (1.x) or XML (2.x): one per ``<STMTTRN>``."""
+    occurrences = _Occurrences()
+    transaction: dict[str, str] | None = None
+    position = 0
+    seen_ofx = False
+    for name, value in _ofx_elements(texts):
+        if name == "OFX":
+            seen_ofx = True
+        elif name == "STMTTRN":
+            position += 1
+            transaction = {}
+        elif name == "/STMTTRN" and transaction is not None:
+            yield _ofx_row(position, transaction, occurrences)
+            transaction = None
+        elif transaction is not None and not name.startswith("/"):
+            transaction[name] = value
+    if not seen_ofx:
+        raise errors.InvalidImportFile("The file has no <OFX> element.")
+
+
+PARSERS: dict[ImportFormat, Callable[[Iterable[str]], Iterator[ImportRow | RowError]]] = {
+    "csv": parse_csv,
+    "ofx": parse_ofx,
+}
+
+
+def import_entries(
+    engine: Engine,
+    user_id: UUID,
+    account_id: int,
+    rows: Iterable[ImportRow | RowError],
+    batch_size: int = IMPORT_BATCH_SIZE,
+    on_progress: Callable[[ImportResult], None] | None = None,
+) -> ImportResult:
+    """Write ``rows`` to the account in batches, skipping ones it already has.
+
+    Invalid rows are counted and the first ``MAX_REPORTED_ERRORS`` kept;
+    they do not stop the import. The account is checked before the first
+    row is read, so a wrong id fails without consuming the upload.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    start = time.perf_counter()
+    with Session(engine) as db:
+        service.get_account(SqlLedgerRepository(db), user_id, account_id)
+
+    result = ImportResult()
+
+    def write(batch: list[ImportRow]) -> None:
+        inserted = _write_batch(engine, user_id, account_id, batch)
+        result.inserted += inserted
+        result.duplicates += len(batch) - inserted
+        result.batches += 1
+        result.duration_seconds = time.perf_counter() - start
+        logger.debug(
+            "Import into account %d: batch %d, %d rows, %.0f rows/s",
+            account_id,
+            result.batches,
+            result.rows,
+            result.rows_per_second,
+        )
+        if on_progress is not None:
+            on_progress(result)
+
+    batch: list[ImportRow] = []
+    for row in rows:
+        result.rows += 1
+        if isinstance(row, RowError):
+            result.invalid += 1
+            if len(result.errors) < MAX_REPORTED_ERRORS:
+                result.errors.append(row)
+            continue
+        batch.append(row)
+        if len(batch) >= batch_size:
+            write(batch)
+            batch = []
+    if batch:
+        write(batch)
+
+    result.duration_seconds = time.perf_counter() - start
+    logger.info(
+        "Imported %d rows into account %d: %d new, %d duplicates, %d invalid"
+        " in %d batches (%.2fs, %.0f rows/s)",
+        result.rows,
+        account_id,
+        result.inserted,
+        result.duplicates,
+        result.invalid,
+        result.batches,
+        result.duration_seconds,
+        result.rows_per_second,
+    )
+    return result
+
+
+def import_batch(
+    repo: LedgerRepository, user_id: UUID, account_id: int, rows: list[ImportRow]
+) -> int:
+    """Insert the rows the account does not have yet and add them to its totals and rollups."""
+    unique: dict[bytes, ImportRow] = {}
+    for row in rows:
+        unique.setdefault(row.import_hash, row)
+    existing = repo.existing_import_hashes(account_id, list(unique))
+    new = [row for import_hash, row in unique.items() if import_hash not in existing]
+    if not new:
+        return 0
+    now = service._utcnow()
+    total = sum(row.amount_minor for row in new)
+    if not repo.apply_posting(user_id, account_id, total, now, entries=len(new)):
+        raise errors.AccountNotFound
+    repo.insert_entries(
+        [
+            {
+                "account_id": account_id,
+                "user_id": user_id,
+                "amount_minor": row.amount_minor,
+                "description": row.description,
+                "occurred_on": row.occurred_on,
+                "created_at": now,
+                "import_hash": row.import_hash,
+            }
+            for row in new
+        ]
+    )
+    repo.add_to_rollups(
+        user_id, service.rollup_deltas((row.occurred_on, None, row.amount_minor) for row in new)
+    )
+    return len(new)
+
+
+def _write_batch(engine: Engine, user_id: UUID, account_id: int, batch: list[ImportRow]) -> int:
+    try:
+        return _commit_batch(engine, user_id, account_id, batch)
+    except IntegrityError:
+        # A concurrent import of the same statement committed some of these
+        # rows first; in a new transaction the lookup sees them.
+        return _commit_batch(engine, user_id, account_id, batch)
+
+
+def _commit_batch(engine: Engine, user_id: UUID, account_id: int, batch: list[ImportRow]) -> int:
+    with Session(engine) as db:
+        inserted = import_batch(SqlLedgerRepository(db), user_id, account_id, batch)
+        db.commit()
+    return inserted
+
+
+class _Occurrences:
+    """Numbers identical rows within a run of rows sharing a date."""
+
+    def __init__(self) -> None:
+        self._day: date | None = None
+        self._seen: dict[tuple[int, str], int] = {}
+
+    def next(self, occurred_on: date, amount_minor: int, description: str) -> int:
+        if occurred_on != self._day:
+            self._day = occurred_on
+            self._seen.clear()
+        key = (amount_minor, description)
+        count = self._seen.get(key, 0)
+        self._seen[key] = count + 1
+        return count
+
+
+def _import_row(
+    row: int, fields: dict[str, Any], occurrences: _Occurrences, fitid: str | None = None
+) -> ImportRow | RowError:
+    fields["description"] = fields["description"].strip()[:_DESCRIPTION_MAX]
+    try:
+        entry = EntryIn.model_validate(fields)
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        name = _FIELD_NAMES.get(str(error["loc"][0]), str(error["loc"][0]))
+        return RowError(row, f"{name}: {error['msg']}")
+    amount_minor = service.to_minor(entry.amount)
+    if fitid:
+        key = f"fitid|{fitid}"
+    else:
+        occurrence = occurrences.next(entry.occurred_on, amount_minor, entry.description)
+        key = f"{entry.occurred_on.isoformat()}|{amount_minor}|{entry.description}|{occurrence}"
+    return ImportRow(
+        occurred_on=entry.occurred_on,
+        amount_minor=amount_minor,
+        description=entry.description,
+        import_hash=hashlib.sha256(key.encode("utf-8")).digest(),
+    )
+
+
+def _ofx_elements(texts: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """``(TAG, value)`` pairs; closing tags come through as ``/TAG``.
+
+    The stream is split on ``<`` rather than on lines, since OFX 1.x files
+    are often a single line.
+    """
+    pending = ""
+    for text in texts:
+        *complete, pending = (pending + text).split("<")
+        if len(pending) > _OFX_MAX_ELEMENT:
+            raise errors.InvalidImportFile("The file is not OFX.")
+        for token in complete:
+            yield from _ofx_element(token)
+    yield from _ofx_element(pending)
+
+
+def _ofx_element(token: str) -> Iterator[tuple[str, str]]:
+    name, closed, value = token.partition(">")
+    if closed:
+        yield name.strip().upper(), html.unescape(value.strip())
+
+
+def _ofx_row(
+    position: int, transaction: dict[str, str], occurrences: _Occurrences
+) -> ImportRow | RowError:
+    posted = transaction.get("DTPOSTED", "")
+    if len(posted) >= 8 and posted[:8].isdigit():
+        posted = f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}"
+    fields = {
+        "occurred_on": posted,
+        "amount": transaction.get("TRNAMT", "").replace(",", "."),
+        "description": transaction.get("NAME") or transaction.get("MEMO", ""),
+    }
+    return _import_row(position, fields, occurrences, fitid=transaction.get("FITID"))
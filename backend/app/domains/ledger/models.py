@@ -0,0 +1,114 @@
+"""Ledger persistence models."""
+
+from datetime import date, datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import BINARY, BigInteger, Column, ForeignKey, Index, Integer
+from sqlmodel import Field, SQLModel
+
+# Registers the "user" table that the user_id foreign keys below point at.
+import app.domains.auth.models  # noqa: F401
+
+_BIGINT = BigInteger().with_variant(Integer, "sqlite")
+
+
+class Account(SQLModel, table=True):
+    """A user's money container, with its balance kept current.
+
+    ``balance_minor`` and ``entry_count`` are the running totals of the
+    account's ledger entries. Every posting adds to them in the same
+    transaction that inserts the entry, so reading a balance is one row,
+    never a SUM over the history.
+    """
+
+    __tablename__ = "ledger_account"
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column(_BIGINT, primary_key=True, autoincrement=True),
+    )
+    user_id: UUID = Field(foreign_key="user.id", index=True)
+    name: str = Field(max_length=100)
+    account_type: str = Field(max_length=20)
+    balance_minor: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    entry_count: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class Category(SQLModel, table=True):
+    """A user's spending or income category, with the amount budgeted for it each month."""
+
+    __tablename__ = "ledger_category"
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column(_BIGINT, primary_key=True, autoincrement=True),
+    )
+    user_id: UUID = Field(foreign_key="user.id", index=True)
+    name: str = Field(max_length=100)
+    category_type: str = Field(max_length=20)
+    monthly_budget_minor: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class LedgerEntry(SQLModel, table=True):
+    """One posting to an account, in minor units (cents). Rows are never
+    updated or deleted; a correction is a new entry that ``reverses`` it.
+
+    Imported entries carry ``import_hash``, unique per account, so importing
+    the same statement twice adds nothing the second time.
+    ``(account_id, occurred_on, id)`` backs keyset pagination of an account's entries.
+    """
+
+    __tablename__ = "ledger_entry"
+    __table_args__ = (
+        Index("ix_ledger_entry_account_id_occurred_on", "account_id", "occurred_on", "id"),
+        Index("ix_ledger_entry_account_id_import_hash", "account_id", "import_hash", unique=True),
+    )
+
+    id: int | None = Field(
+        default=None,
+        sa_column=Column(_BIGINT, primary_key=True, autoincrement=True),
+    )
+    account_id: int = Field(
+        sa_column=Column(_BIGINT, ForeignKey("ledger_account.id"), nullable=False)
+    )
+    user_id: UUID = Field(foreign_key="user.id", index=True)
+    amount_minor: int = Field(sa_column=Column(BigInteger, nullable=False))
+    description: str = Field(default="", max_length=255)
+    occurred_on: date
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    reverses_id: int | None = Field(
+        default=None,
+        sa_column=Column(_BIGINT, ForeignKey("ledger_entry.id"), nullable=True, unique=True),
+    )
+    import_hash: bytes | None = Field(
+        default=None, sa_column=Column(BINARY(32), nullable=True)
+    )
+    category_id: int | None = Field(
+        default=None,
+        sa_column=Column(_BIGINT, ForeignKey("ledger_category.id"), nullable=True),
+    )
+
+
+class MonthlyRollup(SQLModel, table=True):
+    """Totals of a user's entries per calendar month and category.
+
+    Every posting adds to its row in the same transaction, like the account
+    balance, so reports read one row per month and category instead of the
+    entries. ``category_id`` 0 collects uncategorized entries, opening
+    balances among them. ``outflow_minor`` is the (negative) sum of the
+    negative amounts.
+    """
+
+    __tablename__ = "ledger_monthly_rollup"
+
+    user_id: UUID = Field(foreign_key="user.id", primary_key=True)
+    month: date = Field(primary_key=True)
+    category_id: int = Field(
+        sa_column=Column(_BIGINT, primary_key=True, autoincrement=False)
+    )
+    inflow_minor: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    outflow_minor: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    entry_count: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
@@ -0,0 +1,125 @@
+"""Monthly reports for the dashboard and budget views, read from the rollups.
+
+A report covers whole months. Each month lists the categories that had
+entries in it or carry a budget, their actual amounts against the budget,
+the month's inflow and outflow, and the user's running net across their
+whole history. It costs three queries however many entries the months hold.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID
+
+from app.domains.ledger import errors
+from app.domains.ledger.models import MonthlyRollup
+from app.domains.ledger.service import LedgerRepository, month_of
+
+REPORT_MONTHS_DEFAULT = 12
+REPORT_MONTHS_MAX = 60
+UNCATEGORIZED_NAME = "Uncategorized"
+
+
+@dataclass(frozen=True)
+class CategoryMonth:
+    """One category in one month; ``remaining_minor`` is what is left of its budget."""
+
+    category_id: int | None
+    name: str
+    inflow_minor: int
+    outflow_minor: int
+    budget_minor: int
+
+    @property
+    def net_minor(self) -> int:
+        return self.inflow_minor + self.outflow_minor
+
+    @property
+    def remaining_minor(self) -> int:
+        return self.budget_minor + self.net_minor
+
+
+@dataclass(frozen=True)
+class MonthReport:
+    month: date
+    inflow_minor: int
+    outflow_minor: int
+    running_net_minor: int
+    categories: list[CategoryMonth]
+
+    @property
+    def net_minor(self) -> int:
+        return self.inflow_minor + self.outflow_minor
+
+
+@dataclass(frozen=True)
+class Report:
+    """``opening_net_minor`` is the net of every entry before ``start``."""
+
+    start: date
+    end: date
+    opening_net_minor: int
+    months: list[MonthReport]
+
+
+def add_months(month: date, count: int) -> date:
+    """The first day of the month ``count`` months after ``month``'s."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range(start: date, end: date) -> list[date]:
+    """First days of the months from ``start`` to ``end`` inclusive."""
+    span = (end.year - start.year) * 12 + end.month - start.month
+    return [add_months(start, offset) for offset in range(span + 1)]
+
+
+def monthly_report(repo: LedgerRepository, user_id: UUID, start: date, end: date) -> Report:
+    """Spend per category per month, budget versus actual, and the running net."""
+    months = month_range(month_of(start), month_of(end))
+    if not months:
+        raise errors.InvalidReportRange("The report must end in or after its first month.")
+    if len(months) > REPORT_MONTHS_MAX:
+        raise errors.InvalidReportRange(f"A report covers at most {REPORT_MONTHS_MAX} months.")
+
+    categories = repo.list_categories(user_id)
+    by_month: dict[date, dict[int, MonthlyRollup]] = {}
+    for rollup in repo.list_rollups(user_id, months[0], months[-1]):
+        by_month.setdefault(rollup.month, {})[rollup.category_id] = rollup
+    opening = running = repo.net_before(user_id, months[0])
+
+    reports = []
+    for month in months:
+        rollups = by_month.get(month, {})
+        lines = []
+        for category in categories:
+            assert category.id is not None
+            actual = rollups.get(category.id)
+            if actual is None and not category.monthly_budget_minor:
+                continue
+            lines.append(
+                CategoryMonth(
+                    category_id=category.id,
+                    name=category.name,
+                    inflow_minor=actual.inflow_minor if actual else 0,
+                    outflow_minor=actual.outflow_minor if actual else 0,
+                    budget_minor=category.monthly_budget_minor,
+                )
+            )
+        uncategorized = rollups.get(0)
+        if uncategorized is not None:
+            lines.append(
+                CategoryMonth(
+                    category_id=None,
+                    name=UNCATEGORIZED_NAME,
+                    inflow_minor=uncategorized.inflow_minor,
+                    outflow_minor=uncategorized.outflow_minor,
+                    budget_minor=0,
+                )
+            )
+        inflow = sum(rollup.inflow_minor for rollup in rollups.values())
+        outflow = sum(rollup.outflow_minor for rollup in rollups.values())
+        running += inflow + outflow
+        reports.append(MonthReport(month, inflow, outflow, running, lines))
+    return Report(months[0], months[-1], opening, reports)
@@ -0,0 +1,226 @@
+"""Ledger repository implementation."""
+
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, func, insert, union
+from sqlmodel import Session, col, exists, select, update
+
+from app.db.pagination import keyset_before
+from app.db.upsert import insert_or_add
+from app.domains.ledger.models import Account, Category, LedgerEntry, MonthlyRollup
+from app.domains.ledger.service import (
+    BalanceTotals,
+    EntryCursor,
+    LedgerRepository,
+    RollupDelta,
+)
+
+
+class SqlLedgerRepository(LedgerRepository):
+    """SQLModel-backed ledger repository.
+
+    The only statements that touch existing rows are the relative balance
+    update in ``apply_posting`` and ``set_totals`` for repairs; entries are
+    only ever inserted, one at a time or in ``insert_entries`` batches.
+    Monthly rollups only ever have deltas added to them.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def add_account(self, account: Account) -> None:
+        self._session.add(account)
+
+    def flush(self) -> None:
+        self._session.flush()
+
+    def find_account(self, user_id: UUID, account_id: int) -> Account | None:
+        return self._session.exec(
+            select(Account).where(Account.id == account_id, Account.user_id == user_id)
+        ).first()
+
+    def list_accounts(self, user_id: UUID) -> list[Account]:
+        return list(
+            self._session.exec(
+                select(Account).where(Account.user_id == user_id).order_by(col(Account.id))
+            ).all()
+        )
+
+    def add_entry(self, entry: LedgerEntry) -> None:
+        self._session.add(entry)
+
+    def apply_posting(
+        self,
+        user_id: UUID,
+        account_id: int,
+        amount_minor: int,
+        posted_at: datetime,
+        entries: int = 1,
+    ) -> bool:
+        result = self._session.exec(
+            update(Account)
+            .where(col(Account.id) == account_id, col(Account.user_id) == user_id)
+            .values(
+                balance_minor=col(Account.balance_minor) + amount_minor,
+                entry_count=col(Account.entry_count) + entries,
+                updated_at=posted_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    def insert_entries(self, rows: list[dict[str, Any]]) -> None:
+        # A Core insert with a list of parameter sets is one executemany
+        # (batched multi-row VALUES on MySQL), with no ORM objects built.
+        self._session.connection().execute(insert(LedgerEntry), rows)
+
+    def existing_import_hashes(self, account_id: int, hashes: list[bytes]) -> set[bytes]:
+        rows = self._session.exec(
+            select(LedgerEntry.import_hash).where(
+                LedgerEntry.account_id == account_id,
+                col(LedgerEntry.import_hash).in_(hashes),
+            )
+        ).all()
+        return {row for row in rows if row is not None}
+
+    def add_to_rollups(self, user_id: UUID, deltas: list[RollupDelta]) -> None:
+        insert_or_add(
+            self._session.connection(),
+            MonthlyRollup.__table__,  # type: ignore[attr-defined]
+            ("user_id", "month", "category_id"),
+            [
+                {
+                    "user_id": user_id,
+                    "month": delta.month,
+                    "category_id": delta.category_id,
+                    "inflow_minor": delta.inflow_minor,
+                    "outflow_minor": delta.outflow_minor,
+                    "entry_count": delta.entry_count,
+                }
+                for delta in deltas
+            ],
+        )
+
+    def add_category(self, category: Category) -> None:
+        self._session.add(category)
+
+    def find_category(self, user_id: UUID, category_id: int) -> Category | None:
+        return self._session.exec(
+            select(Category).where(Category.id == category_id, Category.user_id == user_id)
+        ).first()
+
+    def list_categories(self, user_id: UUID) -> list[Category]:
+        return list(
+            self._session.exec(
+                select(Category).where(Category.user_id == user_id).order_by(col(Category.id))
+            ).all()
+        )
+
+    def list_rollups(
+        self, user_id: UUID, start: date, end: date, lock: bool = False
+    ) -> list[MonthlyRollup]:
+        statement = (
+            select(MonthlyRollup)
+            .where(
+                MonthlyRollup.user_id == user_id,
+                col(MonthlyRollup.month) >= start,
+                col(MonthlyRollup.month) <= end,
+            )
+            .order_by(col(MonthlyRollup.month), col(MonthlyRollup.category_id))
+        )
+        if lock:
+            statement = statement.with_for_update()
+        return list(self._session.exec(statement).all())
+
+    def rollup_user_ids(self) -> list[UUID]:
+        statement = union(
+            select(LedgerEntry.user_id).distinct(), select(MonthlyRollup.user_id).distinct()
+        )
+        return [user_id for (user_id,) in self._session.connection().execute(statement)]
+
+    def set_rollups(self, user_id: UUID, rollups: list[RollupDelta]) -> None:
+        self._session.exec(
+            delete(MonthlyRollup)
+            .where(col(MonthlyRollup.user_id) == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        self.add_to_rollups(user_id, rollups)
+
+    def net_before(self, user_id: UUID, month: date) -> int:
+        net = self._session.exec(
+            select(
+                func.sum(col(MonthlyRollup.inflow_minor) + col(MonthlyRollup.outflow_minor))
+            ).where(MonthlyRollup.user_id == user_id, col(MonthlyRollup.month) < month)
+        ).one()
+        return int(net or 0)
+
+    def find_entry(
+        self, user_id: UUID, entry_id: int, lock: bool = False
+    ) -> LedgerEntry | None:
+        statement = select(LedgerEntry).where(
+            LedgerEntry.id == entry_id, LedgerEntry.user_id == user_id
+        )
+        if lock:
+            statement = statement.with_for_update()
+        return self._session.exec(statement).first()
+
+    def is_reversed(self, entry_id: int) -> bool:
+        return bool(
+            self._session.exec(
+                select(exists().where(col(LedgerEntry.reverses_id) == entry_id))
+            ).one()
+        )
+
+    def list_entries(
+        self, account_id: int, limit: int, after: EntryCursor | None = None
+    ) -> list[LedgerEntry]:
+        # Served by the (account_id, occurred_on, id) index.
+        order = (col(LedgerEntry.occurred_on), col(LedgerEntry.id))
+        statement = select(LedgerEntry).where(LedgerEntry.account_id == account_id)
+        if after is not None:
+            statement = statement.where(keyset_before(order, after))
+        statement = statement.order_by(*(column.desc() for column in order)).limit(limit)
+        return list(self._session.exec(statement).all())
+
+    def stored_totals(
+        self, after_account_id: int, limit: int, lock: bool = False
+    ) -> dict[int, BalanceTotals]:
+        statement = (
+            select(Account.id, Account.balance_minor, Account.entry_count)
+            .where(col(Account.id) > after_account_id)
+            .order_by(col(Account.id))
+            .limit(limit)
+        )
+        if lock:
+            statement = statement.with_for_update()
+        rows = self._session.exec(statement).all()
+        return {
+            account_id: BalanceTotals(balance_minor, entry_count)
+            for account_id, balance_minor, entry_count in rows
+            if account_id is not None
+        }
+
+    def rebuilt_totals(self, account_ids: list[int]) -> dict[int, BalanceTotals]:
+        rows = self._session.exec(
+            select(
+                LedgerEntry.account_id,
+                func.sum(LedgerEntry.amount_minor),
+                func.count(),
+            )
+            .where(col(LedgerEntry.account_id).in_(account_ids))
+            .group_by(col(LedgerEntry.account_id))
+        ).all()
+        return {
+            account_id: BalanceTotals(int(balance_minor), int(entry_count))
+            for account_id, balance_minor, entry_count in rows
+        }
+
+    def set_totals(self, account_id: int, totals: BalanceTotals) -> None:
+        self._session.exec(
+            update(Account)
+            .where(col(Account.id) == account_id)
+            .values(balance_minor=totals.balance_minor, entry_count=totals.entry_count)
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,129 @@
+"""Ledger API schemas.
+
+Amounts travel as decimals with two places and are stored as integer
+minor units (cents).
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+AccountType = Literal["cash", "monthly", "savings"]
+
+
+class AccountIn(BaseModel):
+    """New account; a non-zero ``opening_balance`` is posted as its first entry."""
+
+    name: str = Field(min_length=1, max_length=100)
+    account_type: AccountType
+    opening_balance: Decimal = Field(default=Decimal("0"), max_digits=15, decimal_places=2)
+
+
+class AccountOut(BaseModel):
+    """An account with its current balance."""
+
+    id: int
+    name: str
+    account_type: AccountType
+    balance: Decimal
+    entry_count: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class CategoryIn(BaseModel):
+    """New category; ``monthly_budget`` is compared with its actual amount each month."""
+
+    name: str = Field(min_length=1, max_length=100)
+    category_type: AccountType
+    monthly_budget: Decimal = Field(default=Decimal("0"), ge=0, max_digits=15, decimal_places=2)
+
+
+class CategoryOut(BaseModel):
+    id: int
+    name: str
+    category_type: AccountType
+    monthly_budget: Decimal
+    created_at: datetime
+
+
+class EntryIn(BaseModel):
+    """A posting: positive amounts add to the balance, negative ones subtract."""
+
+    amount: Decimal = Field(max_digits=15, decimal_places=2)
+    description: str = Field(default="", max_length=255)
+    occurred_on: date
+    category_id: int | None = None
+
+
+class EntryOut(BaseModel):
+    """One ledger entry; ``reverses_id`` is set on entries that undo another."""
+
+    id: int
+    account_id: int
+    amount: Decimal
+    description: str
+    occurred_on: date
+    created_at: datetime
+    reverses_id: int | None
+    category_id: int | None
+
+
+class EntryPageOut(BaseModel):
+    """A page of entries, newest first; ``next_cursor`` is None on the last page."""
+
+    entries: list[EntryOut]
+    next_cursor: str | None
+
+
+class ImportErrorOut(BaseModel):
+    """A rejected import row: the CSV line, or the OFX transaction's position."""
+
+    row: int
+    message: str
+
+
+class ImportOut(BaseModel):
+    """Outcome of an import; ``errors`` lists only the first few rejected rows."""
+
+    rows: int
+    inserted: int
+    duplicates: int
+    invalid: int
+    batches: int
+    errors: list[ImportErrorOut]
+    duration_seconds: float
+    rows_per_second: float
+
+
+class CategoryMonthOut(BaseModel):
+    """A category's month: ``net`` is inflow plus (negative) outflow, ``remaining`` is
+    the budget plus ``net``. ``category_id`` is None for uncategorized entries."""
+
+    category_id: int | None
+    name: str
+    inflow: Decimal
+    outflow: Decimal
+    net: Decimal
+    budget: Decimal
+    remaining: Decimal
+
+
+class MonthReportOut(BaseModel):
+    """One month; ``running_net`` is the net of every entry up to its end."""
+
+    month: str
+    inflow: Decimal
+    outflow: Decimal
+    net: Decimal
+    running_net: Decimal
+    categories: list[CategoryMonthOut]
+
+
+class ReportOut(BaseModel):
+    start: str
+    end: str
+    opening_net: Decimal
+    months: list[MonthReportOut]
@@ -0,0 +1,408 @@
+"""Ledger domain service layer.
+
+Entries are append-only. Posting one adds its amount to the account's
+running balance with a relative ``UPDATE`` in the same transaction, so
+concurrent postings to one account serialize on its row and never lose
+an update. The same transaction adds it to the user's monthly rollup for
+its category. ``check_balances`` recomputes the totals from the entries to
+prove the two never drift apart.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from collections.abc import Iterable
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+
+from app.db.pagination import split_page
+from app.domains.ledger import errors
+from app.domains.ledger.models import Account, Category, LedgerEntry, MonthlyRollup
+
+ENTRY_PAGE_MAX = 100
+OPENING_BALANCE_DESCRIPTION = "Opening balance"
+
+_CENTS = Decimal("0.01")
+
+
+EntryCursor = tuple[date, int]
+"""``(occurred_on, id)`` of the last entry on a page."""
+
+
+@dataclass(frozen=True)
+class EntryPage:
+    """A page of an account's entries, newest first."""
+
+    entries: list[LedgerEntry]
+    next_after: EntryCursor | None
+
+
+@dataclass(frozen=True)
+class RollupDelta:
+    """What a set of postings adds to one monthly rollup row."""
+
+    month: date
+    category_id: int
+    inflow_minor: int
+    outflow_minor: int
+    entry_count: int
+
+
+@dataclass(frozen=True)
+class BalanceTotals:
+    balance_minor: int
+    entry_count: int
+
+
+@dataclass(frozen=True)
+class BalanceMismatch:
+    """An account whose stored totals differ from the totals of its entries."""
+
+    account_id: int
+    stored: BalanceTotals
+    rebuilt: BalanceTotals
+
+
+@dataclass(frozen=True)
+class BalanceCheck:
+    """One batch of the consistency check; ``last_account_id`` is None past the end."""
+
+    checked: int
+    last_account_id: int | None
+    mismatches: list[BalanceMismatch]
+
+
+class LedgerRepository:
+    """Persistence boundary for ledger operations."""
+
+    def add_account(self, account: Account) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def flush(self) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def find_account(self, user_id: UUID, account_id: int) -> Account | None:  # pragma: no cover
+        raise NotImplementedError
+
+    def list_accounts(self, user_id: UUID) -> list[Account]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def add_entry(self, entry: LedgerEntry) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def apply_posting(
+        self,
+        user_id: UUID,
+        account_id: int,
+        amount_minor: int,
+        posted_at: datetime,
+        entries: int = 1,
+    ) -> bool:  # pragma: no cover - interface
+        """Add ``entries`` postings totalling ``amount_minor`` to the account's totals.
+
+        Returns False if the user has no such account.
+        """
+        raise NotImplementedError
+
+    def insert_entries(self, rows: list[dict[str, Any]]) -> None:  # pragma: no cover - interface
+        """Insert many entries in one executemany; rows are ``LedgerEntry`` column dicts."""
+        raise NotImplementedError
+
+    def existing_import_hashes(
+        self, account_id: int, hashes: list[bytes]
+    ) -> set[bytes]:  # pragma: no cover - interface
+        """The subset of ``hashes`` already imported into the account."""
+        raise NotImplementedError
+
+    def add_to_rollups(
+        self, user_id: UUID, deltas: list[RollupDelta]
+    ) -> None:  # pragma: no cover - interface
+        """Add each delta to its rollup row, creating rows that do not exist yet."""
+        raise NotImplementedError
+
+    def add_category(self, category: Category) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def find_category(
+        self, user_id: UUID, category_id: int
+    ) -> Category | None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def list_categories(self, user_id: UUID) -> list[Category]:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def list_rollups(
+        self, user_id: UUID, start: date, end: date, lock: bool = False
+    ) -> list[MonthlyRollup]:  # pragma: no cover - interface
+        """The user's rollup rows for months from ``start`` to ``end`` inclusive.
+
+        With ``lock`` the rows, and the gaps between them, stay locked until
+        commit, which holds back the user's postings to those months.
+        """
+        raise NotImplementedError
+
+    def rollup_user_ids(self) -> list[UUID]:  # pragma: no cover - interface
+        """Users with entries or rollup rows."""
+        raise NotImplementedError
+
+    def set_rollups(
+        self, user_id: UUID, rollups: list[RollupDelta]
+    ) -> None:  # pragma: no cover - interface
+        """Replace all of the user's rollup rows."""
+        raise NotImplementedError
+
+    def net_before(self, user_id: UUID, month: date) -> int:  # pragma: no cover - interface
+        """Net of all the user's entries in months before ``month``."""
+        raise NotImplementedError
+
+    def find_entry(
+        self, user_id: UUID, entry_id: int, lock: bool = False
+    ) -> LedgerEntry | None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def is_reversed(self, entry_id: int) -> bool:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def list_entries(
+        self, account_id: int, limit: int, after: EntryCursor | None = None
+    ) -> list[LedgerEntry]:  # pragma: no cover - interface
+        """Up to ``limit`` entries ordered by ``(occurred_on, id)`` descending, after the cursor."""
+        raise NotImplementedError
+
+    def stored_totals(
+        self, after_account_id: int, limit: int, lock: bool = False
+    ) -> dict[int, BalanceTotals]:  # pragma: no cover - interface
+        """Stored totals of the next ``limit`` accounts by id, across all users.
+
+        With ``lock`` the account rows stay locked until commit, which holds
+        back postings to them.
+        """
+        raise NotImplementedError
+
+    def rebuilt_totals(
+        self, account_ids: list[int]
+    ) -> dict[int, BalanceTotals]:  # pragma: no cover - interface
+        """Totals summed from the entries; accounts without entries are absent."""
+        raise NotImplementedError
+
+    def set_totals(self, account_id: int, totals: BalanceTotals) -> None:  # pragma: no cover
+        raise NotImplementedError
+
+
+def to_minor(amount: Decimal) -> int:
+    """Convert a two-place decimal amount to minor units."""
+    return int(amount.quantize(_CENTS).scaleb(2))
+
+
+def from_minor(amount_minor: int) -> Decimal:
+    return Decimal(amount_minor).scaleb(-2)
+
+
+def month_of(day: date) -> date:
+    return day.replace(day=1)
+
+
+def rollup_deltas(postings: Iterable[tuple[date, int | None, int]]) -> list[RollupDelta]:
+    """Fold ``(occurred_on, category_id, amount_minor)`` postings into rollup deltas."""
+    totals: dict[tuple[date, int], list[int]] = {}
+    for occurred_on, category_id, amount_minor in postings:
+        total = totals.setdefault((month_of(occurred_on), category_id or 0), [0, 0, 0])
+        total[0 if amount_minor > 0 else 1] += amount_minor
+        total[2] += 1
+    return [
+        RollupDelta(month, category_id, inflow, outflow, count)
+        for (month, category_id), (inflow, outflow, count) in totals.items()
+    ]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """MySQL returns naive datetimes; treat them as UTC."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def create_account(
+    repo: LedgerRepository,
+    user_id: UUID,
+    name: str,
+    account_type: str,
+    opening_balance_minor: int = 0,
+) -> Account:
+    """Create an account; a non-zero opening balance becomes its first entry."""
+    now = _utcnow()
+    account = Account(
+        user_id=user_id,
+        name=name.strip(),
+        account_type=account_type,
+        balance_minor=opening_balance_minor,
+        entry_count=1 if opening_balance_minor else 0,
+        created_at=now,
+        updated_at=now,
+    )
+    repo.add_account(account)
+    repo.flush()
+    if opening_balance_minor:
+        assert account.id is not None
+        repo.add_entry(
+            LedgerEntry(
+                account_id=account.id,
+                user_id=user_id,
+                amount_minor=opening_balance_minor,
+                description=OPENING_BALANCE_DESCRIPTION,
+                occurred_on=now.date(),
+                created_at=now,
+            )
+        )
+        repo.add_to_rollups(user_id, rollup_deltas([(now.date(), None, opening_balance_minor)]))
+    return account
+
+
+def create_category(
+    repo: LedgerRepository,
+    user_id: UUID,
+    name: str,
+    category_type: str,
+    monthly_budget_minor: int = 0,
+) -> Category:
+    category = Category(
+        user_id=user_id,
+        name=name.strip(),
+        category_type=category_type,
+        monthly_budget_minor=monthly_budget_minor,
+        created_at=_utcnow(),
+    )
+    repo.add_category(category)
+    repo.flush()
+    return category
+
+
+def list_categories(repo: LedgerRepository, user_id: UUID) -> list[Category]:
+    return repo.list_categories(user_id)
+
+
+def get_account(repo: LedgerRepository, user_id: UUID, account_id: int) -> Account:
+    account = repo.find_account(user_id, account_id)
+    if account is None:
+        raise errors.AccountNotFound
+    return account
+
+
+def list_accounts(repo: LedgerRepository, user_id: UUID) -> list[Account]:
+    """The user's accounts with their balances, one query, oldest first."""
+    return repo.list_accounts(user_id)
+
+
+def post_entry(
+    repo: LedgerRepository,
+    user_id: UUID,
+    account_id: int,
+    amount_minor: int,
+    occurred_on: date,
+    description: str = "",
+    reverses_id: int | None = None,
+    category_id: int | None = None,
+) -> LedgerEntry:
+    """Append an entry and move the account's balance and monthly rollup by its amount.
+
+    The balance update runs first so it doubles as the account ownership
+    check and takes the account's row lock before the insert.
+    """
+    if category_id is not None and repo.find_category(user_id, category_id) is None:
+        raise errors.CategoryNotFound
+    now = _utcnow()
+    if not repo.apply_posting(user_id, account_id, amount_minor, now):
+        raise errors.AccountNotFound
+    entry = LedgerEntry(
+        account_id=account_id,
+        user_id=user_id,
+        amount_minor=amount_minor,
+        description=description,
+        occurred_on=occurred_on,
+        created_at=now,
+        reverses_id=reverses_id,
+        category_id=category_id,
+    )
+    repo.add_entry(entry)
+    repo.add_to_rollups(user_id, rollup_deltas([(occurred_on, category_id, amount_minor)]))
+    repo.flush()
+    return entry
+
+
+def reverse_entry(repo: LedgerRepository, user_id: UUID, entry_id: int) -> LedgerEntry:
+    """Post the opposite of an entry; each entry can be reversed once.
+
+    The original is locked so concurrent reversals queue up. One that still
+    reads a stale snapshot, or runs where there is no row locking (SQLite),
+    hits the unique ``reverses_id`` instead and is rejected the same way.
+    """
+    entry = repo.find_entry(user_id, entry_id, lock=True)
+    if entry is None:
+        raise errors.EntryNotFound
+    if entry.reverses_id is not None or repo.is_reversed(entry_id):
+        raise errors.EntryAlreadyReversed
+    try:
+        return post_entry(
+            repo,
+            user_id,
+            entry.account_id,
+            -entry.amount_minor,
+            occurred_on=_utcnow().date(),
+            description=f"Reversal of entry {entry_id}",
+            reverses_id=entry_id,
+            category_id=entry.category_id,
+        )
+    except IntegrityError as exc:
+        raise errors.EntryAlreadyReversed from exc
+
+
+def list_entries(
+    repo: LedgerRepository,
+    user_id: UUID,
+    account_id: int,
+    limit: int = 50,
+    after: EntryCursor | None = None,
+) -> EntryPage:
+    """Return one page of the account's entries, latest ``occurred_on`` first."""
+    get_account(repo, user_id, account_id)
+    limit = max(1, min(limit, ENTRY_PAGE_MAX))
+    rows = repo.list_entries(account_id, limit + 1, after)
+    entries, next_after = split_page(rows, limit, entry_cursor)
+    return EntryPage(entries=entries, next_after=next_after)
+
+
+def entry_cursor(entry: LedgerEntry) -> EntryCursor:
+    assert entry.id is not None
+    return entry.occurred_on, entry.id
+
+
+def check_balances(
+    repo: LedgerRepository, after_account_id: int, limit: int, repair: bool = False
+) -> BalanceCheck:
+    """Compare the next ``limit`` accounts' stored totals with their entries.
+
+    With ``repair`` the stored totals of mismatched accounts are overwritten
+    with the rebuilt ones.
+    """
+    stored = repo.stored_totals(after_account_id, limit, lock=repair)
+    if not stored:
+        return BalanceCheck(checked=0, last_account_id=None, mismatches=[])
+    rebuilt = repo.rebuilt_totals(list(stored))
+    empty = BalanceTotals(balance_minor=0, entry_count=0)
+    mismatches = [
+        BalanceMismatch(account_id, totals, rebuilt.get(account_id, empty))
+        for account_id, totals in stored.items()
+        if totals != rebuilt.get(account_id, empty)
+    ]
+    if repair:
+        for mismatch in mismatches:
+            repo.set_totals(mismatch.account_id, mismatch.rebuilt)
+    return BalanceCheck(checked=len(stored), last_account_id=max(stored), mismatches=mismatches)
@@ -1,30 +1,207 @@
-"""FastAPI application entrypoint."""
+"""FastAPI application entrypoint.
 
+Importing this module is cheap: FastAPI, the database layer and the routers
+are imported, and settings read, only when ``create_app`` runs. Optional
+features (async stack, shared cache, admission control, profiling) import
+their modules only when enabled. ``app`` is built on first access so
+``uvicorn app.main:app`` keeps working; ``uvicorn --factory
+app.main:create_app`` builds it directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
 import logging
+import secrets
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
 
-from fastapi import FastAPI
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
-from app.api.router import api_router
-from app.db.init_db import init_db
-from app.core.config import Settings, get_settings
+    from app.core.config import Settings
 
 
 def create_app(settings: Settings | None = None) -> FastAPI:
+    from fastapi import FastAPI
+
+    from app.api.middleware.metrics import MetricsMiddleware
+    from app.api.middleware.query_stats import QueryStatsMiddleware
+    from app.api.conditional import cache_control
+    from app.api.problem_details import ProblemDetailsException, problem_details_handler
+    from app.api.router import build_api_router
+    from app.core.config import get_settings
+    from app.db.pagination import CursorCodec
+
     resolved_settings = settings or get_settings()
 
     logging.basicConfig(level=logging.INFO)
 
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        from app.db.init_db import init_db
+        from app.db.replicas import dispose_replicas, init_replicas, run_replica_health_checks
+        from app.db.session import dispose_engine, init_engine
+        from app.domains.auth.last_login import LastLoginBuffer, run_last_login_flusher
+
+        engine = init_engine(resolved_settings)
+        init_db(resolved_settings.db_schema_on_startup)
+        if resolved_settings.db_async:
+            from app.db.async_session import init_async_engine
+
+            init_async_engine(resolved_settings)
+
+        stop = asyncio.Event()
+        background: list[asyncio.Task[None]] = []
+        replica_set = init_replicas(resolved_settings)
+        if replica_set is not None:
+            await asyncio.to_thread(replica_set.check_health)
+            background.append(
+                asyncio.create_task(
+                    run_replica_health_checks(
+                        replica_set, resolved_settings.db_replica_health_interval_seconds, stop
+                    )
+                )
+            )
+        if resolved_settings.session_reaper_enabled:
+            from app.domains.auth.reaper import run_session_reaper
+
+            background.append(
+                asyncio.create_task(run_session_reaper(engine, resolved_settings, stop))
+            )
+        last_login_buffer: LastLoginBuffer | None = getattr(
+            _app.state, "last_login_buffer", None
+        )
+        if last_login_buffer is not None:
+            background.append(
+                asyncio.create_task(
+                    run_last_login_flusher(
+                        engine,
+                        last_login_buffer,
+                        resolved_settings.last_login_flush_interval_seconds,
+                        resolved_settings.last_login_flush_threshold,
+                        stop,
+                    )
+                )
+            )
+        session_tokens = getattr(_app.state, "session_tokens", None)
+        if session_tokens is not None:
+            from app.domains.auth.revocations import (
+                refresh_denylist_from_db,
+                run_denylist_refresher,
+            )
+
+            # Load revocations before serving so restarts never accept revoked tokens.
+            await asyncio.to_thread(refresh_denylist_from_db, engine, session_tokens.denylist)
+            background.append(
+                asyncio.create_task(
+                    run_denylist_refresher(
+                        engine,
+                        session_tokens.denylist,
+                        resolved_settings.session_denylist_refresh_seconds,
+                        stop,
+                    )
+                )
+            )
+        try:
+            yield
+        finally:
+            stop.set()
+            if last_login_buffer is not None:
+                last_login_buffer.request_flush()
+            try:
+                await asyncio.gather(*background)
+            finally:
+                if resolved_settings.db_async:
+                    from app.db.async_session import dispose_async_engine
+
+                    await dispose_async_engine()
+                dispose_replicas()
+                dispose_engine()
+
     app = FastAPI(
         title=resolved_settings.service_name,
         version=resolved_settings.version,
+        lifespan=lifespan,
+    )
+    app.include_router(build_api_router(resolved_settings))
+    app.add_exception_handler(ProblemDetailsException, problem_details_handler)
+    app.add_middleware(
+        QueryStatsMiddleware,
+        headers=resolved_settings.query_stats_headers,
+        warn_threshold=resolved_settings.query_stats_warn_threshold,
     )
-    app.include_router(api_router)
+    if resolved_settings.profiling_enabled:
+        from app.api.middleware.profiling import ProfilingMiddleware
+
+        secret = resolved_settings.profiling_secret
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=resolved_settings.profiling_dir,
+            sample_rate=resolved_settings.profiling_sample_rate,
+            secret=secret.get_secret_value().encode("utf-8") if secret is not None else None,
+            interval_seconds=resolved_settings.profiling_interval_seconds,
+            max_files=resolved_settings.profiling_max_files,
+        )
+    if resolved_settings.admission_control_enabled:
+        from app.api.middleware.admission import AdmissionControlMiddleware, build_gates
+
+        app.state.admission_gates = build_gates(resolved_settings.admission_groups)
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            gates=app.state.admission_gates,
+            queue_timeout_seconds=resolved_settings.admission_queue_timeout_seconds,
+            retry_after_seconds=resolved_settings.admission_retry_after_seconds,
+        )
+    app.add_middleware(MetricsMiddleware)
+    if resolved_settings.session_cache_enabled and resolved_settings.session_cache_shared:
+        from app.domains.auth.shared_cache import SharedSessionCache
+
+        app.state.session_cache = SharedSessionCache(
+            path=resolved_settings.session_cache_shared_path,
+            max_entries=resolved_settings.session_cache_max_entries,
+            ttl_seconds=resolved_settings.session_cache_ttl_seconds,
+        )
+    elif resolved_settings.session_cache_enabled:
+        from app.domains.auth.cache import SessionCache
 
-    @app.on_event("startup")
-    def on_startup() -> None:
-        init_db()
+        app.state.session_cache = SessionCache(
+            max_entries=resolved_settings.session_cache_max_entries,
+            ttl_seconds=resolved_settings.session_cache_ttl_seconds,
+        )
+    if resolved_settings.last_login_write_behind:
+        from app.domains.auth.last_login import LastLoginBuffer
+
+        app.state.last_login_buffer = LastLoginBuffer(
+            max_pending=resolved_settings.last_login_max_pending,
+            flush_threshold=resolved_settings.last_login_flush_threshold,
+        )
+    app.state.ledger_import_batch_size = resolved_settings.ledger_import_batch_size
+    app.state.read_cache_control = cache_control(resolved_settings.read_cache_max_age_seconds)
+    cursor_secret = resolved_settings.cursor_secret
+    app.state.cursor_codec = CursorCodec(
+        cursor_secret.get_secret_value().encode("utf-8")
+        if cursor_secret is not None
+        # Local only (see Settings): cursors from another process fail to verify.
+        else secrets.token_bytes(32)
+    )
+    if resolved_settings.internal_api_token is not None:
+        app.state.internal_api_token = resolved_settings.internal_api_token.get_secret_value()
+    if resolved_settings.session_token_mode == "signed":
+        from app.domains.auth.tokens import SignedSessionTokens
+
+        assert resolved_settings.session_token_secret is not None
+        app.state.session_tokens = SignedSessionTokens(
+            resolved_settings.session_token_secret.get_secret_value().encode("utf-8")
+        )
 
     return app
 
 
-app = create_app()
+def __getattr__(name: str) -> FastAPI:
+    """Build ``app`` on first access; later lookups find the module global."""
+    if name != "app":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    app = globals()["app"] = create_app()
+    return app
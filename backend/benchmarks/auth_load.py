@@ -0,0 +1,340 @@
+"""Load test for the auth endpoints.
+
+Replays a weighted mix of register/login/me/logout traffic against
+``create_app()`` and reports throughput and latency percentiles per route.
+
+Examples::
+
+    python -m benchmarks.auth_load --backend memory --requests 5000 --concurrency 64
+    python -m benchmarks.auth_load --backend sqlite --server uvicorn --workers 2
+    python -m benchmarks.auth_load --backend db --output bench.json --compare base.json
+
+Backends: ``memory`` swaps the auth repository for an in-memory fake (HTTP
+stack cost only), ``sqlite`` uses a throwaway SQLite file, and ``db`` uses
+the database configured through the usual ``BC_*`` settings. Any other
+``BC_*`` variable (cache, async stack, ...) applies as it would in production.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.auth import get_auth_repository, get_read_auth_repository
+from app.core.config import Settings
+from app.db.session import get_session
+from app.main import create_app
+from benchmarks.fakes import InMemoryAuthRepository, null_db_session
+
+BACKENDS = ("memory", "sqlite", "db")
+DEFAULT_MIX = {"register": 0.05, "login": 0.2, "me": 0.65, "logout": 0.1}
+EXPECTED_STATUS = {"register": 201, "login": 200, "me": 200, "logout": 204}
+
+
+@dataclass(frozen=True)
+class LoadConfig:
+    requests: int = 2000
+    concurrency: int = 32
+    mix: Mapping[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    seed: int = 1
+
+
+@dataclass
+class Samples:
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+
+    def record(self, route: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(route, []).append(seconds)
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolated percentile of an ascending list, ``q`` in [0, 100]."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize(samples: Samples, duration_seconds: float) -> dict[str, Any]:
+    routes: dict[str, Any] = {}
+    total = 0
+    for route, latencies in sorted(samples.latencies.items()):
+        ordered = sorted(latencies)
+        total += len(ordered)
+        routes[route] = {
+            "count": len(ordered),
+            "errors": samples.errors.get(route, 0),
+            "rps": len(ordered) / duration_seconds if duration_seconds else 0.0,
+            "mean_ms": 1000 * sum(ordered) / len(ordered),
+            "p50_ms": 1000 * percentile(ordered, 50),
+            "p95_ms": 1000 * percentile(ordered, 95),
+            "p99_ms": 1000 * percentile(ordered, 99),
+        }
+    return {
+        "routes": routes,
+        "total": {
+            "requests": total,
+            "errors": sum(samples.errors.values()),
+            "duration_s": duration_seconds,
+            "rps": total / duration_seconds if duration_seconds else 0.0,
+        },
+    }
+
+
+async def run_load(
+    client_factory: Callable[[], AbstractAsyncContextManager[httpx.AsyncClient]],
+    config: LoadConfig,
+) -> dict[str, Any]:
+    """Drive ``config.requests`` requests from ``config.concurrency`` virtual users.
+
+    Each virtual user owns its cookie jar: it registers once, then picks
+    operations from the mix. ``me``/``logout`` while logged out become a login.
+    """
+    samples = Samples()
+    remaining = config.requests
+    run_id = uuid4().hex[:8]
+    routes = list(config.mix)
+    weights = [config.mix[route] for route in routes]
+
+    async def call(client: httpx.AsyncClient, route: str, email: str) -> None:
+        start = time.perf_counter()
+        if route == "me":
+            response = await client.get("/auth/me")
+        elif route == "logout":
+            response = await client.post("/auth/logout")
+        else:
+            response = await client.post(f"/auth/{route}", json={"email": email})
+        samples.record(
+            route, time.perf_counter() - start, response.status_code == EXPECTED_STATUS[route]
+        )
+
+    async def virtual_user(index: int) -> None:
+        nonlocal remaining
+        rng = random.Random(config.seed * 100_003 + index)
+        registrations = 0
+        email = f"bench-{run_id}-{index}-0@example.com"
+        logged_in = False
+        async with client_factory() as client:
+            while remaining > 0:
+                remaining -= 1
+                route = "register" if registrations == 0 else rng.choices(routes, weights)[0]
+                if route in ("me", "logout") and not logged_in:
+                    route = "login"
+                if route == "register":
+                    email = f"bench-{run_id}-{index}-{registrations}@example.com"
+                    registrations += 1
+                await call(client, route, email)
+                logged_in = route != "logout"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i) for i in range(config.concurrency)))
+    return summarize(samples, time.perf_counter() - start)
+
+
+def build_app(backend: str, workdir: Path) -> FastAPI:
+    """Create the app for ``backend``; see the module docstring."""
+    if backend == "db":
+        return create_app(Settings())
+
+    settings = Settings(db_url=f"sqlite:///{workdir / 'bench.db'}")
+    app = create_app(settings)
+    if backend == "memory":
+        repo = InMemoryAuthRepository()
+        app.dependency_overrides[get_session] = null_db_session
+        app.dependency_overrides[get_auth_repository] = lambda: repo
+        app.dependency_overrides[get_read_auth_repository] = lambda: repo
+    return app
+
+
+def create_bench_app() -> FastAPI:
+    """App factory for ``uvicorn --factory`` runs, configured from env."""
+    workdir = Path(os.environ.get("BC_BENCH_WORKDIR", tempfile.gettempdir()))
+    return build_app(os.environ.get("BC_BENCH_BACKEND", "memory"), workdir)
+
+
+async def run_in_process(backend: str, config: LoadConfig) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as workdir:
+        app = build_app(backend, Path(workdir))
+        transport = httpx.ASGITransport(app=app)
+
+        @asynccontextmanager
+        async def client_factory() -> AsyncIterator[httpx.AsyncClient]:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                yield client
+
+        async with app.router.lifespan_context(app):
+            return await run_load(client_factory, config)
+
+
+async def run_under_uvicorn(backend: str, config: LoadConfig, workers: int) -> dict[str, Any]:
+    if backend == "memory" and workers > 1:
+        raise SystemExit("--backend memory keeps state per process; use --workers 1")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        port = _free_port()
+        env = {**os.environ, "BC_BENCH_BACKEND": backend, "BC_BENCH_WORKDIR": workdir}
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "benchmarks.auth_load:create_bench_app",
+                "--factory",
+                "--port",
+                str(port),
+                "--workers",
+                str(workers),
+                "--log-level",
+                "warning",
+            ],
+            env=env,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            await _wait_until_healthy(base_url, server)
+            limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+
+            @asynccontextmanager
+            async def client_factory() -> AsyncIterator[httpx.AsyncClient]:
+                async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+                    yield client
+
+            return await run_load(client_factory, config)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+async def _wait_until_healthy(base_url: str, server: subprocess.Popen[bytes]) -> None:
+    deadline = time.monotonic() + 30
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise SystemExit("uvicorn exited before becoming healthy")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise SystemExit("uvicorn did not become healthy within 30s")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_mix(raw: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in raw.split(","):
+        route, _, weight = part.partition("=")
+        if route not in EXPECTED_STATUS:
+            raise argparse.ArgumentTypeError(f"unknown route {route!r}")
+        mix[route] = float(weight)
+    return mix
+
+
+def print_report(report: dict[str, Any], baseline: dict[str, Any] | None = None) -> None:
+    header = f"{'route':<10}{'count':>8}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    for route, stats in report["routes"].items():
+        line = (
+            f"{route:<10}{stats['count']:>8}{stats['errors']:>8}{stats['rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+        base = (baseline or {}).get("routes", {}).get(route)
+        if base:
+            line += f"   p95 {_delta(base['p95_ms'], stats['p95_ms'])} rps {_delta(base['rps'], stats['rps'])}"
+        print(line)
+    total = report["total"]
+    print(
+        f"total {total['requests']} requests, {total['errors']} errors, "
+        f"{total['rps']:.1f} req/s over {total['duration_s']:.2f}s"
+    )
+
+
+def _delta(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{100 * (after - before) / before:+.1f}%"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.auth_load")
+    parser.add_argument("--backend", choices=BACKENDS, default="memory")
+    parser.add_argument("--server", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--requests", type=int, default=LoadConfig.requests)
+    parser.add_argument("--concurrency", type=int, default=LoadConfig.concurrency)
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=dict(DEFAULT_MIX),
+        help="comma-separated route=weight, e.g. register=1,login=2,me=10,logout=1",
+    )
+    parser.add_argument("--seed", type=int, default=LoadConfig.seed)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="baseline JSON report to diff against")
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        requests=args.requests, concurrency=args.concurrency, mix=args.mix, seed=args.seed
+    )
+    if args.server == "uvicorn":
+        result = asyncio.run(run_under_uvicorn(args.backend, config, args.workers))
+    else:
+        result = asyncio.run(run_in_process(args.backend, config))
+
+    report = {
+        "benchmark": "auth_load",
+        "revision": _git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "backend": args.backend,
+        "server": args.server,
+        "workers": args.workers,
+        "config": asdict(config),
+        **result,
+    }
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
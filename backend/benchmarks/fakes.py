@@ -0,0 +1,133 @@
+"""In-memory stand-ins used to benchmark the HTTP stack without a database."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Generator, Mapping, Sequence
+from datetime import datetime
+from uuid import UUID
+
+from app.domains.auth.models import Session as SessionModel
+from app.domains.auth.models import User
+from app.domains.auth.service import (
+    AuthRepository,
+    RevokedSession,
+    SessionCursor,
+    SessionLookup,
+)
+
+
+class InMemoryAuthRepository(AuthRepository):
+    """Thread-safe dict-backed auth repository shared by all requests."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._users_by_email: dict[str, User] = {}
+        self._users_by_id: dict[UUID, User] = {}
+        self._sessions_by_hash: dict[bytes, SessionModel] = {}
+
+    def find_user_by_email(self, email: str) -> User | None:
+        return self._users_by_email.get(email)
+
+    def add_user(self, user: User) -> None:
+        with self._lock:
+            self._users_by_email[user.email] = user
+            self._users_by_id[user.id] = user
+
+    def flush(self) -> None:
+        return None
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        # No transactions here: every write is visible at once.
+        callback()
+
+    def add_session(self, session_model: SessionModel) -> None:
+        with self._lock:
+            self._sessions_by_hash[session_model.token_hash] = session_model
+
+    def find_session_by_token_hash(self, token_hash: bytes) -> SessionModel | None:
+        return self._sessions_by_hash.get(token_hash)
+
+    def find_user_by_id(self, user_id: UUID) -> User | None:
+        return self._users_by_id.get(user_id)
+
+    def find_session_with_user(self, token_hash: bytes) -> SessionLookup | None:
+        session_model = self._sessions_by_hash.get(token_hash)
+        if session_model is None:
+            return None
+        user = self._users_by_id.get(session_model.user_id)
+        if user is None:
+            return None
+        return SessionLookup(
+            user=user, expires_at=session_model.expires_at, revoked_at=session_model.revoked_at
+        )
+
+    def find_sessions_with_users(self, token_hashes: Sequence[bytes]) -> dict[bytes, SessionLookup]:
+        lookups = {}
+        for token_hash in token_hashes:
+            lookup = self.find_session_with_user(token_hash)
+            if lookup is not None:
+                lookups[token_hash] = lookup
+        return lookups
+
+    def list_sessions_for_user(
+        self, user_id: UUID, limit: int, after: SessionCursor | None = None
+    ) -> list[SessionModel]:
+        with self._lock:
+            sessions = [s for s in self._sessions_by_hash.values() if s.user_id == user_id]
+        sessions.sort(key=lambda s: (s.created_at, s.id or 0), reverse=True)
+        if after is not None:
+            sessions = [s for s in sessions if (s.created_at, s.id or 0) < after]
+        return sessions[:limit]
+
+    def revoke_sessions_for_user(self, user_id: UUID, revoked_at: datetime) -> int:
+        with self._lock:
+            live = [
+                s
+                for s in self._sessions_by_hash.values()
+                if s.user_id == user_id and s.revoked_at is None and s.expires_at > revoked_at
+            ]
+            for session_model in live:
+                session_model.revoked_at = revoked_at
+        return len(live)
+
+    def delete_sessions_ended_before(self, cutoff: datetime, limit: int) -> int:
+        return 0
+
+    def update_last_login_times(self, last_logins: Mapping[UUID, datetime]) -> None:
+        for user_id, logged_in_at in last_logins.items():
+            user = self._users_by_id.get(user_id)
+            if user is not None:
+                user.last_login_at = logged_in_at
+
+    def find_sessions_revoked_since(self, since: datetime, now: datetime) -> list[RevokedSession]:
+        with self._lock:
+            sessions = list(self._sessions_by_hash.values())
+        return [
+            RevokedSession(s.token_hash, s.revoked_at, s.expires_at)
+            for s in sessions
+            if s.revoked_at is not None and s.revoked_at >= since and s.expires_at > now
+        ]
+
+    def find_revoked_sessions_for_user(self, user_id: UUID, now: datetime) -> list[RevokedSession]:
+        with self._lock:
+            sessions = list(self._sessions_by_hash.values())
+        return [
+            RevokedSession(s.token_hash, s.revoked_at, s.expires_at)
+            for s in sessions
+            if s.user_id == user_id and s.revoked_at is not None and s.expires_at > now
+        ]
+
+
+class NullDbSession:
+    """Stands in for the request DB session when the repository is in memory."""
+
+    def commit(self) -> None:
+        return None
+
+    def rollback(self) -> None:
+        return None
+
+
+def null_db_session() -> Generator[NullDbSession, None, None]:
+    yield NullDbSession()
@@ -0,0 +1,173 @@
+"""Page latency deep into an account's entries: keyset cursor versus OFFSET.
+
+One account gets ``--rows`` entries spread over five years, so many share
+a date. The keyset page is ``SqlLedgerRepository.list_entries`` after the
+``(occurred_on, id)`` key of the previous page's last row, the query behind
+``GET /ledger/accounts/{id}/entries``; the OFFSET page is the same query
+with ``OFFSET (page - 1) * limit`` instead of the seek predicate. Both
+fetch the same rows; the benchmark checks that first.
+
+Examples::
+
+    python -m benchmarks.pagination
+    python -m benchmarks.pagination --rows 1000000 --page 10000 --output pages.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, col
+
+from app.db.migrations import migrate
+from app.domains.auth.models import User
+from app.domains.ledger.models import Account, LedgerEntry
+from app.domains.ledger.repository import SqlLedgerRepository
+from app.domains.ledger.service import EntryCursor, entry_cursor
+from benchmarks.auth_load import percentile
+
+INSERT_BATCH_SIZE = 20_000
+HISTORY_DAYS = 5 * 365
+
+
+def _load_entries(engine: Engine, rows: int, seed: int) -> int:
+    rng = random.Random(seed)
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+    first_day = date(2021, 1, 1)
+    with Session(engine) as db:
+        db.add(User(id=user_id, email="bench@example.com", created_at=now))
+        account = Account(user_id=user_id, name="Bench", account_type="monthly")
+        db.add(account)
+        db.commit()
+        assert account.id is not None
+        account_id = account.id
+    with engine.begin() as conn:
+        for start in range(0, rows, INSERT_BATCH_SIZE):
+            conn.execute(
+                LedgerEntry.__table__.insert(),
+                [
+                    {
+                        "account_id": account_id,
+                        "user_id": user_id,
+                        "amount_minor": rng.randint(-50_000, 20_000),
+                        "description": "",
+                        "occurred_on": first_day + timedelta(days=rng.randrange(HISTORY_DAYS)),
+                        "created_at": now,
+                    }
+                    for _ in range(min(INSERT_BATCH_SIZE, rows - start))
+                ],
+            )
+        conn.execute(text("ANALYZE"))
+    return account_id
+
+
+def _offset_page(db: Session, account_id: int, limit: int, page: int) -> list[LedgerEntry]:
+    return list(
+        db.exec(
+            select(LedgerEntry)
+            .where(LedgerEntry.account_id == account_id)
+            .order_by(col(LedgerEntry.occurred_on).desc(), col(LedgerEntry.id).desc())
+            .offset((page - 1) * limit)
+            .limit(limit)
+        ).scalars()
+    )
+
+
+def _timings_ms(run: Callable[[], Any], repeats: int) -> list[float]:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _summary(timings: list[float]) -> dict[str, float]:
+    return {
+        "p50_ms": round(percentile(sorted(timings), 50), 3),
+        "p95_ms": round(percentile(sorted(timings), 95), 3),
+    }
+
+
+def run_benchmark(
+    rows: int, page: int = 10_000, limit: int = 50, repeats: int = 20, seed: int = 1
+) -> dict[str, Any]:
+    if (page - 1) * limit >= rows:
+        raise ValueError(f"page {page} of {limit} needs more than {rows} rows")
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'bench.db'}")
+        try:
+            migrate(engine)
+            account_id = _load_entries(engine, rows, seed)
+            with Session(engine) as db:
+                repo = SqlLedgerRepository(db)
+                # The cursor a client would hold after reading pages 1 .. page - 1.
+                previous = _offset_page(db, account_id, limit, page - 1)
+                after: EntryCursor = entry_cursor(previous[-1])
+                keyset = [entry.id for entry in repo.list_entries(account_id, limit, after)]
+                offset = [entry.id for entry in _offset_page(db, account_id, limit, page)]
+                if keyset != offset:
+                    raise AssertionError("keyset and OFFSET pages differ")
+
+                cases = {
+                    "keyset_first": lambda: repo.list_entries(account_id, limit),
+                    "keyset_deep": lambda: repo.list_entries(account_id, limit, after),
+                    "offset_first": lambda: _offset_page(db, account_id, limit, 1),
+                    "offset_deep": lambda: _offset_page(db, account_id, limit, page),
+                }
+                report: dict[str, Any] = {"rows": rows, "page": page, "limit": limit}
+                for name, run in cases.items():
+                    report[name] = _summary(_timings_ms(run, repeats))
+        finally:
+            engine.dispose()
+    report["keyset_deep_over_first"] = round(
+        report["keyset_deep"]["p50_ms"] / report["keyset_first"]["p50_ms"], 2
+    )
+    report["offset_deep_over_first"] = round(
+        report["offset_deep"]["p50_ms"] / report["offset_first"]["p50_ms"], 1
+    )
+    return report
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(f"{report['rows']} entries, {report['limit']} per page")
+    for method in ("keyset", "offset"):
+        first, deep = report[f"{method}_first"], report[f"{method}_deep"]
+        print(
+            f"{method:>7}: page 1 p50 {first['p50_ms']:.2f} ms,"
+            f" page {report['page']} p50 {deep['p50_ms']:.2f} ms"
+            f" (x{report[f'{method}_deep_over_first']})"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.pagination")
+    parser.add_argument("--rows", type=int, default=550_000)
+    parser.add_argument("--page", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.rows, args.page, args.limit, args.repeats, args.seed)
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
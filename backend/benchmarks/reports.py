@@ -0,0 +1,229 @@
+"""Monthly rollups of 1M entries: Python loop versus NumPy columns.
+
+``python_loop`` is the straightforward way: one dict update per entry over
+``(occurred_on, category_id, amount_minor)`` tuples, which is already
+cheaper than walking ORM objects. ``vectorized`` is ``rollup_columns``
+over the same entries as arrays. Both must produce the same rollups; the
+benchmark checks that first.
+
+With ``--database sqlite`` the entries are also written to a throwaway
+SQLite file to time the full rebuild path (``load_entry_columns`` plus
+``rollup_columns``) and a twelve-month report served from the rollup rows.
+
+Examples::
+
+    python -m benchmarks.reports
+    python -m benchmarks.reports --rows 1000000 --database sqlite --output reports.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+from uuid import UUID, uuid4
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.db.migrations import migrate
+from app.domains.auth.models import User
+from app.domains.ledger import reports
+from app.domains.ledger.analytics import (
+    EntryColumns,
+    check_rollups,
+    entry_columns,
+    load_entry_columns,
+    rollup_columns,
+)
+from app.domains.ledger.models import Account, Category, LedgerEntry
+from app.domains.ledger.repository import SqlLedgerRepository
+
+DATABASES = ("memory", "sqlite")
+HISTORY_MONTHS = 60
+CATEGORIES = 25
+INSERT_BATCH_SIZE = 20_000
+
+_Rollups = dict[tuple[date, int], tuple[int, int, int]]
+
+
+def synthetic_entries(rows: int, seed: int = 1) -> EntryColumns:
+    """Five years of entries over 25 categories plus uncategorized, mostly spending."""
+    rng = np.random.default_rng(seed)
+    first = np.datetime64("2021-01", "M").astype(np.int64)
+    return entry_columns(
+        months=(first + rng.integers(0, HISTORY_MONTHS, rows)).astype("datetime64[M]"),
+        categories=rng.integers(0, CATEGORIES + 1, rows),
+        amounts=rng.integers(-50_000, 20_000, rows),
+    )
+
+
+def python_rollups(entries: list[tuple[date, int, int]]) -> _Rollups:
+    totals: dict[tuple[date, int], list[int]] = {}
+    for occurred_on, category_id, amount_minor in entries:
+        total = totals.setdefault((occurred_on.replace(day=1), category_id), [0, 0, 0])
+        if amount_minor > 0:
+            total[0] += amount_minor
+        else:
+            total[1] += amount_minor
+        total[2] += 1
+    return {key: (inflow, outflow, count) for key, (inflow, outflow, count) in totals.items()}
+
+
+def vectorized_rollups(columns: EntryColumns) -> _Rollups:
+    return {
+        (delta.month, delta.category_id): (
+            delta.inflow_minor,
+            delta.outflow_minor,
+            delta.entry_count,
+        )
+        for delta in rollup_columns(columns).deltas()
+    }
+
+
+def _as_tuples(columns: EntryColumns) -> list[tuple[date, int, int]]:
+    days = columns.months.astype("datetime64[D]").astype(object)
+    return list(zip(days, columns.categories.tolist(), columns.amounts.tolist(), strict=True))
+
+
+def _best_seconds(run: Callable[[], Any], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _load_database(engine: Engine, columns: EntryColumns) -> UUID:
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+    with Session(engine) as db:
+        db.add(User(id=user_id, email="bench@example.com", created_at=now))
+        account = Account(user_id=user_id, name="Bench", account_type="monthly")
+        db.add(account)
+        categories = [
+            Category(user_id=user_id, name=f"Category {index}", category_type="monthly")
+            for index in range(1, CATEGORIES + 1)
+        ]
+        db.add_all(categories)
+        db.commit()
+        assert account.id is not None
+        account_id = account.id
+        category_ids = {index: category.id for index, category in enumerate(categories, 1)}
+
+    entries = _as_tuples(columns)
+    with engine.begin() as conn:
+        for start in range(0, len(entries), INSERT_BATCH_SIZE):
+            conn.execute(
+                LedgerEntry.__table__.insert(),
+                [
+                    {
+                        "account_id": account_id,
+                        "user_id": user_id,
+                        "amount_minor": amount_minor,
+                        "description": "",
+                        "occurred_on": occurred_on,
+                        "created_at": now,
+                        "category_id": category_ids.get(category),
+                    }
+                    for occurred_on, category, amount_minor in entries[
+                        start : start + INSERT_BATCH_SIZE
+                    ]
+                ],
+            )
+    return user_id
+
+
+def _database_cases(engine: Engine, columns: EntryColumns, repeats: int) -> dict[str, float]:
+    migrate(engine)
+    user_id = _load_database(engine, columns)
+    with engine.connect() as conn:
+        loaded = load_entry_columns(conn, user_id)
+        if len(loaded) != len(columns):
+            raise AssertionError("loaded a different number of entries")
+
+        def rebuild() -> None:
+            rollup_columns(load_entry_columns(conn, user_id))
+
+        rebuild_seconds = _best_seconds(rebuild, repeats)
+
+    check_rollups(engine, repair=True)
+    end = reports.add_months(date(2021, 1, 1), HISTORY_MONTHS - 1)
+    start = reports.add_months(end, 1 - reports.REPORT_MONTHS_DEFAULT)
+    with Session(engine) as db:
+        repo = SqlLedgerRepository(db)
+        report_seconds = _best_seconds(
+            lambda: reports.monthly_report(repo, user_id, start, end), repeats
+        )
+    return {
+        "load_and_rollup_ms": round(rebuild_seconds * 1000, 1),
+        "report_from_rollups_ms": round(report_seconds * 1000, 2),
+    }
+
+
+def run_benchmark(
+    rows: int, database: str = "memory", repeats: int = 3, seed: int = 1
+) -> dict[str, Any]:
+    columns = synthetic_entries(rows, seed)
+    entries = _as_tuples(columns)
+    if python_rollups(entries) != vectorized_rollups(columns):
+        raise AssertionError("vectorized rollups differ from the Python loop")
+
+    loop_seconds = _best_seconds(lambda: python_rollups(entries), repeats)
+    vector_seconds = _best_seconds(lambda: rollup_columns(columns), repeats)
+    report: dict[str, Any] = {
+        "rows": rows,
+        "groups": len(rollup_columns(columns)),
+        "python_loop_ms": round(loop_seconds * 1000, 1),
+        "vectorized_ms": round(vector_seconds * 1000, 1),
+        "speedup": round(loop_seconds / vector_seconds, 1),
+    }
+    if database == "sqlite":
+        with tempfile.TemporaryDirectory() as workdir:
+            engine = create_engine(f"sqlite:///{Path(workdir) / 'bench.db'}")
+            try:
+                report.update(_database_cases(engine, columns, repeats))
+            finally:
+                engine.dispose()
+    return report
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(
+        f"{report['rows']} entries -> {report['groups']} monthly rollups: python loop"
+        f" {report['python_loop_ms']:.0f} ms, vectorized {report['vectorized_ms']:.1f} ms"
+        f"  x{report['speedup']:.0f}"
+    )
+    if "load_and_rollup_ms" in report:
+        print(
+            f"sqlite: load + rollup {report['load_and_rollup_ms']:.0f} ms,"
+            f" 12-month report from rollups {report['report_from_rollups_ms']:.2f} ms"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.reports")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--database", choices=DATABASES, default="memory")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.rows, args.database, args.repeats, args.seed)
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+"""Cost of rendering one auth response body, before and after the fast path.
+
+``validated`` reproduces what FastAPI does for a route that returns a model:
+build it with validation, validate it again against ``response_model``,
+dump it to JSON-compatible Python and encode that with the stdlib encoder.
+``fast`` is what the routes do now: one pydantic-core ``to_json`` of the
+model (built with ``model_construct`` for ``UserSummary``, whose email
+validation dominates), and pre-rendered bytes for fixed problems.
+Both paths must produce the same JSON; the benchmark checks that first.
+
+Examples::
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --iterations 50000 --output serialization.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+from app.api.auth_common import INVALID_SESSION, session_page_out, user_summary
+from app.api.problem_details import problem
+from app.api.responses import ModelResponse
+from app.db.pagination import CursorCodec
+from app.domains.auth.models import Session as SessionModel
+from app.domains.auth.models import User
+from app.domains.auth.schemas import SessionPageOut, UserSummary
+from app.domains.auth.service import SessionPage
+
+SESSIONS_PER_PAGE = 20
+
+_user_adapter = TypeAdapter(UserSummary)
+_page_adapter = TypeAdapter(SessionPageOut)
+_CODEC = CursorCodec(b"benchmark")
+
+
+def _sample_user() -> User:
+    now = datetime.now(timezone.utc)
+    return User(id=uuid4(), email="someone@example.com", created_at=now, last_login_at=now)
+
+
+def _sample_page(user: User) -> SessionPage:
+    now = datetime.now(timezone.utc)
+    sessions = [
+        SessionModel(
+            id=index,
+            user_id=user.id,
+            token_hash=bytes(32),
+            created_at=now - timedelta(minutes=index),
+            expires_at=now + timedelta(days=7),
+        )
+        for index in range(SESSIONS_PER_PAGE, 0, -1)
+    ]
+    return SessionPage(sessions=sessions, next_after=None)
+
+
+def _validated_response(adapter: TypeAdapter[Any], model: Any) -> bytes:
+    validated = adapter.validate_python(model, from_attributes=True)
+    return JSONResponse(adapter.dump_python(validated, mode="json")).body
+
+
+def _user_summary_validated(user: User) -> bytes:
+    summary = UserSummary(
+        id=user.id,
+        email=user.email,
+        created_at=user.created_at.astimezone(timezone.utc),
+        last_login_at=user.last_login_at.astimezone(timezone.utc) if user.last_login_at else None,
+        is_active=user.is_active,
+    )
+    return _validated_response(_user_adapter, summary)
+
+
+def _problem_validated() -> bytes:
+    exc = problem(
+        status_code=INVALID_SESSION.status_code,
+        title=INVALID_SESSION.title,
+        detail=INVALID_SESSION.detail,
+        type_=INVALID_SESSION.type_,
+    )
+    return JSONResponse({"detail": exc.detail}, status_code=exc.status_code).body
+
+
+def _problem_fast() -> bytes:
+    # What ``problem_details_handler`` sends, minus the coroutine.
+    exc = INVALID_SESSION.exception()
+    return Response(exc.body, status_code=exc.status_code, media_type="application/json").body
+
+
+def _time_per_call(render: Callable[[], bytes], iterations: int, repeats: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            render()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+def run_benchmark(iterations: int) -> dict[str, Any]:
+    user = _sample_user()
+    page = _sample_page(user)
+    cases: dict[str, tuple[Callable[[], bytes], Callable[[], bytes]]] = {
+        "user_summary": (
+            lambda: _user_summary_validated(user),
+            lambda: ModelResponse(user_summary(user)).body,
+        ),
+        "session_page": (
+            lambda: _validated_response(_page_adapter, session_page_out(page, None, _CODEC)),
+            lambda: ModelResponse(session_page_out(page, None, _CODEC)).body,
+        ),
+        "problem": (_problem_validated, _problem_fast),
+    }
+
+    results: dict[str, Any] = {}
+    for name, (validated, fast) in cases.items():
+        if json.loads(validated()) != json.loads(fast()):
+            raise AssertionError(f"{name}: fast path renders a different body")
+        before = _time_per_call(validated, iterations)
+        after = _time_per_call(fast, iterations)
+        results[name] = {
+            "validated_us": round(before, 2),
+            "fast_us": round(after, 2),
+            "speedup": round(before / after, 2),
+        }
+    return {"iterations": iterations, "cases": results}
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(f"{report['iterations']} iterations, best of 3, microseconds per response")
+    for name, case in report["cases"].items():
+        print(
+            f"{name:13} validated={case['validated_us']:8.2f}"
+            f" fast={case['fast_us']:8.2f}  x{case['speedup']:.1f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.iterations)
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
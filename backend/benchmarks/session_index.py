@@ -0,0 +1,199 @@
+"""Index size and lookup latency of the legacy and compact session layouts.
+
+The legacy layout keys sessions by a UUID string and stores the token hash
+as 64 hex characters; the compact layout uses a BIGINT key and the raw
+32-byte digest. Both tables get the same rows and the same token lookups.
+
+Examples::
+
+    python -m benchmarks.session_index --rows 200000 --lookups 5000
+    python -m benchmarks.session_index --backend db --output index.json
+
+``sqlite`` uses a throwaway SQLite file and reads sizes from ``dbstat``;
+``db`` uses the database configured through the usual ``BC_*`` settings and,
+on MySQL, reads ``mysql.innodb_index_stats`` after ``ANALYZE TABLE``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import (
+    BINARY,
+    BigInteger,
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Uuid,
+    bindparam,
+    create_engine,
+    select,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import Settings
+from benchmarks.auth_load import percentile
+
+BACKENDS = ("sqlite", "db")
+INSERT_BATCH_SIZE = 5000
+
+_metadata = MetaData()
+LAYOUTS = {
+    "legacy": Table(
+        "bench_session_legacy",
+        _metadata,
+        Column("id", String(32), primary_key=True),
+        Column("user_id", String(32), nullable=False),
+        Column("token_hash", String(64), nullable=False, unique=True, index=True),
+        Column("expires_at", DateTime, nullable=False),
+    ),
+    "compact": Table(
+        "bench_session_compact",
+        _metadata,
+        Column(
+            "id",
+            BigInteger().with_variant(Integer, "sqlite"),
+            primary_key=True,
+            autoincrement=True,
+        ),
+        Column("user_id", Uuid, nullable=False),
+        Column("token_hash", BINARY(32), nullable=False, unique=True, index=True),
+        Column("expires_at", DateTime, nullable=False),
+    ),
+}
+
+
+def run_benchmark(engine: Engine, rows: int, lookups: int, seed: int = 1) -> dict[str, Any]:
+    rng = random.Random(seed)
+    digests = [hashlib.sha256(rng.randbytes(32)).digest() for _ in range(rows)]
+    probes = [rng.choice(digests) for _ in range(lookups)]
+    expires_at = datetime.now(timezone.utc) + timedelta(days=30)
+
+    _metadata.drop_all(engine)
+    _metadata.create_all(engine)
+    try:
+        report: dict[str, Any] = {"dialect": engine.dialect.name, "rows": rows, "layouts": {}}
+        for name, table in LAYOUTS.items():
+            with engine.begin() as conn:
+                _populate(conn, name, table, digests, expires_at)
+            with engine.connect() as conn:
+                sizes = _index_sizes(conn, table)
+                latencies = _time_lookups(conn, name, table, probes)
+            report["layouts"][name] = {
+                "index_bytes": sizes,
+                "lookup_p50_us": round(percentile(latencies, 50) * 1e6, 1),
+                "lookup_p95_us": round(percentile(latencies, 95) * 1e6, 1),
+            }
+        return report
+    finally:
+        _metadata.drop_all(engine)
+
+
+def _populate(
+    conn: Connection, layout: str, table: Table, digests: list[bytes], expires_at: datetime
+) -> None:
+    user_ids = [uuid4() for _ in range(max(1, len(digests) // 4))]
+    for start in range(0, len(digests), INSERT_BATCH_SIZE):
+        batch = []
+        for index, digest in enumerate(digests[start : start + INSERT_BATCH_SIZE]):
+            user_id = user_ids[(start + index) % len(user_ids)]
+            if layout == "legacy":
+                row = {"id": uuid4().hex, "user_id": user_id.hex, "token_hash": digest.hex()}
+            else:
+                row = {"user_id": user_id, "token_hash": digest}
+            batch.append({**row, "expires_at": expires_at})
+        conn.execute(table.insert(), batch)
+
+
+def _time_lookups(
+    conn: Connection, layout: str, table: Table, probes: list[bytes]
+) -> list[float]:
+    query = select(table.c.id, table.c.user_id).where(
+        table.c.token_hash == bindparam("token_hash")
+    )
+    latencies = []
+    for digest in probes:
+        token_hash = digest.hex() if layout == "legacy" else digest
+        started = time.perf_counter()
+        conn.execute(query, {"token_hash": token_hash}).one()
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+
+def _index_sizes(conn: Connection, table: Table) -> dict[str, int] | None:
+    """Bytes per index of ``table`` (the table itself under its own name)."""
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(
+            text(
+                "SELECT dbstat.name, SUM(dbstat.pgsize) FROM dbstat"
+                " JOIN sqlite_master ON sqlite_master.name = dbstat.name"
+                " WHERE sqlite_master.tbl_name = :table GROUP BY dbstat.name"
+            ),
+            {"table": table.name},
+        ).all()
+    elif conn.dialect.name == "mysql":
+        conn.execute(text(f"ANALYZE TABLE {table.name}"))
+        rows = conn.execute(
+            text(
+                "SELECT index_name, stat_value * @@innodb_page_size"
+                " FROM mysql.innodb_index_stats WHERE database_name = DATABASE()"
+                " AND table_name = :table AND stat_name = 'size'"
+            ),
+            {"table": table.name},
+        ).all()
+    else:
+        return None
+    return {name: int(size) for name, size in rows}
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(f"{report['rows']} rows on {report['dialect']}")
+    for name, layout in report["layouts"].items():
+        sizes = layout["index_bytes"] or {}
+        indexes = ", ".join(f"{index}={size / 1024:.0f} KiB" for index, size in sizes.items())
+        print(
+            f"{name:8} p50={layout['lookup_p50_us']:.1f}us"
+            f" p95={layout['lookup_p95_us']:.1f}us  {indexes or 'sizes unavailable'}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.session_index")
+    parser.add_argument("--backend", choices=BACKENDS, default="sqlite")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.backend == "sqlite":
+            engine = create_engine(f"sqlite:///{Path(workdir) / 'bench.db'}")
+        else:
+            engine = create_engine(Settings().database_url)
+        try:
+            report = run_benchmark(engine, args.rows, args.lookups, args.seed)
+        finally:
+            engine.dispose()
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
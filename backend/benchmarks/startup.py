@@ -0,0 +1,119 @@
+"""Cold-start cost of a worker: ``import app.main`` and ``create_app()``.
+
+Each run is a fresh interpreter started with ``-X importtime``, so nothing
+is cached in ``sys.modules``. The report has wall time per phase, the
+modules each phase loaded and the slowest imports by self time.
+
+Examples::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget-ms 2000 --output startup.json
+
+With ``--budget-ms`` the exit status is 1 when import plus ``create_app``
+takes longer; ``BC_STARTUP_BUDGET_MS`` sets the same budget for the test
+suite. ``BC_*`` settings apply to the measured app as they would in
+production.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+STARTUP_BUDGET_MS = 3000.0
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+
+_PROBE = """
+import json, sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+after_import = set(sys.modules)
+app.main.create_app()
+created = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (created - imported) * 1000,
+    "imported_by_main": sorted(after_import - before),
+    "loaded_by_create_app": sorted(set(sys.modules) - after_import),
+}))
+"""
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| *(\S+)$")
+
+
+def measure_startup(top: int = 15) -> dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=BACKEND_ROOT,
+        env={**os.environ, "PYTHONPATH": str(BACKEND_ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["total_ms"] = report["import_ms"] + report["create_app_ms"]
+    report["slowest_imports"] = _slowest_imports(result.stderr, top)
+    return report
+
+
+def _slowest_imports(importtime_log: str, top: int) -> list[dict[str, Any]]:
+    rows = []
+    for line in importtime_log.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, module = match.groups()
+            rows.append(
+                {
+                    "module": module,
+                    "self_ms": int(self_us) / 1000,
+                    "cumulative_ms": int(cumulative_us) / 1000,
+                }
+            )
+    rows.sort(key=lambda row: row["self_ms"], reverse=True)
+    return rows[:top]
+
+
+def budget_ms() -> float:
+    return float(os.environ.get("BC_STARTUP_BUDGET_MS", STARTUP_BUDGET_MS))
+
+
+def print_report(report: dict[str, Any], budget: float | None = None) -> None:
+    print(
+        f"import app.main {report['import_ms']:.0f} ms"
+        f" ({len(report['imported_by_main'])} modules),"
+        f" create_app {report['create_app_ms']:.0f} ms"
+        f" ({len(report['loaded_by_create_app'])} modules),"
+        f" total {report['total_ms']:.0f} ms"
+        + (f" / budget {budget:.0f} ms" if budget is not None else "")
+    )
+    for row in report["slowest_imports"]:
+        print(f"  {row['self_ms']:7.1f} ms self {row['cumulative_ms']:8.1f} ms total  {row['module']}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    args = parser.parse_args(argv)
+
+    report = measure_startup(args.top)
+    print_report(report, args.budget_ms)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        print(f"startup over budget by {report['total_ms'] - args.budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
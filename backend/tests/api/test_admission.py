@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from starlette.types import Receive, Scope, Send
+
+from app.api.middleware.admission import AdmissionControlMiddleware, AdmissionGate
+
+
+class BlockingApp:
+    """Answers 200 once ``release`` is set; counts requests that got in."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.entered = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.entered += 1
+        if scope["path"].startswith("/auth"):
+            await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _client(app: BlockingApp, gate: AdmissionGate, timeout: float = 5.0) -> httpx.AsyncClient:
+    middleware = AdmissionControlMiddleware(
+        app, {"auth": gate}, queue_timeout_seconds=timeout, retry_after_seconds=3
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test")
+
+
+async def _until(condition) -> None:
+    while not condition():
+        await asyncio.sleep(0)
+
+
+def test_sheds_requests_beyond_the_queue_with_retry_after() -> None:
+    async def scenario() -> None:
+        app = BlockingApp()
+        gate = AdmissionGate("auth", "/auth", max_concurrency=1, max_queue=1)
+        async with _client(app, gate) as client:
+            running = asyncio.create_task(client.get("/auth/me"))
+            queued = asyncio.create_task(client.get("/auth/me"))
+            await _until(lambda: gate.queued == 1)
+
+            shed = await client.get("/auth/me")
+            unrelated = await client.get("/health")
+            app.release.set()
+            responses = await asyncio.gather(running, queued)
+
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "3"
+        assert shed.json()["detail"]["title"] == "Service overloaded"
+        assert unrelated.status_code == 200
+        assert [response.status_code for response in responses] == [200, 200]
+        assert (gate.active, gate.queued) == (0, 0)
+
+    asyncio.run(scenario())
+
+
+def test_sheds_requests_that_wait_past_the_queue_timeout() -> None:
+    async def scenario() -> None:
+        app = BlockingApp()
+        gate = AdmissionGate("auth", "/auth", max_concurrency=1, max_queue=5)
+        async with _client(app, gate, timeout=0.01) as client:
+            running = asyncio.create_task(client.get("/auth/me"))
+            await _until(lambda: gate.active == 1)
+
+            timed_out = await client.get("/auth/me")
+            app.release.set()
+            await running
+
+        assert timed_out.status_code == 503
+        assert app.entered == 1
+        assert (gate.active, gate.queued) == (0, 0)
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize(("path", "gated"), [("/auth", True), ("/auth/me", True), ("/authz", False)])
+def test_matches_whole_path_segments(path: str, gated: bool) -> None:
+    middleware = AdmissionControlMiddleware(
+        BlockingApp(), {"auth": AdmissionGate("auth", "/auth", 1, 1)}
+    )
+
+    assert (middleware._gate_for({"path": path}) is not None) is gated
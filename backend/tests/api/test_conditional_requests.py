@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.conditional import etag_matches
+from app.core.config import Settings
+from app.main import create_app
+
+
+def test_me_answers_304_until_the_user_changes(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    first = sqlite_client.get("/auth/me")
+    etag = first.headers["ETag"]
+
+    unchanged = sqlite_client.get("/auth/me", headers={"If-None-Match": etag})
+    sqlite_client.post("/auth/login", json={"email": "a@example.com"})
+    after_login = sqlite_client.get("/auth/me", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    assert first.headers["Vary"] == "Cookie"
+    assert (unchanged.status_code, unchanged.content) == (304, b"")
+    assert unchanged.headers["ETag"] == etag
+    assert after_login.status_code == 200
+    assert after_login.headers["ETag"] != etag
+    assert after_login.json()["last_login_at"] is not None
+
+
+def test_me_still_requires_a_valid_session(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    etag = sqlite_client.get("/auth/me").headers["ETag"]
+    sqlite_client.post("/auth/logout")
+
+    response = sqlite_client.get("/auth/me", headers={"If-None-Match": etag})
+
+    assert response.status_code == 401
+
+
+def test_account_etags_move_with_postings(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = sqlite_client.post(
+        "/ledger/accounts",
+        json={"name": "Checking", "account_type": "monthly", "opening_balance": "10.00"},
+    ).json()
+    path = f"/ledger/accounts/{account['id']}"
+    etags = {url: sqlite_client.get(url).headers["ETag"] for url in (path, "/ledger/accounts")}
+
+    assert all(
+        sqlite_client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        for url, etag in etags.items()
+    )
+    sqlite_client.post(
+        f"{path}/entries", json={"amount": "-2.50", "occurred_on": "2026-03-01"}
+    )
+    for url, etag in etags.items():
+        response = sqlite_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+
+def test_max_age_is_configurable(tmp_path: Path) -> None:
+    settings = Settings(
+        db_url=f"sqlite:///{tmp_path / 'test.db'}", read_cache_max_age_seconds=30
+    )
+    with TestClient(create_app(settings)) as client:
+        client.post("/auth/register", json={"email": "a@example.com"})
+
+        assert client.get("/ledger/categories").headers["Cache-Control"] == "private, max-age=30"
+
+
+@pytest.mark.parametrize(
+    ("header", "matches"),
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ("*", True),
+        ('"xyz"', False),
+    ],
+)
+def test_if_none_match_parsing(header: str | None, matches: bool) -> None:
+    assert etag_matches(header, '"abc"') is matches
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.db.session import get_engine
+from app.domains.ledger.repository import SqlLedgerRepository
+
+Budget = Callable[[httpx.Response, int], None]
+
+
+def _create_account(client: TestClient, name: str = "Checking", opening: str = "100.00") -> dict:
+    response = client.post(
+        "/ledger/accounts",
+        json={"name": name, "account_type": "monthly", "opening_balance": opening},
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _post(client: TestClient, account_id: int, amount: str) -> httpx.Response:
+    return client.post(
+        f"/ledger/accounts/{account_id}/entries",
+        json={"amount": amount, "description": "groceries", "occurred_on": "2026-03-01"},
+    )
+
+
+def test_postings_move_the_balance_read_in_one_row(
+    sqlite_client: TestClient, query_budget: Budget
+) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = _create_account(sqlite_client)
+    assert (account["balance"], account["entry_count"]) == ("100.00", 1)
+
+    assert _post(sqlite_client, account["id"], "-25.50").status_code == 201
+    assert _post(sqlite_client, account["id"], "10.05").status_code == 201
+
+    response = sqlite_client.get("/ledger/accounts")
+    query_budget(response, 2)
+    [listed] = response.json()
+    assert (listed["balance"], listed["entry_count"]) == ("84.55", 3)
+
+
+def test_reversal_appends_the_opposite_entry_once(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = _create_account(sqlite_client, opening="0")
+    entry = _post(sqlite_client, account["id"], "-40.00").json()
+
+    reversal = sqlite_client.post(f"/ledger/entries/{entry['id']}/reverse")
+    again = sqlite_client.post(f"/ledger/entries/{entry['id']}/reverse")
+
+    assert reversal.status_code == 201
+    assert (reversal.json()["amount"], reversal.json()["reverses_id"]) == ("40.00", entry["id"])
+    assert again.status_code == 409
+    balance = sqlite_client.get(f"/ledger/accounts/{account['id']}").json()
+    assert (balance["balance"], balance["entry_count"]) == ("0.00", 2)
+
+
+def test_entries_page_latest_first(sqlite_client: TestClient, query_budget: Budget) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = _create_account(sqlite_client, opening="0")
+    # Posted out of date order; two share a date, so the id breaks the tie.
+    for amount, occurred_on in [
+        ("1.00", "2026-03-02"),
+        ("2.00", "2026-03-05"),
+        ("3.00", "2026-03-01"),
+        ("4.00", "2026-03-02"),
+    ]:
+        sqlite_client.post(
+            f"/ledger/accounts/{account['id']}/entries",
+            json={"amount": amount, "occurred_on": occurred_on},
+        )
+
+    seen: list[str] = []
+    params: dict[str, int | str] = {"limit": 2}
+    while True:
+        page = sqlite_client.get(f"/ledger/accounts/{account['id']}/entries", params=params)
+        query_budget(page, 3)
+        body = page.json()
+        seen.extend(entry["amount"] for entry in body["entries"])
+        if body["next_cursor"] is None:
+            break
+        params["cursor"] = body["next_cursor"]
+
+    assert seen == ["2.00", "4.00", "1.00", "3.00"]
+
+
+def test_entry_cursors_are_bound_to_their_account(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    first = _create_account(sqlite_client)
+    second = _create_account(sqlite_client, name="Savings")
+    _post(sqlite_client, first["id"], "5.00")
+    cursor = sqlite_client.get(
+        f"/ledger/accounts/{first['id']}/entries", params={"limit": 1}
+    ).json()["next_cursor"]
+
+    response = sqlite_client.get(
+        f"/ledger/accounts/{second['id']}/entries", params={"cursor": cursor}
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["title"] == "Invalid cursor"
+
+
+def test_accounts_of_other_users_are_not_found(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = _create_account(sqlite_client)
+    sqlite_client.post("/auth/register", json={"email": "b@example.com"})
+
+    assert _post(sqlite_client, account["id"], "5.00").status_code == 404
+    assert sqlite_client.get(f"/ledger/accounts/{account['id']}").status_code == 404
+    assert sqlite_client.get("/ledger/accounts").json() == []
+
+
+def test_amounts_with_more_than_two_decimals_are_rejected(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = _create_account(sqlite_client)
+
+    assert _post(sqlite_client, account["id"], "1.005").status_code == 422
+
+
+def test_concurrent_reversal_is_a_conflict(sqlite_client: TestClient, monkeypatch) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = _create_account(sqlite_client, opening="0")
+    entry = _post(sqlite_client, account["id"], "-40.00").json()
+    assert sqlite_client.post(f"/ledger/entries/{entry['id']}/reverse").status_code == 201
+    # A second reversal whose check ran before the first one committed.
+    monkeypatch.setattr(SqlLedgerRepository, "is_reversed", lambda _self, _entry_id: False)
+
+    again = sqlite_client.post(f"/ledger/entries/{entry['id']}/reverse")
+
+    assert again.status_code == 409
+    assert again.json()["detail"]["title"] == "Entry already reversed"
+    balance = sqlite_client.get(f"/ledger/accounts/{account['id']}").json()
+    assert (balance["balance"], balance["entry_count"]) == ("0.00", 2)
+
+
+def test_statement_import_streams_in_and_skips_known_rows(
+    sqlite_client: TestClient,
+) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = _create_account(sqlite_client, opening="0")
+    statement = b"date,amount,description\n2026-01-01,-3.50,Coffee\n2026-01-01,oops,Tea\n"
+
+    def body() -> Iterator[bytes]:
+        yield from (statement[start : start + 4] for start in range(0, len(statement), 4))
+
+    first = sqlite_client.post(f"/ledger/accounts/{account['id']}/import", content=body())
+    again = sqlite_client.post(f"/ledger/accounts/{account['id']}/import", content=statement)
+
+    assert first.status_code == 200
+    assert {key: first.json()[key] for key in ("rows", "inserted", "invalid")} == {
+        "rows": 2,
+        "inserted": 1,
+        "invalid": 1,
+    }
+    assert first.json()["errors"] == [
+        {"row": 3, "message": "amount: Input should be a valid decimal"}
+    ]
+    assert (again.json()["inserted"], again.json()["duplicates"]) == (0, 1)
+    balance = sqlite_client.get(f"/ledger/accounts/{account['id']}").json()
+    assert (balance["balance"], balance["entry_count"]) == ("-3.50", 1)
+
+
+def test_statement_import_holds_no_connection_while_streaming(
+    sqlite_client: TestClient,
+) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = _create_account(sqlite_client, opening="0")
+    checked_out = []
+
+    def body() -> Iterator[bytes]:
+        checked_out.append(get_engine().pool.checkedout())
+        yield b"date,amount,description\n2026-01-01,-3.50,Coffee\n"
+
+    response = sqlite_client.post(f"/ledger/accounts/{account['id']}/import", content=body())
+
+    assert response.status_code == 200
+    assert checked_out == [0]
+
+
+def test_unreadable_statement_is_a_problem(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = _create_account(sqlite_client)
+
+    response = sqlite_client.post(
+        f"/ledger/accounts/{account['id']}/import", params={"format": "ofx"}, content=b"a,b\n"
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["title"] == "Invalid import file"
+
+
+def test_monthly_report_compares_category_actuals_with_budget(
+    sqlite_client: TestClient, query_budget: Budget
+) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    account = _create_account(sqlite_client, opening="0")
+    food = sqlite_client.post(
+        "/ledger/categories",
+        json={"name": "Food", "category_type": "monthly", "monthly_budget": "300.00"},
+    ).json()
+    for amount, day in (("-120.00", "2026-01-10"), ("-80.00", "2026-02-03")):
+        sqlite_client.post(
+            f"/ledger/accounts/{account['id']}/entries",
+            json={"amount": amount, "occurred_on": day, "category_id": food["id"]},
+        )
+    sqlite_client.post(
+        f"/ledger/accounts/{account['id']}/entries",
+        json={"amount": "1000.00", "occurred_on": "2026-02-01"},
+    )
+
+    response = sqlite_client.get(
+        "/ledger/reports/monthly", params={"start": "2026-02", "end": "2026-03"}
+    )
+    query_budget(response, 4)
+    report = response.json()
+
+    assert report["opening_net"] == "-120.00"
+    february, march = report["months"]
+    assert (february["month"], february["net"], february["running_net"]) == (
+        "2026-02",
+        "920.00",
+        "800.00",
+    )
+    assert [(line["name"], line["net"], line["remaining"]) for line in february["categories"]] == [
+        ("Food", "-80.00", "220.00"),
+        ("Uncategorized", "1000.00", "1000.00"),
+    ]
+    # Budgeted categories appear in months without entries.
+    assert [(line["name"], line["remaining"]) for line in march["categories"]] == [
+        ("Food", "300.00")
+    ]
+
+
+def test_entries_need_a_category_of_the_same_user(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    category = sqlite_client.post(
+        "/ledger/categories", json={"name": "Rent", "category_type": "monthly"}
+    ).json()
+    sqlite_client.post("/auth/register", json={"email": "b@example.com"})
+    account = _create_account(sqlite_client)
+
+    response = sqlite_client.post(
+        f"/ledger/accounts/{account['id']}/entries",
+        json={"amount": "-1.00", "occurred_on": "2026-01-01", "category_id": category["id"]},
+    )
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["title"] == "Category not found"
+
+
+def test_report_range_is_bounded(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+
+    backwards = sqlite_client.get(
+        "/ledger/reports/monthly", params={"start": "2026-05", "end": "2026-01"}
+    )
+    too_long = sqlite_client.get(
+        "/ledger/reports/monthly", params={"start": "2000-01", "end": "2026-01"}
+    )
+    default = sqlite_client.get("/ledger/reports/monthly")
+
+    assert (backwards.status_code, too_long.status_code) == (422, 422)
+    assert len(default.json()["months"]) == 12
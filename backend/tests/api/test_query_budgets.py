@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.main import create_app
+
+Budget = Callable[[httpx.Response, int], None]
+
+
+def test_auth_routes_stay_within_query_budgets(
+    sqlite_client: TestClient, query_budget: Budget
+) -> None:
+    response = sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    assert response.status_code == 201
+    query_budget(response, 4)
+
+    response = sqlite_client.get("/auth/me")
+    assert response.status_code == 200
+    query_budget(response, 1)
+
+    response = sqlite_client.post("/auth/logout")
+    assert response.status_code == 204
+    query_budget(response, 2)
+
+    response = sqlite_client.post("/auth/login", json={"email": "a@example.com"})
+    assert response.status_code == 200
+    query_budget(response, 4)
+
+
+def test_server_timing_reports_db_time(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+
+    response = sqlite_client.get("/auth/me")
+
+    assert response.headers["X-DB-Query-Count"] == "1"
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_query_stats_headers_are_off_by_default(tmp_path: Path) -> None:
+    settings = Settings(db_url=f"sqlite:///{tmp_path / 'test.db'}")
+    with TestClient(create_app(settings)) as client:
+        response = client.post("/auth/register", json={"email": "a@example.com"})
+
+    assert "X-DB-Query-Count" not in response.headers
+    assert "Server-Timing" not in response.headers
+
+
+def test_query_budget_fails_over_budget(sqlite_client: TestClient, query_budget: Budget) -> None:
+    response = sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+
+    with pytest.raises(AssertionError, match="over its budget of 0"):
+        query_budget(response, 0)
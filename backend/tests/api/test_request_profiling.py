@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.core.profiling import profile_token
+from app.main import create_app
+
+SECRET = "profiling-secret"
+
+
+def test_signed_header_profiles_a_request_into_the_dump_directory(tmp_path: Path) -> None:
+    dumps = tmp_path / "profiles"
+    settings = Settings(
+        db_url=f"sqlite:///{tmp_path / 'test.db'}",
+        profiling_enabled=True,
+        profiling_secret=SECRET,
+        profiling_dir=str(dumps),
+        profiling_interval_seconds=0.001,
+    )
+    with TestClient(create_app(settings)) as client:
+        client.post("/auth/register", json={"email": "a@example.com"})
+        assert not dumps.exists()
+
+        forged = client.get("/auth/me", headers={"X-Profile": "1.forged"})
+        response = client.get("/auth/me", headers={"X-Profile": profile_token(SECRET.encode())})
+
+    assert forged.status_code == response.status_code == 200
+    [dump] = list(dumps.iterdir())
+    profile = json.loads(dump.read_text())
+    assert (profile["method"], profile["route"]) == ("GET", "/auth/me")
+    assert profile["max_concurrency"] == 1
+    assert all(count > 0 for count in profile["stacks"].values())
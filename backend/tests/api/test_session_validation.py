@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.main import create_app
+
+Budget = Callable[[httpx.Response, int], None]
+HEADERS = {"X-Internal-Token": "internal-secret"}
+
+
+@pytest.fixture
+def client(tmp_path: Path) -> Iterator[TestClient]:
+    settings = Settings(
+        db_url=f"sqlite:///{tmp_path / 'test.db'}",
+        internal_api_token="internal-secret",
+        query_stats_headers=True,
+    )
+    with TestClient(create_app(settings)) as client:
+        yield client
+
+
+def _register(client: TestClient, email: str) -> str:
+    response = client.post("/auth/register", json={"email": email})
+    client.cookies.clear()
+    return response.cookies["bc_session"]
+
+
+def test_validates_a_batch_with_one_query(client: TestClient, query_budget: Budget) -> None:
+    tokens = [_register(client, f"user{i}@example.com") for i in range(3)]
+    revoked = _register(client, "gone@example.com")
+    client.cookies.set("bc_session", revoked)
+    client.post("/auth/logout")
+
+    response = client.post(
+        "/auth/sessions/validate",
+        json={"tokens": [*tokens, revoked, "unknown"]},
+        headers=HEADERS,
+    )
+
+    assert response.status_code == 200
+    query_budget(response, 1)
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [
+        "valid",
+        "valid",
+        "valid",
+        "revoked",
+        "not_found",
+    ]
+    assert results[0]["user"]["email"] == "user0@example.com"
+    assert results[3]["user"] is None
+
+
+def test_requires_the_internal_token(client: TestClient) -> None:
+    response = client.post(
+        "/auth/sessions/validate",
+        json={"tokens": ["x"]},
+        headers={"X-Internal-Token": "wrong"},
+    )
+
+    assert response.status_code == 403
+
+
+def test_is_hidden_without_an_internal_token(sqlite_client: TestClient) -> None:
+    response = sqlite_client.post("/auth/sessions/validate", json={"tokens": ["x"]})
+
+    assert response.status_code == 404
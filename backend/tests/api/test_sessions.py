@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import httpx
+from fastapi.testclient import TestClient
+
+Budget = Callable[[httpx.Response, int], None]
+
+
+def _login_times(client: TestClient, count: int) -> list[str]:
+    tokens = []
+    for _ in range(count):
+        response = client.post("/auth/login", json={"email": "a@example.com"})
+        tokens.append(response.cookies["bc_session"])
+    return tokens
+
+
+def test_lists_sessions_page_by_page(sqlite_client: TestClient, query_budget: Budget) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    current = _login_times(sqlite_client, 4)[-1]
+
+    seen: list[dict] = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = sqlite_client.get("/auth/sessions", params=params)
+        assert response.status_code == 200
+        query_budget(response, 2)
+        body = response.json()
+        seen.extend(body["sessions"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert [s["id"] for s in seen] == sorted((s["id"] for s in seen), reverse=True)
+    assert [s["current"] for s in seen] == [True, False, False, False, False]
+    assert sqlite_client.cookies["bc_session"] == current
+
+
+def test_rejects_a_malformed_cursor(sqlite_client: TestClient) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+
+    response = sqlite_client.get("/auth/sessions", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+
+
+def test_logout_all_revokes_every_session(
+    sqlite_client: TestClient, query_budget: Budget
+) -> None:
+    sqlite_client.post("/auth/register", json={"email": "a@example.com"})
+    tokens = _login_times(sqlite_client, 2)
+
+    response = sqlite_client.post("/auth/logout-all")
+
+    assert response.status_code == 204
+    query_budget(response, 2)
+    for token in tokens:
+        sqlite_client.cookies.set("bc_session", token)
+        assert sqlite_client.get("/auth/me").json()["detail"]["title"] == "Session revoked"
+
+
+def test_session_routes_require_a_session(sqlite_client: TestClient) -> None:
+    assert sqlite_client.get("/auth/sessions").status_code == 401
+    assert sqlite_client.post("/auth/logout-all").status_code == 401
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from benchmarks.auth_load import LoadConfig, percentile, run_in_process
+
+
+@pytest.mark.parametrize(
+    ("q", "expected"),
+    [(0, 1.0), (50, 2.5), (100, 4.0), (95, 3.85)],
+)
+def test_percentile_interpolates_between_ranks(q: float, expected: float) -> None:
+    assert percentile([1.0, 2.0, 3.0, 4.0], q) == pytest.approx(expected)
+
+
+def test_in_memory_run_reports_every_route_without_errors() -> None:
+    config = LoadConfig(requests=80, concurrency=4)
+
+    report = asyncio.run(run_in_process("memory", config))
+
+    assert report["total"]["requests"] == 80
+    assert report["total"]["errors"] == 0
+    assert set(report["routes"]) == {"register", "login", "me", "logout"}
+    assert all(stats["p99_ms"] >= stats["p50_ms"] for stats in report["routes"].values())
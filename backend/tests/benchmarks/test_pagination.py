@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from benchmarks.pagination import run_benchmark
+
+
+def test_keyset_and_offset_pages_agree_deep_into_the_entries() -> None:
+    # run_benchmark raises if the two pages differ.
+    report = run_benchmark(rows=5000, page=90, limit=50, repeats=1)
+
+    assert report["page"] == 90
+    assert {"keyset_first", "keyset_deep", "offset_first", "offset_deep"} <= set(report)
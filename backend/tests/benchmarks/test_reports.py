@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from benchmarks.reports import (
+    _as_tuples,
+    python_rollups,
+    run_benchmark,
+    synthetic_entries,
+    vectorized_rollups,
+)
+
+
+def test_vectorized_rollups_match_the_python_loop() -> None:
+    columns = synthetic_entries(5000)
+
+    assert vectorized_rollups(columns) == python_rollups(_as_tuples(columns))
+
+
+def test_benchmark_reports_every_case() -> None:
+    report = run_benchmark(rows=5000, database="sqlite", repeats=1)
+
+    assert report["groups"] > 0
+    assert {"speedup", "load_and_rollup_ms", "report_from_rollups_ms"} <= set(report)
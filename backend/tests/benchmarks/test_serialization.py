@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from benchmarks.serialization import run_benchmark
+
+
+def test_fast_path_renders_the_same_bodies() -> None:
+    # run_benchmark raises if either path renders a different body.
+    report = run_benchmark(iterations=20)
+
+    assert set(report["cases"]) == {"user_summary", "session_page", "problem"}
+    assert all("speedup" in case for case in report["cases"].values())
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlalchemy import create_engine, inspect
+
+from benchmarks.session_index import run_benchmark
+
+
+def test_compact_layout_has_a_smaller_token_index(tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'bench.db'}")
+
+    report = run_benchmark(engine, rows=2000, lookups=50)
+
+    legacy = report["layouts"]["legacy"]["index_bytes"]
+    compact = report["layouts"]["compact"]["index_bytes"]
+    assert (
+        compact["ix_bench_session_compact_token_hash"]
+        < legacy["ix_bench_session_legacy_token_hash"]
+    )
+    assert report["layouts"]["compact"]["lookup_p95_us"] > 0
+    assert inspect(engine).get_table_names() == []
+    engine.dispose()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from benchmarks.startup import budget_ms, measure_startup
+
+HEAVY_PACKAGES = ("fastapi", "sqlalchemy", "sqlmodel", "pydantic_settings", "email_validator")
+OPTIONAL_MODULES = (
+    "app.api.auth_async",
+    "app.db.async_session",
+    "app.db.migrations",
+    "app.api.middleware.admission",
+    "app.api.middleware.profiling",
+    "app.domains.auth.shared_cache",
+    "app.domains.ledger.analytics",
+    "numpy",
+    "sqlalchemy.ext.asyncio",
+)
+
+
+@pytest.fixture(scope="module")
+def startup() -> dict[str, Any]:
+    return measure_startup()
+
+
+def test_importing_main_does_not_build_the_app(startup: dict[str, Any]) -> None:
+    loaded = startup["imported_by_main"]
+
+    assert not [module for module in loaded if module.split(".")[0] in HEAVY_PACKAGES]
+    assert [module for module in loaded if module.startswith("app")] == ["app", "app.main"]
+
+
+def test_default_app_skips_modules_of_disabled_features(startup: dict[str, Any]) -> None:
+    loaded = set(startup["loaded_by_create_app"])
+
+    assert "app.api.auth" in loaded
+    assert loaded.isdisjoint(OPTIONAL_MODULES)
+
+
+def test_cold_start_fits_the_budget(startup: dict[str, Any]) -> None:
+    assert startup["total_ms"] <= budget_ms(), (
+        f"import + create_app took {startup['total_ms']:.0f} ms; slowest imports: "
+        + ", ".join(row["module"] for row in startup["slowest_imports"][:5])
+    )
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import pytest
+
+from app.cli.__main__ import build_parser
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["reap-sessions", "--batch-size", "0"],
+        ["reap-sessions", "--batch-size", "-1"],
+        ["ledger-check", "--batch-size", "0"],
+        ["ledger-import", "1", "statement.csv", "--batch-size", "-5"],
+    ],
+)
+def test_batch_sizes_must_be_positive(argv: list[str]) -> None:
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(argv)
+
+
+def test_batch_size_is_parsed() -> None:
+    args = build_parser().parse_args(["reap-sessions", "--batch-size", "50"])
+
+    assert args.batch_size == 50
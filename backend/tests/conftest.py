@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.middleware.query_stats import QUERY_COUNT_HEADER
+from app.core.config import Settings
+from app.main import create_app
+
+
+@pytest.fixture
+def sqlite_client(tmp_path: Path) -> Iterator[TestClient]:
+    """The full app against a throwaway SQLite database."""
+    app = create_app(
+        Settings(db_url=f"sqlite:///{tmp_path / 'test.db'}", query_stats_headers=True)
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def query_budget() -> Callable[[httpx.Response, int], None]:
+    """Fail the test when a response reports more queries than its budget.
+
+    The count comes from the ``X-DB-Query-Count`` header, so it covers every
+    statement the request ran, whichever thread or task ran it; the app must
+    be built with ``query_stats_headers`` enabled.
+    """
+
+    def check(response: httpx.Response, max_queries: int) -> None:
+        count = int(response.headers[QUERY_COUNT_HEADER])
+        assert count <= max_queries, (
+            f"{response.request.method} {response.request.url.path} ran {count} queries,"
+            f" over its budget of {max_queries}"
+        )
+
+    return check
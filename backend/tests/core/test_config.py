@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+
+
+def test_cursor_secret_is_optional_locally() -> None:
+    assert Settings(environment="local").cursor_secret is None
+
+
+@pytest.mark.parametrize("secret", [None, "too-short"])
+def test_cursor_secret_is_required_outside_local(secret: str | None) -> None:
+    with pytest.raises(ValidationError, match="cursor_secret"):
+        Settings(environment="prod", cursor_secret=secret)
+
+
+def test_configured_cursor_secret_is_accepted_in_prod() -> None:
+    settings = Settings(environment="prod", cursor_secret="c" * 32)
+
+    assert settings.cursor_secret is not None
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_reaper_batch_size_must_be_positive(batch_size: int) -> None:
+    with pytest.raises(ValidationError, match="session_reaper_batch_size"):
+        Settings(session_reaper_batch_size=batch_size)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from app.core.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+
+    latency.observe(0.05, "/auth/me")
+    latency.observe(0.1, "/auth/me")
+    latency.observe(3.0, "/auth/me")
+
+    text = registry.render()
+    assert 'latency_seconds_bucket{route="/auth/me",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/auth/me",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/auth/me",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/auth/me"} 3' in text
+
+
+def test_counter_and_extra_families_render_with_type_headers() -> None:
+    registry = MetricsRegistry()
+    outcomes = registry.counter("outcomes_total", "Outcomes.", ("operation", "outcome"))
+    outcomes.inc("login", "ok")
+    outcomes.inc("login", "ok")
+
+    text = registry.render([("pool_idle", "gauge", "Idle.", [("pool_idle", {"pool": "primary"}, 4)])])
+
+    assert "# TYPE outcomes_total counter" in text
+    assert 'outcomes_total{operation="login",outcome="ok"} 2' in text
+    assert "# TYPE pool_idle gauge" in text
+    assert 'pool_idle{pool="primary"} 4' in text
+
+
+def test_label_values_are_escaped() -> None:
+    registry = MetricsRegistry()
+    registry.counter("paths_total", "Paths.", ("path",)).inc('a"b\\c')
+
+    assert 'paths_total{path="a\\"b\\\\c"} 1' in registry.render()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from app.core.profiling import (
+    RequestProfile,
+    aggregate_profiles,
+    load_profiles,
+    profile_token,
+    verify_profile_token,
+    write_profile,
+)
+
+SECRET = b"profiling-secret"
+
+
+def _profile(route: str, started_at: datetime, stacks: dict[str, int], concurrency: int = 1):
+    return RequestProfile(
+        method="GET",
+        route=route,
+        started_at=started_at,
+        duration_seconds=0.05,
+        interval_seconds=0.002,
+        samples=sum(stacks.values()),
+        max_concurrency=concurrency,
+        stacks=stacks,
+    )
+
+
+def test_profile_tokens_are_signed_and_expire() -> None:
+    token = profile_token(SECRET, now=1_000)
+
+    assert verify_profile_token(SECRET, token, now=1_100)
+    assert not verify_profile_token(SECRET, token, now=1_400)
+    assert not verify_profile_token(b"other-secret", token, now=1_100)
+    assert not verify_profile_token(SECRET, "1000.deadbeef", now=1_100)
+    assert not verify_profile_token(SECRET, "garbage", now=1_100)
+
+
+def test_write_profile_keeps_only_the_newest_dumps(tmp_path: Path) -> None:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for offset in range(5):
+        write_profile(tmp_path, _profile("/auth/me", start + timedelta(seconds=offset), {}), 3)
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert len(names) == 3
+    assert names[0].startswith("20260101T000002")
+    assert names[0].endswith("-GET-auth_me.json")
+
+
+def test_aggregate_ranks_functions_by_self_samples(tmp_path: Path) -> None:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    write_profile(tmp_path, _profile("/auth/me", start, {"a;b;c": 6, "a;b": 2, "a;d": 2}), 10)
+    overlapped = _profile("/auth/me", start + timedelta(seconds=1), {"a;d": 50}, concurrency=2)
+    write_profile(tmp_path, overlapped, 10)
+
+    report = aggregate_profiles(load_profiles(tmp_path), exclusive=True)["GET /auth/me"]
+
+    assert (report.profiles, report.samples) == (1, 10)
+    assert [(hot.function, hot.self_samples, hot.total_samples) for hot in report.top(2)] == [
+        ("c", 6, 6),
+        ("b", 2, 8),
+    ]
+    assert aggregate_profiles(load_profiles(tmp_path))["GET /auth/me"].samples == 60
+
+
+def test_load_profiles_skips_unreadable_dumps(tmp_path: Path) -> None:
+    (tmp_path / "broken.json").write_text("{")
+    (tmp_path / "ok.json").write_text(json.dumps({"route": "/health"}))
+
+    assert list(load_profiles(tmp_path)) == [{"route": "/health"}]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import Column, Date, Integer, MetaData, Table, create_engine, select
+
+from app.db.pagination import CursorCodec, InvalidCursor, keyset_after, keyset_before, split_page
+
+_codec = CursorCodec(b"k" * 32)
+
+
+def _tampered() -> str:
+    """A cursor for key 2 carrying the signature issued for key 1."""
+    payload = _codec.encode("entries", (2,)).partition(".")[0]
+    return f"{payload}.{_codec.encode('entries', (1,)).partition('.')[2]}"
+
+
+def test_cursor_round_trips_typed_keys() -> None:
+    key = (datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc), date(2026, 2, 28), 42)
+
+    assert _codec.decode("entries", _codec.encode("entries", key)) == key
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-a-cursor",
+        "bm90.c2ln",
+        _tampered(),
+        CursorCodec(b"o" * 32).encode("entries", (1,)),
+        _codec.encode("sessions", (1,)),
+    ],
+    ids=["unsigned", "bad-signature", "tampered", "other-key", "other-scope"],
+)
+def test_rejects_cursors_it_did_not_issue_for_the_list(cursor: str) -> None:
+    with pytest.raises(InvalidCursor):
+        _codec.decode("entries", cursor)
+
+
+def test_seek_predicates_walk_ties_in_order() -> None:
+    metadata = MetaData()
+    rows = Table("rows", metadata, Column("day", Date), Column("id", Integer, primary_key=True))
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    days = [date(2026, 1, day) for day in (1, 2, 3)]
+    with engine.begin() as conn:
+        conn.execute(
+            rows.insert(),
+            [{"day": day, "id": index} for index, day in enumerate(days * 3, 1)],
+        )
+        order = (rows.c.day, rows.c.id)
+        everything = conn.execute(select(*order).order_by(*order)).all()
+
+        for position, row in enumerate(everything):
+            key = tuple(row)
+            after = conn.execute(
+                select(*order).where(keyset_after(order, key)).order_by(*order)
+            ).all()
+            before = conn.execute(
+                select(*order)
+                .where(keyset_before(order, key))
+                .order_by(*(column.desc() for column in order))
+            ).all()
+            assert after == everything[position + 1 :]
+            assert before == everything[:position][::-1]
+    engine.dispose()
+
+
+def test_split_page_keys_the_last_row_only_when_more_follow() -> None:
+    assert split_page([1, 2, 3], 2, str) == ([1, 2], "2")
+    assert split_page([1, 2], 2, str) == ([1, 2], None)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterator
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+
+from app.db.migrations import (
+    LATEST_VERSION,
+    MIGRATIONS,
+    SchemaOutOfDate,
+    check_schema,
+    migrate,
+)
+from app.db.query_stats import instrument_engine, query_budget
+from app.domains.auth.models import Session, User
+from app.domains.ledger.models import Account, Category, LedgerEntry, MonthlyRollup
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_migrates_empty_database_to_latest(engine: Engine) -> None:
+    result = migrate(engine)
+
+    assert result.from_version == 0
+    assert result.to_version == LATEST_VERSION
+    assert check_schema(engine) == LATEST_VERSION
+    assert {"user", "session", "schema_version"} <= set(inspect(engine).get_table_names())
+    session_indexes = {index["name"] for index in inspect(engine).get_indexes("session")}
+    assert "ix_session_user_id" not in session_indexes
+    assert "ix_session_user_id_created_at" in session_indexes
+
+
+def test_current_schema_is_a_single_query_no_op(engine: Engine) -> None:
+    migrate(engine)
+    instrument_engine(engine)
+
+    with query_budget(1):
+        result = migrate(engine)
+
+    assert result.applied == ()
+
+
+def test_upgrades_unversioned_session_indexes(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE user (id CHAR(32) PRIMARY KEY, email VARCHAR)"))
+        conn.execute(
+            text(
+                "CREATE TABLE session (id CHAR(32) PRIMARY KEY, user_id CHAR(32),"
+                " token_hash VARCHAR, created_at DATETIME, expires_at DATETIME,"
+                " revoked_at DATETIME)"
+            )
+        )
+        conn.execute(text("CREATE INDEX ix_session_token_hash ON session (token_hash)"))
+
+    result = migrate(engine)
+
+    assert result.applied == tuple(range(1, LATEST_VERSION + 1))
+    indexes = {index["name"]: index for index in inspect(engine).get_indexes("session")}
+    assert indexes["ix_session_token_hash"]["unique"]
+    assert "ix_session_revoked_at" in indexes
+
+
+def test_converts_legacy_session_rows_to_binary_hashes(engine: Engine) -> None:
+    migrate(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE session"))
+        conn.execute(
+            text(
+                "CREATE TABLE session (id CHAR(32) PRIMARY KEY, user_id CHAR(32),"
+                " token_hash VARCHAR, created_at DATETIME, expires_at DATETIME,"
+                " revoked_at DATETIME)"
+            )
+        )
+        conn.execute(text("CREATE UNIQUE INDEX ix_session_token_hash ON session (token_hash)"))
+        conn.execute(text("DELETE FROM schema_version WHERE version >= 3"))
+        digests = [hashlib.sha256(f"token-{i}".encode()).digest() for i in range(3)]
+        user_id = uuid4()
+        for i, digest in enumerate(digests):
+            conn.execute(
+                text(
+                    "INSERT INTO session VALUES (:id, :user_id, :token_hash,"
+                    " :created_at, :expires_at, NULL)"
+                ),
+                {
+                    "id": uuid4().hex,
+                    "user_id": user_id.hex,
+                    "token_hash": digest.hex(),
+                    "created_at": f"2024-01-0{i + 1} 00:00:00.000000",
+                    "expires_at": "2024-02-01 00:00:00.000000",
+                },
+            )
+
+    result = migrate(engine)
+
+    assert result.applied == tuple(range(3, LATEST_VERSION + 1))
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id, token_hash FROM session ORDER BY id")).all()
+    assert [row.id for row in rows] == [1, 2, 3]
+    assert [bytes(row.token_hash) for row in rows] == digests
+    assert "session_legacy" not in inspect(engine).get_table_names()
+
+
+def test_check_rejects_out_of_date_schema(engine: Engine) -> None:
+    with pytest.raises(SchemaOutOfDate):
+        check_schema(engine)
+
+
+def test_ledger_step_creates_only_its_own_tables(engine: Engine) -> None:
+    with engine.begin() as conn:
+        for migration in MIGRATIONS[:5]:
+            migration.apply(conn)
+
+    assert "ledger_category" not in inspect(engine).get_table_names()
+    columns = {column["name"] for column in inspect(engine).get_columns("ledger_entry")}
+    assert not {"import_hash", "category_id"} & columns
+
+
+def test_adds_ledger_columns_and_backfills_rollups(engine: Engine) -> None:
+    migrate(engine)
+    user_id = uuid4().hex
+    with engine.begin() as conn:
+        for table in ("ledger_monthly_rollup", "ledger_entry", "ledger_category"):
+            conn.execute(text(f"DROP TABLE {table}"))
+        conn.execute(
+            text(
+                "CREATE TABLE ledger_entry (id INTEGER PRIMARY KEY, account_id INTEGER NOT NULL,"
+                " user_id CHAR(32) NOT NULL, amount_minor BIGINT NOT NULL,"
+                " description VARCHAR(255) NOT NULL, occurred_on DATE NOT NULL,"
+                " created_at DATETIME NOT NULL, reverses_id INTEGER UNIQUE)"
+            )
+        )
+        conn.execute(
+            text("CREATE INDEX ix_ledger_entry_account_id_id ON ledger_entry (account_id, id)")
+        )
+        conn.execute(text("DELETE FROM schema_version WHERE version >= 6"))
+        for amount, day in ((-500, "2026-01-05"), (2000, "2026-01-20"), (-300, "2026-02-01")):
+            conn.execute(
+                text(
+                    "INSERT INTO ledger_entry (account_id, user_id, amount_minor, description,"
+                    " occurred_on, created_at) VALUES (1, :user_id, :amount, '', :day,"
+                    " '2026-02-01 00:00:00.000000')"
+                ),
+                {"user_id": user_id, "amount": amount, "day": day},
+            )
+
+    result = migrate(engine)
+
+    assert result.applied == tuple(range(6, LATEST_VERSION + 1))
+    columns = {column["name"] for column in inspect(engine).get_columns("ledger_entry")}
+    assert {"import_hash", "category_id"} <= columns
+    indexes = {index["name"] for index in inspect(engine).get_indexes("ledger_entry")}
+    assert "ix_ledger_entry_account_id_occurred_on" in indexes
+    assert "ix_ledger_entry_account_id_id" not in indexes
+    with engine.connect() as conn:
+        rollups = conn.execute(
+            text(
+                "SELECT month, category_id, inflow_minor, outflow_minor, entry_count"
+                " FROM ledger_monthly_rollup ORDER BY month"
+            )
+        ).all()
+    assert [tuple(row) for row in rollups] == [
+        ("2026-01-01", 0, 2000, -500, 2),
+        ("2026-02-01", 0, 0, -300, 1),
+    ]
+
+
+def test_migrated_schema_matches_the_models(engine: Engine) -> None:
+    migrate(engine)
+    inspector = inspect(engine)
+
+    for model in (User, Session, Account, Category, LedgerEntry, MonthlyRollup):
+        table = model.__table__
+        columns = {
+            column["name"]: column["nullable"] for column in inspector.get_columns(table.name)
+        }
+        indexes = {
+            index["name"]: bool(index["unique"]) for index in inspector.get_indexes(table.name)
+        }
+        assert columns == {column.name: column.nullable for column in table.columns}, table.name
+        assert indexes == {index.name: index.unique for index in table.indexes}, table.name
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.db.migrations import migrate
+from app.db.replicas import Replica, ReplicaSet
+from app.domains.auth.repository import SqlAuthRepository
+from app.domains.auth.service import hash_token, logout_session, register_user
+
+
+@pytest.fixture
+def engines(tmp_path: Path) -> Iterator[list[Engine]]:
+    engines = [create_engine(f"sqlite:///{tmp_path / f'db{i}.db'}") for i in range(3)]
+    for engine in engines:
+        migrate(engine)
+    yield engines
+    for engine in engines:
+        engine.dispose()
+
+
+def test_round_robin_skips_unhealthy_replicas(engines: list[Engine]) -> None:
+    replicas = [Replica(f"replica{i}", engine) for i, engine in enumerate(engines)]
+    replica_set = ReplicaSet(replicas)
+    replicas[1].healthy = False
+
+    chosen = [replica_set.choose() for _ in range(4)]
+
+    assert chosen == [engines[0], engines[2], engines[0], engines[2]]
+
+
+def test_least_busy_prefers_fewest_checked_out_connections(engines: list[Engine]) -> None:
+    replica_set = ReplicaSet(
+        [Replica("replica0", engines[0]), Replica("replica1", engines[1])], "least_busy"
+    )
+
+    with engines[0].connect():
+        assert replica_set.choose() is engines[1]
+
+
+def test_failed_health_check_takes_replica_out_of_rotation(
+    engines: list[Engine], tmp_path: Path
+) -> None:
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'db.db'}")
+    replica_set = ReplicaSet([Replica("replica0", broken), Replica("replica1", engines[0])])
+
+    assert replica_set.check_health() == {"replica0": False, "replica1": True}
+    assert {replica_set.choose() for _ in range(3)} == {engines[0]}
+
+    replica_set.replicas[1].healthy = False
+    assert replica_set.choose() is None
+
+
+def test_lookups_fall_back_to_primary_before_replication(engines: list[Engine], monkeypatch) -> None:
+    primary, replica = engines[0], engines[1]
+    monkeypatch.setattr("app.domains.auth.service.secrets.token_urlsafe", lambda _: "token")
+    with Session(primary) as db:
+        user, _session, token = register_user(SqlAuthRepository(db), "member@example.com")
+        db.commit()
+        user_id = user.id
+
+    with Session(primary) as db, Session(replica) as read_db:
+        repo = SqlAuthRepository(db, read_session=read_db)
+        lookup = repo.find_session_with_user(hash_token(token))
+
+        assert lookup is not None
+        assert lookup.user.id == user_id
+        assert repo.find_user_by_id(user_id) is not None
+
+
+def test_session_state_is_read_from_the_primary(engines: list[Engine], tmp_path: Path) -> None:
+    primary, replica = engines[0], engines[1]
+    with Session(primary) as db:
+        _user, _session, token = register_user(SqlAuthRepository(db), "member@example.com")
+        db.commit()
+    # The replica has the session but not the logout that follows.
+    replica.dispose()
+    shutil.copy(tmp_path / "db0.db", tmp_path / "db1.db")
+    with Session(primary) as db:
+        logout_session(SqlAuthRepository(db), token)
+        db.commit()
+
+    with Session(primary) as db, Session(replica) as read_db:
+        repo = SqlAuthRepository(db, read_session=read_db)
+        lookup = repo.find_session_with_user(hash_token(token))
+        lookups = repo.find_sessions_with_users([hash_token(token)])
+
+        assert lookup is not None and lookup.revoked_at is not None
+        assert lookups[hash_token(token)].revoked_at is not None
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domains.auth import async_service, errors
+from app.domains.auth.models import Session
+from app.domains.auth.models import User
+from app.domains.auth.service import SessionLookup, hash_token
+
+
+class InMemoryAsyncAuthRepository:
+    def __init__(self) -> None:
+        self._users_by_email: dict[str, User] = {}
+        self._users_by_id: dict[str, User] = {}
+        self._sessions_by_hash: dict[str, Session] = {}
+
+    async def find_user_by_email(self, email: str) -> User | None:
+        return self._users_by_email.get(email)
+
+    def add_user(self, user: User) -> None:
+        self._users_by_email[user.email] = user
+        self._users_by_id[str(user.id)] = user
+
+    async def flush(self) -> None:
+        return None
+
+    def after_commit(self, callback) -> None:
+        callback()
+
+    def add_session(self, session_model: Session) -> None:
+        self._sessions_by_hash[session_model.token_hash] = session_model
+
+    async def find_session_by_token_hash(self, token_hash: bytes) -> Session | None:
+        return self._sessions_by_hash.get(token_hash)
+
+    async def find_user_by_id(self, user_id) -> User | None:
+        return self._users_by_id.get(str(user_id))
+
+    async def find_session_with_user(self, token_hash: bytes) -> SessionLookup | None:
+        session_model = self._sessions_by_hash.get(token_hash)
+        user = self._users_by_id.get(str(session_model.user_id)) if session_model else None
+        if session_model is None or user is None:
+            return None
+        return SessionLookup(user=user, expires_at=session_model.expires_at, revoked_at=session_model.revoked_at)
+
+
+@pytest.fixture
+def repo() -> InMemoryAsyncAuthRepository:
+    return InMemoryAsyncAuthRepository()
+
+
+@pytest.fixture
+def fixed_now() -> datetime:
+    return datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_register_then_resolve_session(
+    repo: InMemoryAsyncAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    monkeypatch.setattr("app.domains.auth.service.secrets.token_urlsafe", lambda _: "token")
+
+    user, session_model, token = asyncio.run(async_service.register_user(repo, "New@Example.com"))
+    resolved = asyncio.run(async_service.get_user_for_session(repo, token))
+
+    assert user.email == "new@example.com"
+    assert session_model.token_hash == hash_token("token")
+    assert resolved is user
+
+
+def test_register_existing_user_raises(repo: InMemoryAsyncAuthRepository) -> None:
+    repo.add_user(User(email="member@example.com"))
+
+    with pytest.raises(errors.UserAlreadyExists):
+        asyncio.run(async_service.register_user(repo, "member@example.com"))
+
+
+def test_login_user_updates_last_login(
+    repo: InMemoryAsyncAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    user = User(email="member@example.com", last_login_at=fixed_now - timedelta(days=1))
+    repo.add_user(user)
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+
+    logged_in_user, session_model, _token = asyncio.run(
+        async_service.login_user(repo, "member@example.com")
+    )
+
+    assert logged_in_user.last_login_at == fixed_now
+    assert session_model.user_id == user.id
+
+
+@pytest.mark.parametrize(
+    ("expires_in", "revoked", "error"),
+    [
+        (timedelta(days=1), True, errors.SessionRevoked),
+        (timedelta(seconds=0), False, errors.SessionExpired),
+    ],
+)
+def test_logout_session_rejects_unusable_sessions(
+    repo: InMemoryAsyncAuthRepository,
+    fixed_now: datetime,
+    monkeypatch,
+    expires_in: timedelta,
+    revoked: bool,
+    error: type[errors.AuthError],
+) -> None:
+    user = User(email="member@example.com")
+    repo.add_user(user)
+    repo.add_session(
+        Session(
+            user_id=user.id,
+            token_hash=hash_token("token"),
+            expires_at=fixed_now + expires_in,
+            revoked_at=fixed_now if revoked else None,
+        )
+    )
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+
+    with pytest.raises(error):
+        asyncio.run(async_service.logout_session(repo, "token"))
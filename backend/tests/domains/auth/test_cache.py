@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.domains.auth.cache import CachedSession, SessionCache
+from app.domains.auth.models import User
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fixed_now() -> datetime:
+    return datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+def _entry(user: User, expires_at: datetime) -> CachedSession:
+    return CachedSession.from_user(user, expires_at)
+
+
+def test_get_returns_fresh_entry_and_counts_hit(clock: FakeClock, fixed_now: datetime) -> None:
+    cache = SessionCache(max_entries=10, ttl_seconds=30, clock=clock)
+    user = User(email="member@example.com")
+    cache.put(b"hash", _entry(user, fixed_now + timedelta(days=1)))
+
+    entry = cache.get(b"hash", fixed_now)
+
+    assert entry is not None
+    assert entry.to_user().id == user.id
+    assert cache.stats().hits == 1
+
+
+@pytest.mark.parametrize(
+    ("clock_advance", "now_advance"),
+    [
+        (31.0, timedelta(0)),
+        (0.0, timedelta(days=1)),
+    ],
+)
+def test_get_never_serves_past_ttl_or_session_expiry(
+    clock: FakeClock, fixed_now: datetime, clock_advance: float, now_advance: timedelta
+) -> None:
+    cache = SessionCache(max_entries=10, ttl_seconds=30, clock=clock)
+    cache.put(b"hash", _entry(User(email="member@example.com"), fixed_now + timedelta(days=1)))
+    clock.now += clock_advance
+
+    assert cache.get(b"hash", fixed_now + now_advance) is None
+    assert cache.stats().expirations == 1
+    assert cache.stats().size == 0
+
+
+def test_put_evicts_least_recently_used(clock: FakeClock, fixed_now: datetime) -> None:
+    cache = SessionCache(max_entries=2, ttl_seconds=30, clock=clock)
+    expires_at = fixed_now + timedelta(days=1)
+    cache.put(b"a", _entry(User(email="a@example.com"), expires_at))
+    cache.put(b"b", _entry(User(email="b@example.com"), expires_at))
+    cache.get(b"a", fixed_now)
+
+    cache.put(b"c", _entry(User(email="c@example.com"), expires_at))
+
+    assert cache.get(b"b", fixed_now) is None
+    assert cache.get(b"a", fixed_now) is not None
+    assert cache.stats().evictions == 1
+
+
+def test_invalidate_user_drops_all_their_sessions(clock: FakeClock, fixed_now: datetime) -> None:
+    cache = SessionCache(max_entries=10, ttl_seconds=30, clock=clock)
+    user = User(email="member@example.com")
+    other = User(email="other@example.com")
+    expires_at = fixed_now + timedelta(days=1)
+    cache.put(b"a", _entry(user, expires_at))
+    cache.put(b"b", _entry(user, expires_at))
+    cache.put(b"c", _entry(other, expires_at))
+
+    cache.invalidate_user(user.id)
+
+    assert cache.get(b"a", fixed_now) is None
+    assert cache.get(b"b", fixed_now) is None
+    assert cache.get(b"c", fixed_now) is not None
+
+
+def test_put_skips_write_after_concurrent_invalidation(
+    clock: FakeClock, fixed_now: datetime
+) -> None:
+    cache = SessionCache(max_entries=10, ttl_seconds=30, clock=clock)
+    generation = cache.generation
+    cache.invalidate(b"hash")
+
+    cache.put(b"hash", _entry(User(email="member@example.com"), fixed_now + timedelta(days=1)), generation)
+
+    assert cache.get(b"hash", fixed_now) is None
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlmodel import Session, select
+
+from app.db.migrations import migrate
+from app.domains.auth.last_login import (
+    LastLoginBuffer,
+    flush_last_logins,
+    run_last_login_flusher,
+)
+from app.domains.auth.models import User
+
+
+@pytest.fixture
+def fixed_now() -> datetime:
+    return datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_record_keeps_latest_login_per_user(fixed_now: datetime) -> None:
+    buffer = LastLoginBuffer(max_pending=10, flush_threshold=10)
+    user_id = uuid4()
+
+    buffer.record(user_id, fixed_now)
+    buffer.record(user_id, fixed_now - timedelta(minutes=1))
+    buffer.record(user_id, fixed_now + timedelta(minutes=1))
+
+    assert buffer.drain() == {user_id: fixed_now + timedelta(minutes=1)}
+    assert len(buffer) == 0
+
+
+def test_record_rejects_new_users_when_full(fixed_now: datetime) -> None:
+    buffer = LastLoginBuffer(max_pending=1, flush_threshold=10)
+    known = uuid4()
+    buffer.record(known, fixed_now)
+
+    assert buffer.record(uuid4(), fixed_now) is False
+    assert buffer.record(known, fixed_now + timedelta(seconds=1)) is True
+    assert len(buffer) == 1
+
+
+def test_restore_does_not_overwrite_newer_entries(fixed_now: datetime) -> None:
+    buffer = LastLoginBuffer(max_pending=10, flush_threshold=10)
+    user_id = uuid4()
+    buffer.record(user_id, fixed_now)
+    failed = buffer.drain()
+    buffer.record(user_id, fixed_now + timedelta(seconds=5))
+
+    buffer.restore(failed)
+
+    assert buffer.drain() == {user_id: fixed_now + timedelta(seconds=5)}
+
+
+def test_flush_writes_each_users_latest_login(fixed_now: datetime, tmp_path: Path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'auth.db'}")
+    migrate(engine)
+    user_ids = [uuid4() for _ in range(4)]
+    with Session(engine) as db:
+        for index, user_id in enumerate(user_ids):
+            db.add(User(id=user_id, email=f"user{index}@example.com", created_at=fixed_now))
+        db.commit()
+    buffer = LastLoginBuffer(max_pending=10, flush_threshold=10)
+    expected = {
+        user_id: fixed_now + timedelta(minutes=index) for index, user_id in enumerate(user_ids[:3])
+    }
+    for user_id, logged_in_at in expected.items():
+        buffer.record(user_id, logged_in_at - timedelta(seconds=30))
+        buffer.record(user_id, logged_in_at)
+
+    # Two users per UPDATE, so the three logins take two batches.
+    assert flush_last_logins(engine, buffer, batch_size=2) == 3
+
+    with Session(engine) as db:
+        stored = {user.id: user.last_login_at for user in db.exec(select(User)).all()}
+    engine.dispose()
+    # SQLite hands datetimes back naive; the one user who never logged in is untouched.
+    assert stored == {
+        **{user_id: at.replace(tzinfo=None) for user_id, at in expected.items()},
+        user_ids[3]: None,
+    }
+    assert len(buffer) == 0
+
+
+def test_failed_final_flush_is_logged_not_raised(
+    fixed_now: datetime, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'missing' / 'db.db'}")
+    buffer = LastLoginBuffer(max_pending=10, flush_threshold=10)
+    buffer.record(uuid4(), fixed_now)
+    stop = asyncio.Event()
+    stop.set()
+
+    with caplog.at_level(logging.ERROR):
+        asyncio.run(run_last_login_flusher(engine, buffer, 1.0, 10, stop))
+
+    assert "Final last_login_at flush failed; 1 login times not written" in caplog.text
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.db.migrations import migrate
+from app.domains.auth import errors
+from app.domains.auth.cache import SessionCache
+from app.domains.auth.reaper import reap_ended_sessions
+from app.domains.auth.repository import SqlAuthRepository
+from app.domains.auth.service import (
+    SignedSessionTokens,
+    get_user_for_session,
+    hash_token,
+    logout_session,
+    refresh_denylist,
+    register_user,
+    revoke_all_sessions,
+)
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'auth.db'}")
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "revoke",
+    [
+        lambda repo, user_id, token, cache: logout_session(repo, token, cache),
+        lambda repo, user_id, token, cache: revoke_all_sessions(repo, user_id, cache),
+    ],
+    ids=["logout", "logout-all"],
+)
+def test_lookup_before_the_revoke_commits_is_not_cached_past_it(
+    engine: Engine, revoke: Callable[..., object]
+) -> None:
+    with Session(engine) as db:
+        user, _session, token = register_user(SqlAuthRepository(db), "a@example.com")
+        user_id = user.id
+        db.commit()
+    cache = SessionCache(max_entries=10, ttl_seconds=30)
+
+    with Session(engine) as writer:
+        revoke(SqlAuthRepository(writer), user_id, token, cache)
+        writer.flush()
+        # Another request resolves the session before the revoke commits.
+        with Session(engine) as reader:
+            assert get_user_for_session(SqlAuthRepository(reader), token, cache).id == user_id
+        writer.commit()
+
+    with Session(engine) as db, pytest.raises(errors.SessionRevoked):
+        get_user_for_session(SqlAuthRepository(db), token, cache)
+
+
+def test_logout_all_denylists_only_that_users_sessions(engine: Engine, monkeypatch) -> None:
+    now = datetime.now(timezone.utc)
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: now)
+    tokens = SignedSessionTokens(b"k" * 32)
+    with Session(engine) as db:
+        repo = SqlAuthRepository(db)
+        user, _session, token = register_user(repo, "a@example.com", tokens)
+        _other, _session, other_token = register_user(repo, "b@example.com", tokens)
+        user_id = user.id
+        db.commit()
+    # Another process logs the other user out in the same instant.
+    with Session(engine) as db:
+        logout_session(SqlAuthRepository(db), other_token)
+        db.commit()
+
+    with Session(engine) as db:
+        assert revoke_all_sessions(SqlAuthRepository(db), user_id, tokens=tokens) == 1
+        db.commit()
+
+    assert hash_token(token) in tokens.denylist
+    assert hash_token(other_token) not in tokens.denylist
+
+
+def test_revoked_signed_token_stays_revoked_after_reaping_and_a_restart(engine: Engine) -> None:
+    secret = b"k" * 32
+    tokens = SignedSessionTokens(secret)
+    with Session(engine) as db:
+        _user, _session, token = register_user(SqlAuthRepository(db), "a@example.com", tokens)
+        db.commit()
+    with Session(engine) as db:
+        logout_session(SqlAuthRepository(db), token, tokens=tokens)
+        db.commit()
+
+    reap_ended_sessions(engine, batch_size=100, retention=timedelta(0))
+    # A fresh worker knows only what the database tells it.
+    restarted = SignedSessionTokens(secret)
+    with Session(engine) as db:
+        repo = SqlAuthRepository(db)
+        refresh_denylist(repo, restarted.denylist)
+
+        with pytest.raises(errors.SessionRevoked):
+            get_user_for_session(repo, token, tokens=restarted)
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_reaper_rejects_non_positive_batch_sizes(engine: Engine, batch_size: int) -> None:
+    with pytest.raises(ValueError, match="batch_size"):
+        reap_ended_sessions(engine, batch_size=batch_size, retention=timedelta(0))
@@ -1,25 +1,38 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from app.domains.auth import errors
+from app.domains.auth.cache import SessionCache
+from app.domains.auth.last_login import LastLoginBuffer
 from app.domains.auth.models import Session
 from app.domains.auth.models import User
 from app.domains.auth.service import SESSION_TTL_DAYS
+from app.domains.auth.service import RevokedSession
+from app.domains.auth.service import SessionLookup
+from app.domains.auth.service import deactivate_user
 from app.domains.auth.service import get_user_for_session
 from app.domains.auth.service import hash_token
 from app.domains.auth.service import login_user
 from app.domains.auth.service import logout_session
 from app.domains.auth.service import normalize_email
+from app.domains.auth.service import reap_sessions
+from app.domains.auth.service import list_sessions
+from app.domains.auth.service import refresh_denylist
+from app.domains.auth.service import revoke_all_sessions
 from app.domains.auth.service import register_user
+from app.domains.auth.service import validate_session_tokens
+from app.domains.auth.tokens import SignedSessionTokens
 
 
 class InMemoryAuthRepository:
     def __init__(self) -> None:
         self._users_by_email: dict[str, User] = {}
         self._users_by_id: dict[str, User] = {}
-        self._sessions_by_hash: dict[str, Session] = {}
+        self._sessions_by_hash: dict[bytes, Session] = {}
 
     def find_user_by_email(self, email: str) -> User | None:
         return self._users_by_email.get(email)
@@ -31,15 +44,77 @@ class InMemoryAuthRepository:
     def flush(self) -> None:
         return None
 
+    def after_commit(self, callback) -> None:
+        callback()
+
     def add_session(self, session_model: Session) -> None:
         self._sessions_by_hash[session_model.token_hash] = session_model
 
-    def find_session_by_token_hash(self, token_hash: str) -> Session | None:
+    def find_session_by_token_hash(self, token_hash: bytes) -> Session | None:
         return self._sessions_by_hash.get(token_hash)
 
     def find_user_by_id(self, user_id) -> User | None:
         return self._users_by_id.get(str(user_id))
 
+    def find_session_with_user(self, token_hash: bytes) -> SessionLookup | None:
+        session_model = self._sessions_by_hash.get(token_hash)
+        user = self._users_by_id.get(str(session_model.user_id)) if session_model else None
+        if session_model is None or user is None:
+            return None
+        return SessionLookup(user=user, expires_at=session_model.expires_at, revoked_at=session_model.revoked_at)
+
+    def find_sessions_with_users(self, token_hashes: Sequence[bytes]) -> dict[bytes, SessionLookup]:
+        lookups = {}
+        for token_hash in token_hashes:
+            lookup = self.find_session_with_user(token_hash)
+            if lookup is not None:
+                lookups[token_hash] = lookup
+        return lookups
+
+    def list_sessions_for_user(self, user_id, limit: int, after=None) -> list[Session]:
+        sessions = sorted(
+            (s for s in self._sessions_by_hash.values() if s.user_id == user_id),
+            key=lambda s: (s.created_at, s.id),
+            reverse=True,
+        )
+        if after is not None:
+            sessions = [s for s in sessions if (s.created_at, s.id) < after]
+        return sessions[:limit]
+
+    def revoke_sessions_for_user(self, user_id, revoked_at: datetime) -> int:
+        live = [
+            s
+            for s in self._sessions_by_hash.values()
+            if s.user_id == user_id and s.revoked_at is None and s.expires_at > revoked_at
+        ]
+        for session_model in live:
+            session_model.revoked_at = revoked_at
+        return len(live)
+
+    def delete_sessions_ended_before(self, cutoff: datetime, limit: int) -> int:
+        ended = [
+            token_hash
+            for token_hash, session_model in self._sessions_by_hash.items()
+            if session_model.expires_at < cutoff
+        ][:limit]
+        for token_hash in ended:
+            del self._sessions_by_hash[token_hash]
+        return len(ended)
+
+    def find_sessions_revoked_since(self, since: datetime, now: datetime) -> list[RevokedSession]:
+        return [
+            RevokedSession(s.token_hash, s.revoked_at, s.expires_at)
+            for s in self._sessions_by_hash.values()
+            if s.revoked_at is not None and s.revoked_at >= since and s.expires_at > now
+        ]
+
+    def find_revoked_sessions_for_user(self, user_id, now: datetime) -> list[RevokedSession]:
+        return [
+            RevokedSession(s.token_hash, s.revoked_at, s.expires_at)
+            for s in self._sessions_by_hash.values()
+            if s.user_id == user_id and s.revoked_at is not None and s.expires_at > now
+        ]
+
 
 @pytest.fixture
 def repo() -> InMemoryAuthRepository:
@@ -85,6 +160,22 @@ def test_login_user_updates_last_login(repo: InMemoryAuthRepository, fixed_now:
     assert repo.find_session_by_token_hash(session_model.token_hash) is session_model
 
 
+def test_login_user_defers_last_login_write_to_buffer(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    previous_login = fixed_now - timedelta(days=1)
+    user = User(email="member@example.com", last_login_at=previous_login)
+    repo.add_user(user)
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    buffer = LastLoginBuffer(max_pending=10, flush_threshold=10)
+
+    logged_in_user, _session_model, _token = login_user(repo, "member@example.com", buffer)
+
+    assert logged_in_user.last_login_at == fixed_now
+    assert user.last_login_at == previous_login
+    assert buffer.drain() == {user.id: fixed_now}
+
+
 def test_logout_session_sets_revoked_at(repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch) -> None:
     user = User(email="member@example.com")
     repo.add_user(user)
@@ -117,3 +208,228 @@ def test_get_user_for_session_returns_user(
     result = get_user_for_session(repo, "token")
 
     assert result is user
+
+
+def test_get_user_for_session_serves_repeat_lookups_from_cache(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    user = User(email="member@example.com")
+    repo.add_user(user)
+    repo.add_session(
+        Session(user_id=user.id, token_hash=hash_token("token"), expires_at=fixed_now + timedelta(days=1))
+    )
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    cache = SessionCache(max_entries=10, ttl_seconds=30)
+
+    get_user_for_session(repo, "token", cache)
+    repo._sessions_by_hash.clear()
+    cached_user = get_user_for_session(repo, "token", cache)
+
+    assert cached_user.id == user.id
+    assert cache.stats().hits == 1
+
+
+def test_logout_session_invalidates_cached_session(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    user = User(email="member@example.com")
+    repo.add_user(user)
+    repo.add_session(
+        Session(user_id=user.id, token_hash=hash_token("token"), expires_at=fixed_now + timedelta(days=1))
+    )
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    cache = SessionCache(max_entries=10, ttl_seconds=30)
+    get_user_for_session(repo, "token", cache)
+
+    logout_session(repo, "token", cache)
+
+    with pytest.raises(errors.SessionRevoked):
+        get_user_for_session(repo, "token", cache)
+
+
+def test_deactivate_user_invalidates_cached_sessions(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    user = User(email="member@example.com")
+    repo.add_user(user)
+    repo.add_session(
+        Session(user_id=user.id, token_hash=hash_token("token"), expires_at=fixed_now + timedelta(days=1))
+    )
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    cache = SessionCache(max_entries=10, ttl_seconds=30)
+    get_user_for_session(repo, "token", cache)
+
+    deactivate_user(repo, user.id, cache)
+
+    assert user.is_active is False
+    with pytest.raises(errors.UserInactive):
+        get_user_for_session(repo, "token", cache)
+
+
+def test_reap_sessions_keeps_sessions_inside_retention_window(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    user = User(email="member@example.com")
+    repo.add_user(user)
+    sessions = {
+        "old-expired": Session(user_id=user.id, token_hash="old-expired", expires_at=fixed_now - timedelta(days=3)),
+        "old-revoked": Session(
+            user_id=user.id,
+            token_hash="old-revoked",
+            expires_at=fixed_now + timedelta(days=3),
+            revoked_at=fixed_now - timedelta(days=2),
+        ),
+        "recently-expired": Session(
+            user_id=user.id, token_hash="recently-expired", expires_at=fixed_now - timedelta(hours=1)
+        ),
+        "active": Session(user_id=user.id, token_hash="active", expires_at=fixed_now + timedelta(days=1)),
+    }
+    for session_model in sessions.values():
+        repo.add_session(session_model)
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+
+    first = reap_sessions(repo, retention=timedelta(days=1), batch_size=1)
+    second = reap_sessions(repo, retention=timedelta(days=1), batch_size=1)
+
+    assert (first, second) == (1, 0)
+    # Revoked sessions stay until they expire; the denylist is rebuilt from them.
+    assert set(repo._sessions_by_hash) == {"old-revoked", "recently-expired", "active"}
+
+
+def test_signed_token_resolves_user_without_session_lookup(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    tokens = SignedSessionTokens(b"k" * 32)
+    user, session_model, token = register_user(repo, "member@example.com", tokens)
+    monkeypatch.setattr(
+        repo, "find_session_with_user", lambda _hash: pytest.fail("session table was read")
+    )
+
+    assert get_user_for_session(repo, token, tokens=tokens) is user
+    assert session_model.token_hash == hash_token(token)
+
+
+def test_signed_logout_denylists_session_immediately(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    tokens = SignedSessionTokens(b"k" * 32)
+    _user, session_model, token = register_user(repo, "member@example.com", tokens)
+
+    logout_session(repo, token, tokens=tokens)
+
+    assert session_model.token_hash in tokens.denylist
+    with pytest.raises(errors.SessionRevoked):
+        get_user_for_session(repo, token, tokens=tokens)
+
+
+def test_refresh_denylist_loads_revocations_from_other_processes(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    issuer = SignedSessionTokens(b"k" * 32)
+    verifier = SignedSessionTokens(b"k" * 32)
+    _user, session_model, token = register_user(repo, "member@example.com", issuer)
+    logout_session(repo, token, tokens=issuer)
+
+    assert get_user_for_session(repo, token, tokens=verifier)
+    assert refresh_denylist(repo, verifier.denylist) == 1
+    assert verifier.denylist.watermark == fixed_now
+    with pytest.raises(errors.SessionRevoked):
+        get_user_for_session(repo, token, tokens=verifier)
+
+    later = session_model.expires_at + timedelta(seconds=1)
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: later)
+    refresh_denylist(repo, verifier.denylist)
+    assert len(verifier.denylist) == 0
+
+
+def test_validate_session_tokens_reports_each_token_in_one_lookup(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    user, _session, valid = register_user(repo, "member@example.com")
+    _user, _session, revoked = register_user(repo, "revoked@example.com")
+    logout_session(repo, revoked)
+    inactive_user, _session, inactive = register_user(repo, "inactive@example.com")
+    deactivate_user(repo, inactive_user.id)
+    calls = []
+    lookup = repo.find_sessions_with_users
+    monkeypatch.setattr(
+        repo, "find_sessions_with_users", lambda hashes: calls.append(hashes) or lookup(hashes)
+    )
+
+    results = validate_session_tokens(repo, [valid, "unknown", revoked, inactive, valid])
+
+    assert len(calls) == 1
+    assert results[0].user is user and results[4].user is user
+    assert [type(result.error) for result in results[1:4]] == [
+        errors.SessionNotFound,
+        errors.SessionRevoked,
+        errors.UserInactive,
+    ]
+
+
+def test_validate_session_tokens_settles_cached_and_tampered_tokens_in_memory(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    tokens = SignedSessionTokens(b"k" * 32)
+    cache = SessionCache(max_entries=10, ttl_seconds=60)
+    user, _session, token = register_user(repo, "member@example.com", tokens)
+    validate_session_tokens(repo, [token], cache, tokens)
+    monkeypatch.setattr(
+        repo, "find_sessions_with_users", lambda _hashes: pytest.fail("session table was read")
+    )
+
+    tampered_token = token.replace(".", ".x", 1)
+    cached, tampered = validate_session_tokens(repo, [token, tampered_token], cache, tokens)
+
+    assert cached.user is not None and cached.user.id == user.id
+    assert isinstance(tampered.error, errors.SessionNotFound)
+
+
+def test_list_sessions_pages_newest_first(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    user = User(email="member@example.com")
+    repo.add_user(user)
+    for minutes in range(5):
+        created_at = fixed_now + timedelta(minutes=minutes)
+        repo.add_session(
+            Session(
+                id=minutes + 1,
+                user_id=user.id,
+                token_hash=bytes([minutes]) * 32,
+                created_at=created_at,
+                expires_at=created_at + timedelta(days=1),
+            )
+        )
+
+    first = list_sessions(repo, user.id, limit=2)
+    second = list_sessions(repo, user.id, limit=2, after=first.next_after)
+    last = list_sessions(repo, user.id, limit=2, after=second.next_after)
+
+    assert [s.id for s in first.sessions + second.sessions + last.sessions] == [5, 4, 3, 2, 1]
+    assert first.next_after == (fixed_now + timedelta(minutes=3), 4)
+    assert last.next_after is None
+
+
+def test_revoke_all_sessions_revokes_live_sessions_and_clears_caches(
+    repo: InMemoryAuthRepository, fixed_now: datetime, monkeypatch
+) -> None:
+    monkeypatch.setattr("app.domains.auth.service._utcnow", lambda: fixed_now)
+    tokens = SignedSessionTokens(b"k" * 32)
+    cache = SessionCache(max_entries=10, ttl_seconds=60)
+    user, _session, first = register_user(repo, "member@example.com", tokens)
+    _user, _session, second = login_user(repo, "member@example.com", tokens=tokens)
+    get_user_for_session(repo, first, cache, tokens)
+
+    assert revoke_all_sessions(repo, user.id, cache, tokens) == 2
+
+    assert cache.stats().size == 0
+    for token in (first, second):
+        assert hash_token(token) in tokens.denylist
+        with pytest.raises(errors.SessionRevoked):
+            get_user_for_session(repo, token, cache, tokens)
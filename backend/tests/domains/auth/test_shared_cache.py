@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import multiprocessing
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from app.domains.auth.cache import CachedSession
+from app.domains.auth.models import User
+from app.domains.auth.service import hash_token
+from app.domains.auth.shared_cache import WAYS, SharedSessionCache
+
+NOW = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def prefix(tmp_path: Path) -> str:
+    return str(tmp_path / "sessions")
+
+
+@pytest.fixture
+def cache(prefix: str, clock: FakeClock) -> Iterator[SharedSessionCache]:
+    cache = SharedSessionCache(prefix, max_entries=64, ttl_seconds=30, clock=clock)
+    yield cache
+    cache.close()
+
+
+def _entry(email: str = "member@example.com") -> CachedSession:
+    user = User(email=email, created_at=NOW - timedelta(days=3), last_login_at=NOW)
+    return CachedSession.from_user(user, NOW + timedelta(days=1))
+
+
+def test_round_trips_entries_between_processes_mapping_the_table(
+    cache: SharedSessionCache, prefix: str, clock: FakeClock
+) -> None:
+    other_worker = SharedSessionCache(prefix, max_entries=64, ttl_seconds=30, clock=clock)
+    entry = _entry()
+    cache.put(hash_token("a"), entry)
+
+    assert other_worker.get(hash_token("a"), NOW) == entry
+    assert other_worker.stats().size == 1
+    other_worker.close()
+
+
+def test_invalidation_reaches_every_mapping(
+    cache: SharedSessionCache, prefix: str, clock: FakeClock
+) -> None:
+    other_worker = SharedSessionCache(prefix, max_entries=64, ttl_seconds=30, clock=clock)
+    entry = _entry()
+    cache.put(hash_token("a"), entry)
+    cache.put(hash_token("b"), entry)
+    generation = cache.generation
+
+    other_worker.invalidate(hash_token("a"))
+
+    assert cache.get(hash_token("a"), NOW) is None
+    assert cache.generation == generation + 1
+    other_worker.invalidate_user(entry.user_id)
+    assert cache.get(hash_token("b"), NOW) is None
+    other_worker.close()
+
+
+def test_put_with_stale_generation_is_dropped(cache: SharedSessionCache) -> None:
+    generation = cache.generation
+    cache.invalidate(hash_token("a"))
+
+    cache.put(hash_token("a"), _entry(), generation)
+
+    assert cache.get(hash_token("a"), NOW) is None
+
+
+def test_never_serves_past_ttl_or_session_expiry(
+    cache: SharedSessionCache, clock: FakeClock
+) -> None:
+    cache.put(hash_token("a"), _entry())
+
+    assert cache.get(hash_token("a"), NOW + timedelta(days=1)) is None
+    clock.now += 31
+    assert cache.get(hash_token("a"), NOW) is None
+    assert cache.stats().expirations == 2
+
+
+def test_full_bucket_evicts_the_entry_nearest_its_deadline(
+    prefix: str, clock: FakeClock
+) -> None:
+    cache = SharedSessionCache(prefix, max_entries=WAYS, ttl_seconds=30, clock=clock)
+    for index in range(WAYS + 1):
+        cache.put(hash_token(str(index)), _entry())
+        clock.now += 1
+
+    assert cache.get(hash_token("0"), NOW) is None
+    assert cache.get(hash_token(str(WAYS)), NOW) is not None
+    assert cache.stats().evictions == 1
+    cache.close()
+
+
+def test_skips_emails_that_do_not_fit_a_slot(cache: SharedSessionCache) -> None:
+    cache.put(hash_token("a"), _entry(email="x" * 250 + "@example.com"))
+
+    assert cache.get(hash_token("a"), NOW) is None
+
+
+def _logout_in_child(prefix: str, token_hash: str) -> None:
+    cache = SharedSessionCache(prefix, max_entries=64, ttl_seconds=30)
+    cache.invalidate(token_hash)
+    cache.close()
+
+
+def test_invalidation_from_another_process(prefix: str) -> None:
+    cache = SharedSessionCache(prefix, max_entries=64, ttl_seconds=30)
+    cache.put(hash_token("a"), _entry())
+
+    child = multiprocessing.get_context("spawn").Process(
+        target=_logout_in_child, args=(prefix, hash_token("a"))
+    )
+    child.start()
+    child.join(timeout=30)
+
+    assert child.exitcode == 0
+    assert cache.get(hash_token("a"), NOW) is None
+    cache.close()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.domains.auth import errors
+from app.domains.auth.tokens import SignedSessionTokens
+
+NOW = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def tokens() -> SignedSessionTokens:
+    return SignedSessionTokens(b"s" * 32)
+
+
+def test_round_trips_claims(tokens: SignedSessionTokens) -> None:
+    user_id = uuid4()
+    token = tokens.issue(user_id, NOW + timedelta(days=1))
+
+    claims = tokens.verify(token, NOW)
+
+    assert tokens.is_signed(token)
+    assert claims.user_id == user_id
+    assert claims.expires_at == NOW + timedelta(days=1)
+
+
+@pytest.mark.parametrize(
+    "tamper",
+    [
+        lambda token: token[:-2] + ("AA" if token[-2:] != "AA" else "BB"),
+        lambda token: "A" + token[1:] if token[0] != "A" else "B" + token[1:],
+        lambda token: "not.base64!",
+        lambda token: token.split(".")[0] + ".",
+    ],
+)
+def test_rejects_tampered_tokens(tokens: SignedSessionTokens, tamper) -> None:
+    token = tokens.issue(uuid4(), NOW + timedelta(days=1))
+
+    with pytest.raises(errors.SessionNotFound):
+        tokens.verify(tamper(token), NOW)
+
+
+def test_rejects_tokens_signed_with_another_secret(tokens: SignedSessionTokens) -> None:
+    token = SignedSessionTokens(b"x" * 32).issue(uuid4(), NOW + timedelta(days=1))
+
+    with pytest.raises(errors.SessionNotFound):
+        tokens.verify(token, NOW)
+
+
+def test_rejects_expired_tokens(tokens: SignedSessionTokens) -> None:
+    expires_at = NOW + timedelta(hours=1)
+    token = tokens.issue(uuid4(), expires_at)
+
+    with pytest.raises(errors.SessionExpired):
+        tokens.verify(token, expires_at)
+
+
+def test_tokens_for_the_same_user_and_expiry_differ(tokens: SignedSessionTokens) -> None:
+    user_id = uuid4()
+
+    assert tokens.issue(user_id, NOW) != tokens.issue(user_id, NOW)
+
+
+def test_denylist_prunes_entries_past_expiry(tokens: SignedSessionTokens) -> None:
+    tokens.denylist.add(b"a" * 32, NOW)
+    tokens.denylist.add(b"b" * 32, NOW + timedelta(hours=1))
+
+    assert tokens.denylist.prune(NOW) == 1
+    assert len(tokens.denylist) == 1
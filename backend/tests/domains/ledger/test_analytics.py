@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.db.migrations import migrate
+from app.domains.ledger import importing, service
+from app.domains.ledger.analytics import (
+    check_rollups,
+    entry_columns,
+    load_entry_columns,
+    rollup_columns,
+)
+from app.domains.ledger.repository import SqlLedgerRepository
+from app.domains.ledger.service import RollupDelta
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_rollups_group_by_month_and_category_exactly() -> None:
+    columns = entry_columns(
+        months=np.array(["2026-02-10", "2026-01-31", "2026-02-01", "2026-02-28"], "datetime64[D]"),
+        categories=np.array([7, 0, 7, 900_000_000]),
+        amounts=np.array([-2**52, 150, 2**52 + 1, -25]),
+    )
+
+    assert rollup_columns(columns).deltas() == [
+        RollupDelta(date(2026, 1, 1), 0, 150, 0, 1),
+        RollupDelta(date(2026, 2, 1), 7, 2**52 + 1, -(2**52), 2),
+        RollupDelta(date(2026, 2, 1), 900_000_000, 0, -25, 1),
+    ]
+
+
+def test_rollups_of_far_apart_dates_stay_small() -> None:
+    columns = entry_columns(
+        months=np.array(["0001-01-01", "9999-12-31", "0001-01-15"], "datetime64[D]"),
+        categories=np.array([3, 900_000_000, 3]),
+        amounts=np.array([100, -40, 5]),
+    )
+
+    assert rollup_columns(columns).deltas() == [
+        RollupDelta(date(1, 1, 1), 3, 105, 0, 2),
+        RollupDelta(date(9999, 12, 1), 900_000_000, 0, -40, 1),
+    ]
+
+
+def test_no_entries_make_no_rollups() -> None:
+    empty = np.array([], dtype=np.int64)
+    columns = entry_columns(np.array([], "datetime64[D]"), empty, empty)
+
+    assert rollup_columns(columns).deltas() == []
+
+
+def test_postings_reversals_and_imports_keep_rollups_current(engine: Engine) -> None:
+    user_id = uuid4()
+    with Session(engine) as db:
+        repo = SqlLedgerRepository(db)
+        account = service.create_account(repo, user_id, "Bank", "monthly", 10_000)
+        food = service.create_category(repo, user_id, "Food", "monthly", 40_000)
+        assert account.id is not None and food.id is not None
+        account_id = account.id
+        entry = service.post_entry(
+            repo, user_id, account_id, -1_250, date(2026, 3, 4), category_id=food.id
+        )
+        assert entry.id is not None
+        service.reverse_entry(repo, user_id, entry.id)
+        db.commit()
+    importing.import_entries(
+        engine,
+        user_id,
+        account_id,
+        importing.parse_csv(["date,amount\n2026-01-02,-9.99\n2026-02-02,5\n"]),
+    )
+
+    with Session(engine) as db:
+        columns = load_entry_columns(db.connection(), user_id, chunk_size=2)
+    assert len(columns) == 5
+    assert check_rollups(engine).mismatches == []
+
+
+def test_drifted_rollups_are_reported_and_rebuilt(engine: Engine) -> None:
+    user_id = uuid4()
+    with Session(engine) as db:
+        repo = SqlLedgerRepository(db)
+        account = service.create_account(repo, user_id, "Bank", "monthly")
+        assert account.id is not None
+        for day in (1, 2):
+            service.post_entry(repo, user_id, account.id, -100, date(2026, 1, day))
+        db.commit()
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE ledger_monthly_rollup SET outflow_minor = -1"))
+        conn.execute(
+            text(
+                "INSERT INTO ledger_monthly_rollup VALUES"
+                " (:user_id, '2025-12-01', 0, 5, 0, 1)"
+            ),
+            {"user_id": user_id.hex},
+        )
+
+    found = check_rollups(engine)
+    repaired = check_rollups(engine, repair=True)
+
+    assert [(mismatch.month, mismatch.rebuilt) for mismatch in found.mismatches] == [
+        (date(2025, 12, 1), None),
+        (date(2026, 1, 1), RollupDelta(date(2026, 1, 1), 0, 0, -200, 2)),
+    ]
+    assert repaired.mismatches == found.mismatches
+    assert check_rollups(engine).mismatches == []
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.db.migrations import migrate
+from app.domains.ledger import service
+from app.domains.ledger.consistency import check_ledger
+from app.domains.ledger.repository import SqlLedgerRepository
+from app.domains.ledger.service import BalanceTotals
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+def _seed(engine: Engine, accounts: int) -> list[int]:
+    user_id = uuid4()
+    ids = []
+    with Session(engine) as db:
+        repo = SqlLedgerRepository(db)
+        for index in range(accounts):
+            account = service.create_account(repo, user_id, f"Account {index}", "cash", 1000)
+            assert account.id is not None
+            service.post_entry(repo, user_id, account.id, -250, date(2026, 1, 1))
+            ids.append(account.id)
+        db.commit()
+    return ids
+
+
+def test_consistent_ledger_has_no_mismatches(engine: Engine) -> None:
+    _seed(engine, 5)
+
+    result = check_ledger(engine, batch_size=2)
+
+    assert (result.accounts, result.batches, result.mismatches) == (5, 3, [])
+
+
+def test_drifted_balance_is_reported_and_repaired(engine: Engine) -> None:
+    ids = _seed(engine, 3)
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE ledger_account SET balance_minor = 1, entry_count = 9 WHERE id = :id"),
+            {"id": ids[1]},
+        )
+
+    found = check_ledger(engine, batch_size=2)
+    repaired = check_ledger(engine, batch_size=2, repair=True)
+
+    [mismatch] = found.mismatches
+    assert mismatch.account_id == ids[1]
+    assert mismatch.stored == BalanceTotals(balance_minor=1, entry_count=9)
+    assert mismatch.rebuilt == BalanceTotals(balance_minor=750, entry_count=2)
+    assert repaired.mismatches == found.mismatches
+    assert check_ledger(engine).mismatches == []
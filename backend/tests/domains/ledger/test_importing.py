@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.db.migrations import migrate
+from app.domains.ledger import errors, importing, service
+from app.domains.ledger.consistency import check_ledger
+from app.domains.ledger.importing import ImportRow, RowError
+from app.domains.ledger.repository import SqlLedgerRepository
+
+OFX = """OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260105120000[-5:EST]<TRNAMT>-12,00<FITID>A1<NAME>Shop &amp; Co
+</STMTTRN><STMTTRN><DTPOSTED>20260106<TRNAMT>5.00<FITID>A2<MEMO>Refund</STMTTRN>
+<STMTTRN><DTPOSTED>someday<TRNAMT>1.00<FITID>A3</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"""
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'ledger.db'}")
+    migrate(engine)
+    yield engine
+    engine.dispose()
+
+
+def _chunks(text: str, size: int) -> Iterator[bytes]:
+    data = text.encode("utf-8")
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def _parse(format_: importing.ImportFormat, text: str) -> list[ImportRow | RowError]:
+    return list(importing.PARSERS[format_](importing.iter_text(_chunks(text, 5))))
+
+
+def test_csv_rows_survive_chunk_boundaries_and_quoting() -> None:
+    text = "\ufeffDate,Amount,Description\r\n2026-01-01,-3.50,\"Café, \"\"corner\"\"\"\r\n"
+
+    [row] = _parse("csv", text)
+
+    assert isinstance(row, ImportRow)
+    assert (row.occurred_on, row.amount_minor, row.description) == (
+        date(2026, 1, 1),
+        -350,
+        'Café, "corner"',
+    )
+
+
+def test_identical_rows_on_one_day_hash_differently() -> None:
+    rows = _parse("csv", "date,amount\n2026-01-01,1\n2026-01-01,1\n2026-01-02,1\n")
+
+    hashes = {row.import_hash for row in rows if isinstance(row, ImportRow)}
+
+    assert len(hashes) == 3
+
+
+def test_invalid_csv_rows_are_reported_by_line() -> None:
+    rows = _parse("csv", "date,amount\n2026-13-01,1\n2026-01-01,1.005\n2026-01-01\n")
+
+    assert [(row.row, row.message.split(":")[0]) for row in rows if isinstance(row, RowError)] == [
+        (2, "date"),
+        (3, "amount"),
+        (4, "The row has fewer fields than the header."),
+    ]
+
+
+def test_csv_without_required_columns_is_rejected() -> None:
+    with pytest.raises(errors.InvalidImportFile):
+        _parse("csv", "when,how much\n2026-01-01,1\n")
+
+
+def test_csv_line_without_an_end_is_rejected_before_it_is_all_read() -> None:
+    def endless() -> Iterator[str]:
+        yield "date,amount\n2026-01-01,"
+        while True:
+            yield "1" * 4096
+
+    with pytest.raises(errors.InvalidImportFile, match="longer than"):
+        list(importing.parse_csv(endless()))
+
+
+def test_ofx_transactions_use_fitid_and_unescape() -> None:
+    rows = _parse("ofx", OFX)
+
+    first, second, third = rows
+    assert isinstance(first, ImportRow) and isinstance(second, ImportRow)
+    assert (first.occurred_on, first.amount_minor, first.description) == (
+        date(2026, 1, 5),
+        -1200,
+        "Shop & Co",
+    )
+    assert (second.amount_minor, second.description) == (500, "Refund")
+    assert isinstance(third, RowError) and third.row == 3
+
+
+def test_non_ofx_input_is_rejected() -> None:
+    with pytest.raises(errors.InvalidImportFile):
+        _parse("ofx", "date,amount\n2026-01-01,1\n")
+
+
+def test_import_is_batched_idempotent_and_streams(engine: Engine) -> None:
+    user_id = uuid4()
+    with Session(engine) as db:
+        account = service.create_account(SqlLedgerRepository(db), user_id, "Bank", "monthly")
+        db.commit()
+        assert account.id is not None
+        account_id = account.id
+    lines = ["date,amount,description\n"] + [f"2026-02-01,-1.00,Row {i}\n" for i in range(25)]
+    consumed: list[int] = []
+
+    def body() -> Iterator[bytes]:
+        for line in lines:
+            consumed.append(1)
+            yield line.encode()
+
+    progress: list[tuple[int, int]] = []
+    first = importing.import_entries(
+        engine,
+        user_id,
+        account_id,
+        importing.parse_csv(importing.iter_text(body())),
+        batch_size=10,
+        on_progress=lambda result: progress.append((result.batches, len(consumed))),
+    )
+    again = importing.import_entries(
+        engine, user_id, account_id, importing.parse_csv(iter(lines)), batch_size=10
+    )
+
+    assert (first.inserted, first.batches) == (25, 3)
+    # The first batch was written after reading the header and ten rows, not the whole body.
+    assert progress[0] == (1, 11)
+    assert (again.inserted, again.duplicates) == (0, 25)
+    with Session(engine) as db:
+        stored = service.get_account(SqlLedgerRepository(db), user_id, account_id)
+    assert (stored.balance_minor, stored.entry_count) == (-2500, 25)
+    assert check_ledger(engine).mismatches == []
+
+
+def test_import_into_another_users_account_reads_nothing(engine: Engine) -> None:
+    with Session(engine) as db:
+        account = service.create_account(SqlLedgerRepository(db), uuid4(), "Bank", "cash")
+        db.commit()
+        assert account.id is not None
+        account_id = account.id
+
+    def body() -> Iterator[ImportRow | RowError]:
+        raise AssertionError("the body must not be read")
+        yield
+
+    with pytest.raises(errors.AccountNotFound):
+        importing.import_entries(engine, uuid4(), account_id, body())